@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
-from app.db.session import get_db
 from app.models.user import User
-from app.schemas.user import UserCreate, UserResponse, Token
+from app.schemas.user import UserCreate, UserResponse, Token, UserProvisionRequest, UserProvisionResponse
+from app.core.config import settings
 from app.core.security import verify_password, get_password_hash, create_access_token
-from app.core.deps import get_current_user
+from app.core.deps import get_db, get_current_user, get_current_active_admin
+from app.services.provisioning import provision_users
 
 router = APIRouter()
 
@@ -47,6 +48,25 @@ def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
     return db_user
 
 
+@router.post("/provision", response_model=UserProvisionResponse)
+def provision_users_batch(
+    batch: UserProvisionRequest,
+    current_user: User = Depends(get_current_active_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Register many patients and doctors at once (administrators only)
+
+    Emails that are already registered, or repeated within the batch, are
+    reported and skipped; everyone else gets an account. Passwords are hashed
+    in parallel and accounts are committed PROVISION_CHUNK_SIZE at a time.
+    For larger rosters use `python provision_users.py <file>`.
+    """
+    outcomes = provision_users(db, batch.users, settings.PROVISION_WORKERS, settings.PROVISION_CHUNK_SIZE)
+    created = sum(1 for outcome in outcomes if outcome["status"] == "created")
+    return {"created": created, "skipped": len(outcomes) - created, "results": outcomes}
+
+
 @router.post("/login", response_model=Token)
 def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
@@ -0,0 +1,55 @@
+import json
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.core.deps import get_current_stream_doctor
+from app.models.user import User
+from app.services.notifications import get_pubsub, DOCTORS_CHANNEL, questionnaire_channel
+
+router = APIRouter()
+
+
+def _event_stream(request: Request, channel: str) -> StreamingResponse:
+    """Build a Server-Sent Events response streaming one pub/sub channel"""
+    async def stream():
+        with get_pubsub().subscribe(channel) as subscription:
+            # Flush headers immediately so clients know the stream is open
+            yield ": connected\n\n"
+            while not await request.is_disconnected():
+                event = await subscription.get(timeout=settings.EVENTS_HEARTBEAT_SECONDS)
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/pending")
+async def stream_pending_events(
+    request: Request,
+    current_user: User = Depends(get_current_stream_doctor)
+):
+    """
+    Stream doctor queue updates as Server-Sent Events (doctors only)
+
+    Emits `screening_created` when a new result awaits review and
+    `screening_approved` when any doctor approves one. Browsers using
+    EventSource pass the token as `?access_token=` instead of a header.
+    """
+    return _event_stream(request, DOCTORS_CHANNEL)
+
+
+@router.get("/results/{questionnaire_id}")
+async def stream_result_events(questionnaire_id: int, request: Request):
+    """
+    Stream updates for one questionnaire's screening result (public access - no authentication required)
+
+    Emits `screening_approved` once a doctor has selected a medication.
+    Fetch the current result first, then listen here instead of polling.
+    """
+    return _event_stream(request, questionnaire_channel(questionnaire_id))
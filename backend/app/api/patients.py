@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import datetime
+from app.models.user import User, UserRole
+from app.models.patient_trend import PatientTrendPoint
+from app.schemas.patient import PatientTrendPointResponse, PatientTrendResponse
+from app.core.config import settings
+from app.core.deps import get_read_db, get_current_user
+from app.core.responses import FastJSONResponse, rows_as_dicts, schema_columns
+from app.services.patient_trend import downsample
+
+router = APIRouter()
+
+# Columns selected by the trend endpoint - exactly the fields of PatientTrendPointResponse
+TREND_POINT_COLUMNS = schema_columns(PatientTrendPoint, PatientTrendPointResponse)
+
+
+@router.get("/{patient_id}/trend", response_model=PatientTrendResponse)
+def get_patient_trend(
+    patient_id: int,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    max_points: int = Query(settings.PATIENT_TREND_MAX_POINTS, ge=3, le=2000),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    BMI history of a patient, one point per submitted questionnaire, oldest first
+
+    - **Patients**: Only their own history
+    - **Doctors**: Any patient
+    - **since** / **until**: Limit to submissions in this time range
+    - **max_points**: Longer histories are downsampled to this many points,
+      keeping the first, the last and the most significant changes
+    """
+    if current_user.role.value == "patient" and current_user.id != patient_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this patient"
+        )
+
+    patient = db.query(User.id).filter(User.id == patient_id, User.role == UserRole.PATIENT).first()
+    if not patient:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Patient not found"
+        )
+
+    # Range scan of ix_patient_trend_points_patient_submitted, already in date order
+    query = db.query(*TREND_POINT_COLUMNS).filter(PatientTrendPoint.patient_id == patient_id)
+    if since is not None:
+        query = query.filter(PatientTrendPoint.submitted_at >= since)
+    if until is not None:
+        query = query.filter(PatientTrendPoint.submitted_at <= until)
+    points = rows_as_dicts(query.order_by(PatientTrendPoint.submitted_at).all())
+
+    sampled = downsample(points, max_points)
+    return FastJSONResponse({
+        "patient_id": patient_id,
+        "total_points": len(points),
+        "downsampled": len(sampled) < len(points),
+        "points": sampled,
+    })
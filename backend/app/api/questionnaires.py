@@ -1,32 +1,136 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import logging
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, Dict, List, Optional
 from datetime import datetime
-from app.db.session import get_db
 from app.models.user import User
 from app.models.questionnaire import Questionnaire, QuestionnaireStatus
+from app.models.screening_result import ScreeningResult
+from app.models.screening_job import ScreeningJob
+from app.models.archive import QuestionnaireArchive
+from app.core.condition_codes import condition_mask, habit_mask
 from app.schemas.questionnaire import (
     QuestionnaireCreate,
     QuestionnaireUpdate,
     QuestionnaireResponse,
     QuestionnaireListResponse,
+    BulkQuestionnaireResponse,
+    CaseSearchResponse,
 )
-from app.core.deps import get_current_user, get_current_active_patient
-from app.services.screening_service import ScreeningService
+from app.core.deps import (
+    get_db,
+    get_read_db,
+    get_current_user,
+    get_current_active_patient,
+    get_current_active_doctor,
+    get_current_clinic_staff,
+)
+from app.core.responses import FastJSONResponse, rows_as_dicts, schema_columns
+from app.core.rate_limit import rate_limit
+from app.services.aom_history import stored_entries
+from app.services.screening_service import ScreeningService, SCREENING_OUTPUT_FIELDS, build_screening_input
+from app.services.result_cache import result_cache
+from app.services.notifications import publish_screening_created, publish_screening_updated
+from app.services.idempotency import request_fingerprint, lookup_idempotency_key, record_idempotency_key
+from app.services.screening_jobs import enqueue_screening_job
+from app.services.search import search_cases
+from app.services.patient_trend import record_submission
+from app.services.bulk_ingest import (
+    NDJSON_MEDIA_TYPES,
+    BulkRecord,
+    questionnaire_rows,
+    read_questionnaires,
+    screening_results,
+)
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Columns selected by the list endpoint - exactly the fields of QuestionnaireListResponse
+QUESTIONNAIRE_LIST_COLUMNS = schema_columns(Questionnaire, QuestionnaireListResponse)
+
+
+def _replay_idempotent_request(
+    db: Session,
+    key: Optional[str],
+    endpoint: str,
+    fingerprint: str
+) -> Optional[Questionnaire]:
+    """
+    Return the questionnaire produced by an earlier request with the same Idempotency-Key, if any
+
+    A key whose questionnaire no longer exists (deleted or archived) is dropped
+    so the request runs again and the key can be reused.
+    """
+    if not key:
+        return None
+
+    record = lookup_idempotency_key(db, key, endpoint)
+    if record is None:
+        return None
+
+    if record.request_fingerprint != fingerprint:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used with a different request"
+        )
+
+    questionnaire = db.query(Questionnaire).filter(Questionnaire.id == record.questionnaire_id).first()
+    if questionnaire is None:
+        db.delete(record)
+        db.flush()
+    return questionnaire
+
+
+def _idempotency_conflict() -> HTTPException:
+    """A concurrent request with the same key won, but its questionnaire is already gone"""
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="A concurrent request with this Idempotency-Key did not leave a questionnaire; retry"
+    )
+
+
+def _accept_for_screening(db: Session, response: Response, questionnaire_id: int) -> None:
+    """Turn the response into 202 Accepted pointing at the queued screening job, if there is one"""
+    if not settings.SCREENING_JOBS_ENABLED:
+        return
+
+    job = db.query(ScreeningJob.id).filter(ScreeningJob.questionnaire_id == questionnaire_id).first()
+    if job:
+        response.status_code = status.HTTP_202_ACCEPTED
+        response.headers["Location"] = f"/api/screening/jobs/{job.id}"
+
 
-@router.post("/anonymous", response_model=QuestionnaireResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/anonymous",
+    response_model=QuestionnaireResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit("questionnaires.create_anonymous", "RATE_LIMIT_QUESTIONNAIRE_CREATE"))],
+)
 def create_anonymous_questionnaire(
     questionnaire_data: QuestionnaireCreate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, max_length=255)
 ):
     """
     Create a new questionnaire without authentication (public access)
 
     Saves the questionnaire as a draft that can be submitted immediately
+
+    - **Idempotency-Key** (header, optional): Retries with the same key return
+      the questionnaire created by the first request instead of a duplicate
     """
+    endpoint = "questionnaires.create_anonymous"
+    fingerprint = request_fingerprint(questionnaire_data.model_dump(mode="json"))
+    replayed = _replay_idempotent_request(db, idempotency_key, endpoint, fingerprint)
+    if replayed is not None:
+        return replayed
+
     # Calculate BMI
     screener = ScreeningService()
     bmi = screener.calculate_bmi(
@@ -51,6 +155,7 @@ def create_anonymous_questionnaire(
         health_conditions=questionnaire_data.health_conditions,
         condition_control_status=questionnaire_data.condition_control_status,
         previous_aom_history=questionnaire_data.previous_aom_history,
+        previous_aom_entries=stored_entries(questionnaire_data.previous_aom_history),
         current_medications=questionnaire_data.current_medications,
         has_drug_allergies=questionnaire_data.has_drug_allergies,
         drug_allergies=questionnaire_data.drug_allergies,
@@ -58,7 +163,24 @@ def create_anonymous_questionnaire(
     )
 
     db.add(db_questionnaire)
-    db.commit()
+
+    if idempotency_key:
+        db.flush()
+        record_idempotency_key(db, idempotency_key, endpoint, fingerprint, db_questionnaire.id)
+
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent retry with the same key won the race - return its questionnaire
+        db.rollback()
+        if not idempotency_key:
+            raise
+        replayed = _replay_idempotent_request(db, idempotency_key, endpoint, fingerprint)
+        if replayed is None:
+            db.commit()  # Keeps the stale key's removal
+            raise _idempotency_conflict()
+        return replayed
+
     db.refresh(db_questionnaire)
 
     return db_questionnaire
@@ -99,6 +221,7 @@ def create_questionnaire(
         health_conditions=questionnaire_data.health_conditions,
         condition_control_status=questionnaire_data.condition_control_status,
         previous_aom_history=questionnaire_data.previous_aom_history,
+        previous_aom_entries=stored_entries(questionnaire_data.previous_aom_history),
         current_medications=questionnaire_data.current_medications,
         has_drug_allergies=questionnaire_data.has_drug_allergies,
         drug_allergies=questionnaire_data.drug_allergies,
@@ -112,34 +235,198 @@ def create_questionnaire(
     return db_questionnaire
 
 
+@router.post(
+    "/bulk",
+    response_model=BulkQuestionnaireResponse,
+    dependencies=[Depends(rate_limit("questionnaires.bulk", "RATE_LIMIT_QUESTIONNAIRE_BULK"))],
+)
+async def bulk_create_questionnaires(
+    request: Request,
+    submit: bool = Query(True, description="Store the questionnaires as submitted rather than as drafts"),
+    screen: bool = Query(False, description="Also run screening (requires submit)"),
+    current_user: User = Depends(get_current_clinic_staff),
+    db: Session = Depends(get_db)
+):
+    """
+    Upload a batch of questionnaires collected offline (clinic staff only: doctors and administrators)
+
+    Kiosks authenticate with a staff account; the per-client rate limit still
+    applies on top.
+
+    The body is NDJSON (`Content-Type: application/x-ndjson`, one questionnaire
+    per line) or a JSON array (`application/json`) of the same records accepted
+    by POST /anonymous. Records are validated as the body streams in and
+    stored QUESTIONNAIRE_BULK_CHUNK_SIZE at a time, one transaction per chunk.
+
+    Invalid records are reported by index and do not block the rest. With
+    screen=true each stored questionnaire is screened in the same transaction;
+    otherwise submitted questionnaires are queued for background screening
+    when it is enabled, or can be screened later with POST /api/screening/run.
+    """
+    if screen and not submit:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Questionnaires must be submitted to be screened"
+        )
+
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if media_type not in NDJSON_MEDIA_TYPES and media_type != "application/json":
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send application/x-ndjson or a JSON array (application/json)"
+        )
+
+    outcomes: List[Dict[str, Any]] = []
+    chunk: List[BulkRecord] = []
+    records = read_questionnaires(
+        request.stream(), media_type in NDJSON_MEDIA_TYPES, settings.QUESTIONNAIRE_BULK_MAX_RECORDS
+    )
+    async for record in records:
+        if record.questionnaire is None:
+            outcomes.append({"index": record.index, "status": "invalid", "errors": record.errors})
+            continue
+        chunk.append(record)
+        if len(chunk) >= settings.QUESTIONNAIRE_BULK_CHUNK_SIZE:
+            outcomes.extend(await run_in_threadpool(_ingest_chunk, db, chunk, submit, screen))
+            chunk = []
+    if chunk:
+        outcomes.extend(await run_in_threadpool(_ingest_chunk, db, chunk, submit, screen))
+
+    outcomes.sort(key=lambda outcome: outcome["index"])
+    created = sum(1 for outcome in outcomes if outcome["status"] == "created")
+    return {"created": created, "rejected": len(outcomes) - created, "results": outcomes}
+
+
+def _ingest_chunk(db: Session, chunk: List[BulkRecord], submit: bool, screen: bool) -> List[Dict[str, Any]]:
+    """Insert one chunk of valid records (and their screenings) in a single transaction"""
+    questionnaires = [record.questionnaire for record in chunk]
+    rows = questionnaire_rows(
+        questionnaires,
+        QuestionnaireStatus.SUBMITTED if submit else QuestionnaireStatus.DRAFT,
+        datetime.utcnow() if submit else None,
+    )
+
+    results = []
+    try:
+        # executemany INSERT; ids come back in parameter order
+        questionnaire_ids = db.execute(
+            insert(Questionnaire).returning(Questionnaire.id, sort_by_parameter_order=True), rows
+        ).scalars().all()
+
+        if screen:
+            results = screening_results(ScreeningService(), questionnaire_ids, questionnaires)
+            db.add_all(results)
+        elif submit and settings.SCREENING_JOBS_ENABLED:
+            for questionnaire_id in questionnaire_ids:
+                enqueue_screening_job(db, questionnaire_id)
+        db.commit()
+    except SQLAlchemyError:
+        db.rollback()
+        logger.exception("Bulk questionnaire chunk of %d records could not be stored", len(chunk))
+        return [
+            {"index": record.index, "status": "failed", "errors": ["Could not be stored; upload this record again"]}
+            for record in chunk
+        ]
+
+    for result in results:
+        publish_screening_created(result)
+
+    return [
+        {
+            "index": record.index,
+            "status": "created",
+            "id": questionnaire_id,
+            "screening_id": results[position].id if results else None,
+        }
+        for position, (record, questionnaire_id) in enumerate(zip(chunk, questionnaire_ids))
+    ]
+
+
 @router.get("", response_model=List[QuestionnaireListResponse])
 def list_questionnaires(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    condition: Optional[List[str]] = Query(None),
+    eating_habit: Optional[List[str]] = Query(None)
 ):
     """
     List questionnaires
 
     - **Patients**: See only their own questionnaires
     - **Doctors**: See all questionnaires
+    - **condition** / **eating_habit**: Only questionnaires with all of the given
+      answers (repeat the parameter for several), matched on the stored bitsets
     """
-    query = db.query(Questionnaire)
+    try:
+        conditions_wanted = condition_mask(*(condition or []))
+        habits_wanted = habit_mask(*(eating_habit or []))
+    except KeyError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown condition or eating habit: {exc.args[0]}"
+        )
+
+    # Select only the listed columns and encode rows directly (no ORM hydration)
+    query = db.query(*QUESTIONNAIRE_LIST_COLUMNS)
 
     # Patients can only see their own questionnaires
     if current_user.role.value == "patient":
         query = query.filter(Questionnaire.patient_id == current_user.id)
 
-    questionnaires = query.offset(skip).limit(limit).all()
-    return questionnaires
+    if conditions_wanted:
+        query = query.filter(Questionnaire.health_conditions_mask.op("&")(conditions_wanted) == conditions_wanted)
+    if habits_wanted:
+        query = query.filter(Questionnaire.eating_habits_mask.op("&")(habits_wanted) == habits_wanted)
+
+    rows = query.offset(skip).limit(limit).all()
+    return FastJSONResponse(rows_as_dicts(rows))
+
+
+@router.get("/search", response_model=CaseSearchResponse)
+def search_questionnaires(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    current_user: User = Depends(get_current_active_doctor),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Full-text search over patient remarks and doctor notes (doctors only)
+
+    Every word of **q** must match (the last one as a prefix). Results are
+    ranked best first, with doctor notes weighted above patient remarks.
+    Page with **offset**; **has_more** tells whether another page exists.
+    """
+    # One extra hit tells whether there is a next page without counting every match
+    hits = search_cases(db, q, limit + 1, offset)
+    if hits is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search query has no words to search for"
+        )
+
+    page = hits[:limit]
+    rows = {
+        row["id"]: row
+        for row in rows_as_dicts(
+            db.query(*QUESTIONNAIRE_LIST_COLUMNS).filter(Questionnaire.id.in_([hit.questionnaire_id for hit in page])).all()
+        )
+    }
+    results = [
+        {**rows[hit.questionnaire_id], "score": hit.score, "snippet": hit.snippet}
+        for hit in page
+        if hit.questionnaire_id in rows
+    ]
+    return FastJSONResponse({"results": results, "limit": limit, "offset": offset, "has_more": len(hits) > limit})
 
 
 @router.get("/{questionnaire_id}", response_model=QuestionnaireResponse)
 def get_questionnaire(
     questionnaire_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get a specific questionnaire by ID
@@ -149,6 +436,10 @@ def get_questionnaire(
     """
     questionnaire = db.query(Questionnaire).filter(Questionnaire.id == questionnaire_id).first()
 
+    if not questionnaire:
+        # Reviewed cases past the retention age live in the archive table
+        questionnaire = db.query(QuestionnaireArchive).filter(QuestionnaireArchive.id == questionnaire_id).first()
+
     if not questionnaire:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -173,9 +464,13 @@ def update_questionnaire(
     db: Session = Depends(get_db)
 ):
     """
-    Update a questionnaire (patients only, only their own drafts)
+    Update a questionnaire (patients only, only their own questionnaires)
 
-    Can only update questionnaires in DRAFT status
+    Can update questionnaires in DRAFT or SUBMITTED status. Editing a submitted
+    questionnaire incrementally re-screens its pending result: only the stages
+    whose inputs changed are re-run and the stored result is patched in place.
+    The edit is refused with 409 if the result is approved or re-screened by
+    another request in the meantime.
     """
     questionnaire = db.query(Questionnaire).filter(
         Questionnaire.id == questionnaire_id,
@@ -188,18 +483,23 @@ def update_questionnaire(
             detail="Questionnaire not found"
         )
 
-    if questionnaire.status != QuestionnaireStatus.DRAFT:
+    if questionnaire.status not in (QuestionnaireStatus.DRAFT, QuestionnaireStatus.SUBMITTED):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Can only update questionnaires in DRAFT status"
+            detail="Cannot update a questionnaire after doctor review"
         )
 
     # Update fields
     update_data = questionnaire_data.dict(exclude_unset=True)
+    changed_fields = {
+        field for field, value in update_data.items()
+        if getattr(questionnaire, field) != value
+    }
+
+    screener = ScreeningService()
 
     # Recalculate BMI if height/weight changed
     if any(k in update_data for k in ["height_ft", "height_in", "weight_lb"]):
-        screener = ScreeningService()
         bmi = screener.calculate_bmi(
             update_data.get("height_ft", questionnaire.height_ft),
             update_data.get("height_in", questionnaire.height_in),
@@ -207,25 +507,85 @@ def update_questionnaire(
         )
         update_data["bmi"] = bmi
 
+    if "previous_aom_history" in update_data:
+        update_data["previous_aom_entries"] = stored_entries(update_data["previous_aom_history"])
+
     for field, value in update_data.items():
         setattr(questionnaire, field, value)
 
+    # Patch the pending screening result, touching only the columns that changed
+    rescreened = None
+    if questionnaire.status == QuestionnaireStatus.SUBMITTED and changed_fields:
+        # Weight, height and conditions also feed the patient's BMI trend
+        if changed_fields & screener.GATE_FIELDS:
+            record_submission(db, questionnaire)
+
+        result = db.query(ScreeningResult).filter(
+            ScreeningResult.questionnaire_id == questionnaire.id,
+            ScreeningResult.doctor_selected_medication.is_(None)
+        ).first()
+
+        if result:
+            stored = {field: getattr(result, field) for field in SCREENING_OUTPUT_FIELDS}
+            patch = screener.rescreen(stored, build_screening_input(questionnaire), changed_fields)
+            if patch:
+                # Compare-and-set: a doctor may approve, or another edit re-screen, after the read above
+                read_version = result.version or 1
+                updated = db.query(ScreeningResult).filter(
+                    ScreeningResult.id == result.id,
+                    ScreeningResult.version == read_version,
+                    ScreeningResult.doctor_selected_medication.is_(None)
+                ).update({**patch, "version": read_version + 1}, synchronize_session=False)
+
+                if not updated:
+                    db.rollback()
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail="Screening result was modified by another request; reload and retry"
+                    )
+                rescreened = result
+
     db.commit()
     db.refresh(questionnaire)
+    if rescreened is not None:
+        db.refresh(rescreened)
+
+    if rescreened is not None:
+        result_cache.invalidate(questionnaire.id)
+        publish_screening_updated(rescreened)
 
     return questionnaire
 
 
-@router.post("/{questionnaire_id}/submit", response_model=QuestionnaireResponse)
+@router.post(
+    "/{questionnaire_id}/submit",
+    response_model=QuestionnaireResponse,
+    dependencies=[Depends(rate_limit("questionnaires.submit", "RATE_LIMIT_QUESTIONNAIRE_SUBMIT"))],
+)
 def submit_questionnaire(
     questionnaire_id: int,
-    db: Session = Depends(get_db)
+    response: Response,
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, max_length=255)
 ):
     """
     Submit a questionnaire for screening (public access - no authentication required)
 
     Changes status from DRAFT to SUBMITTED and triggers screening
+
+    With background screening enabled, a screening job is queued and the
+    response is 202 Accepted with a Location header pointing at the job status.
+
+    - **Idempotency-Key** (header, optional): Retries with the same key return
+      the submitted questionnaire instead of an "already submitted" error
     """
+    endpoint = "questionnaires.submit"
+    fingerprint = request_fingerprint({"questionnaire_id": questionnaire_id})
+    replayed = _replay_idempotent_request(db, idempotency_key, endpoint, fingerprint)
+    if replayed is not None:
+        _accept_for_screening(db, response, replayed.id)
+        return replayed
+
     questionnaire = db.query(Questionnaire).filter(
         Questionnaire.id == questionnaire_id
     ).first()
@@ -245,9 +605,30 @@ def submit_questionnaire(
     # Update status
     questionnaire.status = QuestionnaireStatus.SUBMITTED
     questionnaire.submitted_at = datetime.utcnow()
+    record_submission(db, questionnaire)
+
+    if idempotency_key:
+        record_idempotency_key(db, idempotency_key, endpoint, fingerprint, questionnaire.id)
+
+    # Queue screening in the same transaction as the status change
+    if settings.SCREENING_JOBS_ENABLED:
+        enqueue_screening_job(db, questionnaire.id)
+
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        if not idempotency_key:
+            raise
+        replayed = _replay_idempotent_request(db, idempotency_key, endpoint, fingerprint)
+        if replayed is None:
+            db.commit()  # Keeps the stale key's removal
+            raise _idempotency_conflict()
+        _accept_for_screening(db, response, replayed.id)
+        return replayed
 
-    db.commit()
     db.refresh(questionnaire)
+    _accept_for_screening(db, response, questionnaire.id)
 
     return questionnaire
 
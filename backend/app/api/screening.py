@@ -1,19 +1,57 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import bindparam, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List
-from app.db.session import get_db
+from typing import Any, Dict, List, Optional, Union
 from app.models.user import User
 from app.models.questionnaire import Questionnaire, QuestionnaireStatus
 from app.models.screening_result import ScreeningResult
-from app.schemas.screening import ScreeningResultResponse, DoctorApproval
-from app.core.deps import get_current_user, get_current_active_doctor
-from app.services.screening_service import ScreeningService
+from app.models.screening_job import ScreeningJob
+from app.models.archive import ScreeningResultArchive
+from app.schemas.questionnaire import QuestionnaireBase
+from app.schemas.screening import (
+    ScreeningResultResponse,
+    ScreeningResultSummary,
+    ScreeningPreviewResponse,
+    ScreeningJobResponse,
+    DoctorApproval,
+    BulkApprovalRequest,
+    BulkApprovalResponse,
+)
+from app.core.deps import get_db, get_read_db, get_current_user, get_current_active_doctor
+from app.core.responses import NEGOTIATED_VARY, EncodedJSONResponse, FastJSONResponse, rows_as_dicts, schema_columns
+from app.core.singleflight import SingleFlight
+from app.core.rate_limit import rate_limit
+from app.services.screening_service import (
+    ScreeningService,
+    build_screening_input,
+    format_screening_output,
+    screening_fingerprint,
+)
+from app.services.result_cache import CachedResult, result_cache, preview_cache, make_etag, etag_matches
+from app.services.notifications import publish_screening_created, publish_screening_approved
+from app.services.screening_jobs import build_screening_result
+from app.services.patient_trend import record_selections
+from app.services.work_queue import claim_pending_results, claim_is_held_by_other, release_claim
 from datetime import datetime
 
 router = APIRouter()
 
+# Columns selected by the pending list - exactly the fields of the response schema
+SCREENING_RESULT_COLUMNS = schema_columns(ScreeningResult, ScreeningResultResponse)
+SCREENING_SUMMARY_COLUMNS = schema_columns(ScreeningResult, ScreeningResultSummary)
 
-@router.post("/run/{questionnaire_id}", response_model=ScreeningResultResponse, status_code=status.HTTP_201_CREATED)
+
+# Coalesces concurrent screening runs for the same questionnaire
+screening_flight = SingleFlight()
+
+
+@router.post(
+    "/run/{questionnaire_id}",
+    response_model=ScreeningResultResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit("screening.run", "RATE_LIMIT_SCREENING_RUN"))],
+)
 def run_screening(
     questionnaire_id: int,
     db: Session = Depends(get_db)
@@ -22,7 +60,15 @@ def run_screening(
     Run screening algorithm on a submitted questionnaire (public access - no authentication required)
 
     This endpoint executes the 4-step screening algorithm and returns medication recommendations
+
+    Concurrent calls for the same questionnaire (double-tapped submit, client
+    retries) share a single computation and all receive its result.
     """
+    return screening_flight.do(questionnaire_id, lambda: _run_screening(questionnaire_id, db))
+
+
+def _run_screening(questionnaire_id: int, db: Session) -> ScreeningResultResponse:
+    """Screen a questionnaire and store the result; runs once per in-flight questionnaire"""
     # Get questionnaire
     questionnaire = db.query(Questionnaire).filter(Questionnaire.id == questionnaire_id).first()
 
@@ -50,89 +96,332 @@ def run_screening(
             detail="Screening already performed for this questionnaire"
         )
 
-    # Prepare questionnaire data for screening
-    questionnaire_data = {
-        "height_ft": questionnaire.height_ft,
-        "height_in": questionnaire.height_in,
-        "weight_lb": questionnaire.weight_lb,
-        "eating_habits": questionnaire.eating_habits or [],
-        "health_conditions": questionnaire.health_conditions or [],
-        "condition_control_status": questionnaire.condition_control_status or {},  # NEW: Include control status
-    }
-
     # Run screening algorithm
-    screener = ScreeningService()
-    screening_result = screener.run_screening(questionnaire_data)
-
-    # Save screening result to database
-    # Helper function to clean drug names (remove "DrugName." prefix)
-    def clean_drug_name(drug_str):
-        return str(drug_str).replace("DrugName.", "")
-
-    db_result = ScreeningResult(
-        questionnaire_id=questionnaire.id,
-        patient_id=questionnaire.patient_id,
-        is_eligible=screening_result["is_eligible"],
-        eligibility_message=screening_result["eligibility_message"],
-        age=questionnaire.age,
-        gender=questionnaire.gender,
-        is_childbearing_age_woman=questionnaire.is_childbearing_age_woman,
-        bmi_category=screening_result["bmi_category"],
-        initial_drug_pool=[clean_drug_name(drug) for drug in screening_result["initial_drug_pool"]],
-        excluded_drugs={clean_drug_name(k): v for k, v in screening_result.get("absolute_exclusions", {}).items()},  # Legacy field
-        absolute_exclusions={clean_drug_name(k): v for k, v in screening_result.get("absolute_exclusions", {}).items()},  # NEW
-        relative_warnings={clean_drug_name(k): v for k, v in screening_result.get("relative_warnings", {}).items()},      # NEW
-        recommended_drugs=[{**drug, "medication": clean_drug_name(drug["medication"])} for drug in screening_result["recommended_drugs"]],
-        screening_logic=screening_result["screening_steps"],
-        warnings=screening_result["warnings"],
-    )
+    db_result = build_screening_result(questionnaire)
 
     db.add(db_result)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another worker process stored a result first (unique questionnaire_id)
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Screening already performed for this questionnaire"
+        )
     db.refresh(db_result)
 
-    return db_result
+    publish_screening_created(db_result)
 
+    # Detached copy that every coalesced caller can share
+    return ScreeningResultResponse.model_validate(db_result)
 
-@router.get("/results/{questionnaire_id}", response_model=ScreeningResultResponse)
-def get_screening_result(
-    questionnaire_id: int,
-    db: Session = Depends(get_db)
+
+@router.post(
+    "/preview",
+    response_model=ScreeningPreviewResponse,
+    dependencies=[Depends(rate_limit("screening.preview", "RATE_LIMIT_SCREENING_PREVIEW"))],
+)
+def preview_screening(
+    questionnaire_data: QuestionnaireBase,
+    request: Request
 ):
     """
-    Get screening results for a questionnaire (public access - no authentication required)
+    Preview screening for an unsaved questionnaire (public access - no authentication required)
+
+    Runs the screening algorithm in memory and never touches the database.
+    Identical inputs produce identical results, so responses are cached by an
+    input fingerprint that is also returned as the ETag.
     """
-    # Get screening result
-    result = db.query(ScreeningResult).filter(
-        ScreeningResult.questionnaire_id == questionnaire_id
-    ).first()
+    screening_input = build_screening_input(questionnaire_data)
+    fingerprint = screening_fingerprint(screening_input)
 
-    if not result:
+    cached = preview_cache.get(fingerprint)
+    if cached is None:
+        screener = ScreeningService()
+        screening_result = screener.run_screening(screening_input)
+        preview = ScreeningPreviewResponse(
+            fingerprint=fingerprint,
+            bmi=screening_result["bmi"],
+            **format_screening_output(screening_result),
+        )
+        cached = preview_cache.set(fingerprint, f'"{fingerprint}"', preview.model_dump_json().encode())
+
+    headers = {"ETag": cached.etag, "Cache-Control": "private, max-age=60", "Vary": NEGOTIATED_VARY}
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return EncodedJSONResponse(cached.body, headers=headers)
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=ScreeningJobResponse,
+    dependencies=[Depends(rate_limit("screening.jobs", "RATE_LIMIT_SCREENING_RESULTS"))],
+)
+def get_screening_job(
+    job_id: int,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get the status of a background screening job (public access - no authentication required)
+
+    Returned as the Location of a 202 response from questionnaire submission when
+    background screening is enabled. Once the job has succeeded, fetch the result
+    from the result_url.
+    """
+    job = db.query(ScreeningJob).filter(ScreeningJob.id == job_id).first()
+
+    if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Screening result not found"
+            detail="Screening job not found"
         )
 
-    return result
+    return job
 
 
-@router.get("/pending", response_model=List[ScreeningResultResponse])
+@router.get(
+    "/results/{questionnaire_id}",
+    response_model=ScreeningResultResponse,
+    dependencies=[Depends(rate_limit("screening.results", "RATE_LIMIT_SCREENING_RESULTS"))],
+)
+def get_screening_result(
+    questionnaire_id: int,
+    request: Request,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get screening results for a questionnaire (public access - no authentication required)
+
+    Responses carry an ETag; send it back in If-None-Match to get 304 Not Modified
+    while the result is unchanged. Repeat polls are served from an in-process cache.
+    """
+    cached = result_cache.get(questionnaire_id)
+
+    if cached is None:
+        # Get screening result
+        result = db.query(ScreeningResult).filter(
+            ScreeningResult.questionnaire_id == questionnaire_id
+        ).first()
+
+        if not result:
+            # Reviewed cases past the retention age live in the archive table
+            result = db.query(ScreeningResultArchive).filter(
+                ScreeningResultArchive.questionnaire_id == questionnaire_id
+            ).first()
+
+        if not result:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Screening result not found"
+            )
+
+        body = ScreeningResultResponse.model_validate(result).model_dump_json().encode()
+        if db.info.get("replica"):
+            # A lagging replica could re-cache a result the primary just replaced
+            cached = CachedResult(make_etag(result), body, 0.0)
+        else:
+            cached = result_cache.set(questionnaire_id, make_etag(result), body)
+
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache", "Vary": NEGOTIATED_VARY}
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return EncodedJSONResponse(cached.body, headers=headers)
+
+
+@router.get("/pending", response_model=Union[List[ScreeningResultResponse], List[ScreeningResultSummary]])
 def get_pending_screenings(
     current_user: User = Depends(get_current_active_doctor),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    summary: bool = False
 ):
     """
     Get all pending screening results (doctors only)
 
     Returns screening results that haven't been approved by a doctor yet
+
+    - **summary**: Return only the queue columns (no drug lists, logic or warnings)
     """
-    results = db.query(ScreeningResult).filter(
+    columns = SCREENING_SUMMARY_COLUMNS if summary else SCREENING_RESULT_COLUMNS
+
+    # Select only the response columns and encode rows directly (no ORM hydration)
+    rows = db.query(*columns).filter(
         ScreeningResult.doctor_selected_medication.is_(None)
     ).offset(skip).limit(limit).all()
 
-    return results
+    return FastJSONResponse(rows_as_dicts(rows))
+
+
+@router.post("/claim", response_model=List[ScreeningResultResponse])
+def claim_screenings(
+    current_user: User = Depends(get_current_active_doctor),
+    db: Session = Depends(get_db),
+    limit: int = Query(10, ge=1, le=50)
+):
+    """
+    Claim the next pending screening results for review (doctors only)
+
+    Hands out up to limit of the oldest unclaimed results. Each claim is a lease
+    that expires after CLAIM_LEASE_SECONDS; until then other doctors neither
+    receive the result from this endpoint nor can approve it. Approving a
+    result releases its claim.
+    """
+    return claim_pending_results(db, current_user.id, limit)
+
+
+@router.post("/claim/{screening_id}/release", status_code=status.HTTP_204_NO_CONTENT)
+def release_screening_claim(
+    screening_id: int,
+    current_user: User = Depends(get_current_active_doctor),
+    db: Session = Depends(get_db)
+):
+    """Give a claimed result back to the queue without approving it (doctors only)"""
+    if not release_claim(db, screening_id, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No claim held on this screening result"
+        )
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+def _match_recommended(recommended_drugs: Optional[List[Dict[str, Any]]], medication: str) -> Optional[str]:
+    """Return the recommended drug name matching a doctor's selection (case-insensitive), if any"""
+    wanted = medication.strip().lower()
+    for drug in recommended_drugs or []:
+        if str(drug.get("medication", "")).lower() == wanted:
+            return drug["medication"]
+    return None
+
+
+def _approval_conflict(result, doctor_id: int, expected_version: Optional[int], now: datetime) -> Optional[str]:
+    """Reason an approval must be refused with 409, or None if it may proceed"""
+    version = result.version or 1
+    if expected_version is not None and expected_version != version:
+        return f"Screening result has changed (now version {version}); reload and retry"
+    if expected_version is None and result.doctor_selected_medication is not None:
+        return "Screening result was already approved; send its current version to change the decision"
+    if claim_is_held_by_other(result, doctor_id, now):
+        return "Screening result is claimed by another doctor"
+    return None
+
+
+# Compare-and-set approval of one result: matches no row if its version moved since it was read
+_APPROVE_UNCHANGED_RESULT = (
+    update(ScreeningResult)
+    .where(ScreeningResult.id == bindparam("result_id"), ScreeningResult.version == bindparam("read_version"))
+    .values(
+        doctor_selected_medication=bindparam("medication"),
+        doctor_notes=bindparam("notes"),
+        doctor_approved_at=bindparam("approved_at"),
+        version=bindparam("read_version") + 1,
+        claimed_by_doctor_id=None,
+        claim_expires_at=None,
+    )
+)
+
+
+@router.post("/approve/batch", response_model=BulkApprovalResponse)
+def approve_medications_batch(
+    batch: BulkApprovalRequest,
+    current_user: User = Depends(get_current_active_doctor),
+    db: Session = Depends(get_db)
+):
+    """
+    Approve several screening results in one request (doctors only)
+
+    Each selected medication must be one of that result's recommended drugs.
+    Valid items are applied together in a single transaction; invalid items
+    are reported per entry and do not block the rest. Items that are stale,
+    already approved or claimed by another doctor are reported as "conflict".
+    """
+    requested_ids = {item.screening_id for item in batch.approvals}
+    rows = db.query(
+        ScreeningResult.id,
+        ScreeningResult.questionnaire_id,
+        ScreeningResult.recommended_drugs,
+        ScreeningResult.version,
+        ScreeningResult.doctor_selected_medication,
+        ScreeningResult.claimed_by_doctor_id,
+        ScreeningResult.claim_expires_at,
+    ).filter(ScreeningResult.id.in_(requested_ids)).with_for_update().all()
+    found = {row.id: row for row in rows}
+
+    now = datetime.utcnow()
+    outcomes = []
+    approved = []
+    seen = set()
+
+    for item in batch.approvals:
+        row = found.get(item.screening_id)
+        if item.screening_id in seen:
+            outcomes.append({"screening_id": item.screening_id, "status": "duplicate",
+                             "detail": "Screening result appears more than once in this batch"})
+            continue
+        seen.add(item.screening_id)
+
+        if row is None:
+            outcomes.append({"screening_id": item.screening_id, "status": "not_found",
+                             "detail": "Screening result not found"})
+            continue
+
+        conflict = _approval_conflict(row, current_user.id, item.version, now)
+        if conflict:
+            outcomes.append({"screening_id": item.screening_id, "status": "conflict", "detail": conflict})
+            continue
+
+        medication = _match_recommended(row.recommended_drugs, item.selected_medication)
+        if medication is None:
+            outcomes.append({"screening_id": item.screening_id, "status": "invalid_medication",
+                             "detail": f"{item.selected_medication} is not among the recommended drugs"})
+            continue
+
+        # Row locks are a no-op on SQLite, so the version read above is checked again by the
+        # UPDATE itself. Drivers only report a total rowcount for executemany, so each item runs
+        # the same statement on its own to learn whether it still matched.
+        read_version = row.version or 1
+        updated = db.execute(_APPROVE_UNCHANGED_RESULT, {
+            "result_id": row.id,
+            "read_version": read_version,
+            "medication": medication,
+            "notes": item.notes,
+            "approved_at": now,
+        }).rowcount
+        if not updated:
+            outcomes.append({"screening_id": item.screening_id, "status": "conflict",
+                             "detail": "Screening result was modified by another request; reload and retry"})
+            continue
+
+        approved.append((row, medication, read_version + 1))
+        outcomes.append({"screening_id": item.screening_id, "status": "approved",
+                         "selected_medication": medication})
+
+    if approved:
+        # One set-based questionnaire update for the results that were actually approved
+        db.execute(
+            update(Questionnaire)
+            .where(Questionnaire.id.in_([row.questionnaire_id for row, _, _ in approved]))
+            .values(
+                status=QuestionnaireStatus.REVIEWED,
+                reviewed_at=now,
+                reviewed_by_doctor_id=current_user.id,
+            )
+        )
+        record_selections(db, {row.questionnaire_id: medication for row, medication, _ in approved})
+        db.commit()
+
+        for row, medication, version in approved:
+            result_cache.invalidate(row.questionnaire_id)
+            publish_screening_approved(row.id, row.questionnaire_id, medication, version)
+
+    return {
+        "approved": len(approved),
+        "rejected": len(outcomes) - len(approved),
+        "results": outcomes,
+    }
 
 
 @router.post("/approve/{screening_id}", response_model=ScreeningResultResponse)
@@ -155,10 +444,31 @@ def approve_medication(
             detail="Screening result not found"
         )
 
-    # Update with doctor's selection
-    result.doctor_selected_medication = approval.selected_medication
-    result.doctor_notes = approval.notes
-    result.doctor_approved_at = datetime.utcnow()
+    now = datetime.utcnow()
+    read_version = result.version or 1
+    conflict = _approval_conflict(result, current_user.id, approval.version, now)
+    if conflict:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=conflict)
+
+    # Compare-and-set on the version read above, so a concurrent approval cannot be overwritten
+    updated = db.query(ScreeningResult).filter(
+        ScreeningResult.id == result.id,
+        ScreeningResult.version == read_version
+    ).update({
+        ScreeningResult.doctor_selected_medication: approval.selected_medication,
+        ScreeningResult.doctor_notes: approval.notes,
+        ScreeningResult.doctor_approved_at: now,
+        ScreeningResult.version: read_version + 1,
+        ScreeningResult.claimed_by_doctor_id: None,
+        ScreeningResult.claim_expires_at: None,
+    }, synchronize_session=False)
+
+    if not updated:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Screening result was modified by another request; reload and retry"
+        )
 
     # Update questionnaire status
     questionnaire = db.query(Questionnaire).filter(
@@ -167,10 +477,15 @@ def approve_medication(
 
     if questionnaire:
         questionnaire.status = QuestionnaireStatus.REVIEWED
-        questionnaire.reviewed_at = datetime.utcnow()
+        questionnaire.reviewed_at = now
         questionnaire.reviewed_by_doctor_id = current_user.id
 
+    record_selections(db, {result.questionnaire_id: approval.selected_medication})
     db.commit()
     db.refresh(result)
 
+    # Drop the cached copy served to polling clients
+    result_cache.invalidate(result.questionnaire_id)
+    publish_screening_approved(result.id, result.questionnaire_id, result.doctor_selected_medication, result.version)
+
     return result
@@ -0,0 +1,72 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.models.user import User
+from app.models.questionnaire import Questionnaire
+from app.models.screening_result import ScreeningResult
+from app.models.archive import QuestionnaireArchive, ScreeningResultArchive
+from app.schemas.questionnaire import QuestionnaireResponse
+from app.schemas.screening import ScreeningResultResponse
+from app.schemas.sync import SyncResponse
+from app.core.config import settings
+from app.core.deps import get_read_db, get_current_user
+from app.core.responses import FastJSONResponse
+from app.services.sync import QUESTIONNAIRE, SCREENING_RESULT, read_changes
+
+router = APIRouter()
+
+# Entity -> (live model, archive model, response schema, response key)
+SYNCED_ENTITIES = {
+    QUESTIONNAIRE: (Questionnaire, QuestionnaireArchive, QuestionnaireResponse, "questionnaires"),
+    SCREENING_RESULT: (ScreeningResult, ScreeningResultArchive, ScreeningResultResponse, "screening_results"),
+}
+
+
+@router.get("", response_model=SyncResponse)
+def sync(
+    since: int = Query(0, ge=0),
+    limit: int = Query(settings.SYNC_PAGE_SIZE, ge=1, le=settings.SYNC_PAGE_SIZE),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Questionnaires and screening results created, changed or deleted since a cursor
+
+    - **Patients**: Only their own
+    - **Doctors**: All
+    - **since**: The cursor returned by the previous sync (0, or omitted, for a full sync)
+
+    Each changed record is returned once, in its current state; deleted drafts
+    come back as ids under **deleted**. Store the returned **cursor** and send
+    it on the next sync. While **has_more** is true, sync again right away.
+    """
+    patient_id = current_user.id if current_user.role.value == "patient" else None
+    changes = read_changes(db, since, limit + 1, patient_id)
+    page = changes[:limit]
+
+    body = {
+        "cursor": page[-1].seq if page else since,
+        "has_more": len(changes) > limit,
+        "questionnaires": [],
+        "screening_results": [],
+        "deleted": {"questionnaires": [], "screening_results": []},
+    }
+
+    for entity, (model, archive_model, schema, key) in SYNCED_ENTITIES.items():
+        changed_ids = [change.entity_id for change in page if change.entity == entity and not change.deleted]
+        body["deleted"][key] = [change.entity_id for change in page if change.entity == entity and change.deleted]
+        if not changed_ids:
+            continue
+
+        rows = {row.id: row for row in db.query(model).filter(model.id.in_(changed_ids))}
+        missing = [entity_id for entity_id in changed_ids if entity_id not in rows]
+        if missing:
+            # Reviewed cases past the retention age live in the archive tables
+            rows.update({row.id: row for row in db.query(archive_model).filter(archive_model.id.in_(missing))})
+
+        body[key] = [
+            schema.model_validate(rows[entity_id]).model_dump(mode="json")
+            for entity_id in changed_ids
+            if entity_id in rows
+        ]
+
+    return FastJSONResponse(body)
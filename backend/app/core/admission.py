@@ -0,0 +1,214 @@
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, NamedTuple, Optional
+from app.core.config import settings
+from app.core.security import peek_token_role
+
+# Request classes, highest priority first
+CLINICIAN = "clinician"
+PATIENT = "patient"
+ANONYMOUS = "anonymous"
+BULK = "bulk"
+
+# Paths that do heavy batch work regardless of who calls them
+BULK_PATH_PREFIXES = (
+    "/api/screening/approve/batch",
+    "/api/questionnaires/bulk",
+    "/api/auth/provision",
+)
+
+# Paths that bypass admission control (cheap probes and long-lived streams)
+EXEMPT_PATHS = {"/", "/health", "/metrics", "/docs", "/redoc", "/openapi.json"}
+EXEMPT_PATH_PREFIXES = ("/api/events/",)
+
+
+class AdmissionLimits(NamedTuple):
+    """Concurrency slots, waiting room size and maximum queueing time for a class"""
+    max_concurrent: int
+    max_queue: int
+    deadline_seconds: float
+
+
+def parse_limits(value: str) -> AdmissionLimits:
+    """
+    Parse a limits string such as "12:100:5"
+
+    Args:
+        value: "<max concurrent>:<max queued>:<deadline seconds>"
+
+    Returns:
+        AdmissionLimits
+    """
+    try:
+        concurrent, queue, deadline = value.split(":")
+        return AdmissionLimits(int(concurrent), int(queue), float(deadline))
+    except ValueError:
+        raise ValueError(f"Invalid admission limits: {value!r} (expected e.g. '12:100:5')")
+
+
+class AdmissionClass:
+    """
+    Concurrency limiter with a bounded FIFO waiting room for one request class
+
+    Requests that would wait longer than the deadline are shed up front, based
+    on the queue length and a moving average of service time, instead of
+    timing out after holding a queue slot.
+    """
+
+    def __init__(self, name: str, limits: AdmissionLimits):
+        self.name = name
+        self.limits = limits
+        self.active = 0
+        self.admitted = 0
+        self.shed = 0
+        self.avg_service_seconds = 0.05
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def expected_wait(self) -> float:
+        """Estimated seconds until a newly queued request would start"""
+        return (self.queued + 1) * self.avg_service_seconds / max(self.limits.max_concurrent, 1)
+
+    async def acquire(self) -> bool:
+        """Wait for a slot; returns False if the request was shed"""
+        if self.active < self.limits.max_concurrent and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return True
+
+        if self.queued >= self.limits.max_queue or self.expected_wait() > self.limits.deadline_seconds:
+            self.shed += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout=self.limits.deadline_seconds)
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                # A slot was handed over just as the deadline passed - pass it on
+                self.release(0.0, record=False)
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            self.shed += 1
+            return False
+
+        self.admitted += 1
+        return True
+
+    def release(self, service_seconds: float, record: bool = True) -> None:
+        """Free a slot, handing it directly to the next waiter if there is one"""
+        if record:
+            self.avg_service_seconds = 0.8 * self.avg_service_seconds + 0.2 * service_seconds
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(True)
+                return
+        self.active -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "active": self.active,
+            "queued": self.queued,
+            "max_concurrent": self.limits.max_concurrent,
+            "max_queue": self.limits.max_queue,
+            "deadline_seconds": self.limits.deadline_seconds,
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "avg_service_ms": round(self.avg_service_seconds * 1000, 2),
+        }
+
+
+class AdmissionController:
+    """Classifies requests and holds one AdmissionClass per priority class"""
+
+    def __init__(self, limits: Dict[str, AdmissionLimits]):
+        self.classes = {name: AdmissionClass(name, value) for name, value in limits.items()}
+
+    def classify(self, scope: Dict[str, Any]) -> Optional[AdmissionClass]:
+        """Return the class for an HTTP request, or None if it bypasses admission control"""
+        path = scope["path"]
+        if scope["method"] == "OPTIONS" or path in EXEMPT_PATHS or path.startswith(EXEMPT_PATH_PREFIXES):
+            return None
+        if path.startswith(BULK_PATH_PREFIXES):
+            return self.classes[BULK]
+
+        # No signature check here: the route authenticates. A token this process has not
+        # verified yet (first request after login, or forged) is never classed above patient.
+        role = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() == "bearer" and token:
+                    role = peek_token_role(token)
+                break
+
+        if role in ("doctor", "admin"):
+            return self.classes[CLINICIAN]
+        if role in ("patient", "unverified"):
+            return self.classes[PATIENT]
+        return self.classes[ANONYMOUS]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {name: admission_class.snapshot() for name, admission_class in self.classes.items()}
+
+
+class AdmissionControlMiddleware:
+    """ASGI middleware that admits, queues or sheds (503) each request by priority class"""
+
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        admission_class = self.controller.classify(scope)
+        if admission_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await admission_class.acquire():
+            await self._reject(send, admission_class)
+            return
+
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            admission_class.release(time.monotonic() - started)
+
+    @staticmethod
+    async def _reject(send, admission_class: AdmissionClass) -> None:
+        retry_after = max(1, math.ceil(admission_class.expected_wait()))
+        body = json.dumps({"detail": "Server is busy, please retry later"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+admission_controller = AdmissionController({
+    CLINICIAN: parse_limits(settings.ADMISSION_CLINICIAN_LIMITS),
+    PATIENT: parse_limits(settings.ADMISSION_PATIENT_LIMITS),
+    ANONYMOUS: parse_limits(settings.ADMISSION_ANONYMOUS_LIMITS),
+    BULK: parse_limits(settings.ADMISSION_BULK_LIMITS),
+})
@@ -0,0 +1,126 @@
+"""
+Condition and Eating Habit Codes
+Canonical vocabulary for the questionnaire's health_conditions and
+eating_habits answers, with a stable bit position per value.
+
+The JSON lists stay the source of truth; Questionnaire also stores them as
+integer bitsets (health_conditions_mask, eating_habits_mask), set whenever
+the lists are assigned, so SQL can filter with bitwise predicates and the
+screening engine can test membership without building sets.
+
+Bit positions are part of the stored data: only ever APPEND new values.
+Never reorder, reuse or remove an entry.
+"""
+
+from typing import Iterable, List, Optional
+
+HEALTH_CONDITIONS = (
+    "none",
+    "no_comorbidities",
+    "hypertension",
+    "dyslipidemia",
+    "diabetes",
+    "sleep_apnea",
+    "arthritis",
+    "fatty_liver",
+    "cirrhosis",
+    "chronic_kidney_disease",
+    "liver_disease",
+    "cad",
+    "myocardial_infarction",
+    "mi",
+    "cerebrovascular_disease",
+    "cva_stroke",
+    "peripheral_arterial_disease",
+    "pad",
+    "intracranial_hypertension",
+    "heart_failure",
+    "adhd",
+    "bipolar_disorder",
+    "psychiatric_treatment",
+    "prior_eating_disorder",
+    "history_drug_abuse",
+    "substance_abuse",
+    "glaucoma",
+    "gastroparesis",
+    "gerd",
+    "history_pancreatitis",
+    "pancreatitis",
+    "hyperthyroidism",
+    "thyroid_cancer",
+    "medullary_thyroid_cancer",
+    "recurrent_kidney_stones",
+    "planning_pregnancy",
+    "pregnancy_breastfeeding",
+    "taking_tamoxifen",
+    "taking_maoi",
+    "taking_glp_or_dm2_meds",
+)
+
+EATING_HABITS = (
+    "none",
+    "excessive_appetite",
+    "lack_of_satiety",
+    "binge_eating",
+    "emotional_eating",
+    "night_eating",
+    "frequent_snacking",
+)
+
+# Set for any value outside the vocabulary, so "has any answer other than X" stays exact
+HEALTH_CONDITION_OTHER_BIT = 62
+EATING_HABIT_OTHER_BIT = 62
+
+HEALTH_CONDITION_BITS = {name: 1 << position for position, name in enumerate(HEALTH_CONDITIONS)}
+EATING_HABIT_BITS = {name: 1 << position for position, name in enumerate(EATING_HABITS)}
+
+assert len(HEALTH_CONDITIONS) < HEALTH_CONDITION_OTHER_BIT and len(EATING_HABITS) < EATING_HABIT_OTHER_BIT
+
+
+def _encode(values: Optional[Iterable[str]], bits, other_bit: int) -> int:
+    mask = 0
+    for value in values or ():
+        mask |= bits.get(value, 1 << other_bit)
+    return mask
+
+
+def encode_health_conditions(values: Optional[Iterable[str]]) -> int:
+    """Bitset for a list of health condition keys"""
+    return _encode(values, HEALTH_CONDITION_BITS, HEALTH_CONDITION_OTHER_BIT)
+
+
+def encode_eating_habits(values: Optional[Iterable[str]]) -> int:
+    """Bitset for a list of eating habit keys"""
+    return _encode(values, EATING_HABIT_BITS, EATING_HABIT_OTHER_BIT)
+
+
+def decode_health_conditions(mask: int) -> List[str]:
+    """Known health condition keys set in a bitset, in vocabulary order"""
+    return [name for name, bit in HEALTH_CONDITION_BITS.items() if mask & bit]
+
+
+def decode_eating_habits(mask: int) -> List[str]:
+    """Known eating habit keys set in a bitset, in vocabulary order"""
+    return [name for name, bit in EATING_HABIT_BITS.items() if mask & bit]
+
+
+def condition_mask(*names: str) -> int:
+    """Bitset for vocabulary condition keys; raises KeyError for unknown keys"""
+    mask = 0
+    for name in names:
+        mask |= HEALTH_CONDITION_BITS[name]
+    return mask
+
+
+def habit_mask(*names: str) -> int:
+    """Bitset for vocabulary eating habit keys; raises KeyError for unknown keys"""
+    mask = 0
+    for name in names:
+        mask |= EATING_HABIT_BITS[name]
+    return mask
+
+
+# Every condition answer except "none" counts as a comorbidity for the eligibility gate
+COMORBIDITY_MASK = (
+    condition_mask(*HEALTH_CONDITIONS) | (1 << HEALTH_CONDITION_OTHER_BIT)
+) & ~condition_mask("none")
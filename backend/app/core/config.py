@@ -11,11 +11,14 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = "sqlite:///./aom_screening.db"
+    DATABASE_REPLICA_URL: str = ""  # Read replica for read-only routes (empty: read from the primary)
+    READ_YOUR_WRITES_SECONDS: float = 5.0  # Reads stay on the primary this long after a client's own write
 
     # Security
     SECRET_KEY: str = "dev-secret-key-change-in-production-09f26e402a1b1d3e8c5e7f91a3b2c4d5"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000  # Verified JWT claims kept in memory until the token expires (0 disables)
 
     # CORS
     ALLOWED_ORIGINS: str = "http://localhost:3000,http://localhost:5173,https://*.vercel.app"
@@ -23,6 +26,81 @@ class Settings(BaseSettings):
     # Environment
     ENVIRONMENT: str = "development"
 
+    # Screening result cache (GET /api/screening/results/{id})
+    RESULT_CACHE_MAX_ENTRIES: int = 1024
+    RESULT_CACHE_TTL_SECONDS: int = 30
+
+    # Screening preview cache (POST /api/screening/preview), keyed by input fingerprint
+    PREVIEW_CACHE_MAX_ENTRIES: int = 4096
+    PREVIEW_CACHE_TTL_SECONDS: int = 3600
+
+    # Memoized fuzzy matching of patient-entered drug allergies
+    ALLERGY_NORMALIZER_CACHE_SIZE: int = 10000
+
+    # Memoized parsing of free-text previous AOM history
+    AOM_HISTORY_CACHE_SIZE: int = 10000
+
+    # Default number of points returned by GET /api/patients/{id}/trend (longer histories are downsampled)
+    PATIENT_TREND_MAX_POINTS: int = 200
+
+    # Maximum changes returned by one GET /api/sync page
+    SYNC_PAGE_SIZE: int = 500
+
+    # Response compression (brotli when installed, else gzip) for bodies of at least this many bytes
+    RESPONSE_COMPRESSION_MIN_BYTES: int = 1024
+    RESPONSE_GZIP_LEVEL: int = 6
+    RESPONSE_BROTLI_QUALITY: int = 5  # 0-11; mid-range levels compress well at a fraction of the CPU of 11
+
+    # Bulk kiosk uploads (POST /api/questionnaires/bulk)
+    QUESTIONNAIRE_BULK_MAX_RECORDS: int = 5000
+    QUESTIONNAIRE_BULK_CHUNK_SIZE: int = 500  # Records inserted per transaction
+
+    # Bulk user provisioning (POST /api/auth/provision, provision_users.py)
+    PROVISION_WORKERS: int = 0  # Password hashing processes; 0 for one per CPU
+    PROVISION_CHUNK_SIZE: int = 500  # Users inserted per transaction
+
+    # Idempotency-Key retention for anonymous create/submit
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
+
+    # Rate limiting for public endpoints ("<requests>/<second|minute|hour|day>" per client IP)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_TRUST_PROXY: bool = False  # Use X-Forwarded-For (enable behind a reverse proxy)
+    RATE_LIMIT_TRUSTED_PROXY_HOPS: int = 1  # Proxies in front of the app; the client is this many entries from the right
+    RATE_LIMIT_QUESTIONNAIRE_CREATE: str = "20/minute"
+    RATE_LIMIT_QUESTIONNAIRE_SUBMIT: str = "20/minute"
+    RATE_LIMIT_QUESTIONNAIRE_BULK: str = "10/minute"
+    RATE_LIMIT_SCREENING_RUN: str = "20/minute"
+    RATE_LIMIT_SCREENING_PREVIEW: str = "60/minute"
+    RATE_LIMIT_SCREENING_RESULTS: str = "120/minute"
+
+    # Admission control: "<max concurrent>:<max queued>:<deadline seconds>" per request class
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_CLINICIAN_LIMITS: str = "12:100:10"
+    ADMISSION_PATIENT_LIMITS: str = "12:100:5"
+    ADMISSION_ANONYMOUS_LIMITS: str = "10:50:2"
+    ADMISSION_BULK_LIMITS: str = "2:4:30"
+
+    # Background screening: submit enqueues a job and returns 202 instead of relying on /run
+    SCREENING_JOBS_ENABLED: bool = False
+    SCREENING_WORKERS: int = 2  # In-process worker threads; 0 when running screening_worker.py separately
+    SCREENING_JOB_POLL_SECONDS: float = 1.0
+    SCREENING_JOB_VISIBILITY_TIMEOUT_SECONDS: int = 60
+    SCREENING_JOB_MAX_ATTEMPTS: int = 5
+    SCREENING_JOB_BACKOFF_SECONDS: float = 2.0  # Doubled after every failed attempt
+
+    # Doctor work queue claims
+    CLAIM_LEASE_SECONDS: int = 900
+
+    # Retention: reviewed cases older than this move to the archive tables (archive_reviewed.py)
+    ARCHIVE_REVIEWED_AFTER_DAYS: int = 90
+    ARCHIVE_BATCH_SIZE: int = 500
+
+    # Server-Sent Events (/api/events)
+    PUBSUB_BACKEND: str = "memory"
+    EVENTS_HEARTBEAT_SECONDS: int = 15
+    EVENTS_QUEUE_SIZE: int = 100
+
     @property
     def allowed_origins_list(self) -> List[str]:
         """Convert comma-separated origins to list"""
@@ -1,13 +1,59 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from jose import JWTError
+from typing import Optional
+from app.core.rate_limit import client_ip
 from app.core.security import decode_access_token
-from app.db.session import get_db
+from app.db.session import has_read_replica, open_read_session, open_session
 from app.models.user import User, UserRole
 from app.schemas.user import TokenData
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
+
+
+def get_stickiness_key(request: Request) -> Optional[str]:
+    """
+    Dependency identifying the client for read-your-writes stickiness
+
+    The token's user, else the client IP; None when there is no read replica
+    to be sticky about.
+    """
+    if not has_read_replica:
+        return None
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        payload = decode_access_token(token)
+        if payload and payload.get("user_id") is not None:
+            return f"user:{payload['user_id']}"
+    return f"ip:{client_ip(request)}"
+
+
+def get_db(client: Optional[str] = Depends(get_stickiness_key)):
+    """
+    Dependency function to get database session.
+    Yields a database session and ensures it's closed after use.
+    """
+    db = open_session(client)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db(client: Optional[str] = Depends(get_stickiness_key)):
+    """
+    Dependency function to get a session for read-only routes.
+    Uses the read replica when configured, except for clients that wrote
+    within READ_YOUR_WRITES_SECONDS, who keep reading from the primary.
+    """
+    db = open_read_session(client)
+    try:
+        yield db
+    finally:
+        db.close()
 
 
 def get_current_user(
@@ -55,6 +101,39 @@ def get_current_user(
     return user
 
 
+def get_stream_token(
+    header_token: Optional[str] = Depends(optional_oauth2_scheme),
+    access_token: Optional[str] = Query(None, description="JWT for clients that cannot set headers (browser EventSource)")
+) -> str:
+    """
+    Dependency returning the JWT of a streaming request
+
+    A browser EventSource cannot send an Authorization header, so the token
+    may also be passed as the access_token query parameter.
+    """
+    token = header_token or access_token
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return token
+
+
+def get_current_stream_doctor(
+    token: str = Depends(get_stream_token),
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    Dependency to ensure the user of a streaming request is a doctor
+
+    Raises:
+        HTTPException: If the token is invalid or the user is not a doctor
+    """
+    return get_current_active_doctor(get_current_user(token, db))
+
+
 def get_current_active_patient(current_user: User = Depends(get_current_user)) -> User:
     """
     Dependency to ensure current user is a patient
@@ -95,3 +174,48 @@ def get_current_active_doctor(current_user: User = Depends(get_current_user)) ->
             detail="Only doctors can access this resource"
         )
     return current_user
+
+
+def get_current_active_admin(current_user: User = Depends(get_current_user)) -> User:
+    """
+    Dependency to ensure current user is an administrator
+
+    Args:
+        current_user: Current authenticated user
+
+    Returns:
+        Current user if they are an administrator
+
+    Raises:
+        HTTPException: If user is not an administrator
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only administrators can access this resource"
+        )
+    return current_user
+
+
+def get_current_clinic_staff(current_user: User = Depends(get_current_user)) -> User:
+    """
+    Dependency to ensure current user is clinic staff (a doctor or an administrator)
+
+    Clinic kiosks sign in with a staff account to upload the questionnaires
+    they collected.
+
+    Args:
+        current_user: Current authenticated user
+
+    Returns:
+        Current user if they are a doctor or an administrator
+
+    Raises:
+        HTTPException: If user is a patient
+    """
+    if current_user.role not in (UserRole.DOCTOR, UserRole.ADMIN):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only clinic staff can access this resource"
+        )
+    return current_user
@@ -0,0 +1,143 @@
+import math
+from abc import ABC, abstractmethod
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Tuple
+from fastapi import HTTPException, Request, status
+from app.core.config import settings
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+class RateQuota(NamedTuple):
+    """Token bucket quota: burst capacity refilled evenly over a period"""
+    capacity: int
+    period_seconds: float
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.capacity / self.period_seconds
+
+
+def parse_quota(value: str) -> RateQuota:
+    """
+    Parse a quota string such as "20/minute"
+
+    Args:
+        value: "<requests>/<second|minute|hour|day>"
+
+    Returns:
+        RateQuota
+
+    Raises:
+        ValueError: If the string is malformed or allows fewer than 1 request
+    """
+    try:
+        count, period = value.split("/")
+        quota = RateQuota(int(count), float(_PERIODS[period.strip().lower()]))
+    except (KeyError, ValueError):
+        raise ValueError(f"Invalid rate limit quota: {value!r} (expected e.g. '20/minute')")
+    if quota.capacity < 1:
+        raise ValueError(f"Invalid rate limit quota: {value!r} (must allow at least 1 request)")
+    return quota
+
+
+class RateLimitBackend(ABC):
+    """Interface for rate limit state stores (in-memory, or shared across workers)"""
+
+    @abstractmethod
+    def acquire(self, key: str, quota: RateQuota) -> float:
+        """
+        Take one token from the bucket for key
+
+        Returns:
+            0 if the request is allowed, otherwise seconds until a token is available
+        """
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Per-process token buckets; the least recently used keys are evicted beyond max_keys"""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, quota: RateQuota) -> float:
+        now = time.monotonic()
+        rate = quota.refill_per_second
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (float(quota.capacity), now))
+            tokens = min(float(quota.capacity), tokens + (now - updated) * rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+_BACKENDS = {
+    "memory": InMemoryRateLimitBackend,
+}
+
+backend: RateLimitBackend = _BACKENDS[settings.RATE_LIMIT_BACKEND]()
+
+
+def set_backend(new_backend: RateLimitBackend) -> None:
+    """Replace the active backend (e.g. with a shared store in multi-worker deployments)"""
+    global backend
+    backend = new_backend
+
+
+def get_backend() -> RateLimitBackend:
+    """Return the active backend"""
+    return backend
+
+
+def client_ip(request: Request) -> str:
+    """
+    Client address, taken from X-Forwarded-For when running behind a trusted proxy
+
+    Each proxy appends the address it received the request from, so only the
+    last RATE_LIMIT_TRUSTED_PROXY_HOPS entries were written by our own proxies;
+    anything to the left of them is whatever the client chose to send.
+    """
+    if settings.RATE_LIMIT_TRUST_PROXY:
+        forwarded = [entry.strip() for entry in request.headers.get("x-forwarded-for", "").split(",")]
+        forwarded = [entry for entry in forwarded if entry]
+        if forwarded:
+            return forwarded[max(len(forwarded) - settings.RATE_LIMIT_TRUSTED_PROXY_HOPS, 0)]
+    return request.client.host if request.client else "unknown"
+
+
+def rate_limit(scope: str, quota_setting: str):
+    """
+    Build a dependency enforcing a per-client token bucket on a route
+
+    Args:
+        scope: Bucket namespace, usually the route name
+        quota_setting: Name of the Settings field holding the quota string
+
+    Raises (from the dependency):
+        HTTPException: 429 with Retry-After when the bucket is empty
+    """
+    quota = parse_quota(getattr(settings, quota_setting))
+
+    async def dependency(request: Request) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        wait = get_backend().acquire(f"{scope}:{client_ip(request)}", quota)
+        if wait > 0:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, please retry later",
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+
+    return dependency
@@ -0,0 +1,208 @@
+import gzip
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, List, Optional, Sequence
+from fastapi.responses import JSONResponse
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional; responses are then always JSON
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is offered instead
+    brotli = None
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+_MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack")
+_JSON_MEDIA_TYPES = ("application/json", "application/*", "*/*")
+
+# Request headers that select the representation of a FastJSONResponse
+NEGOTIATED_VARY = "Accept, Accept-Encoding"
+
+
+def _json_default(value: Any) -> Any:
+    """Encode the non-JSON types that come back from database columns"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def render_json(content: Any) -> bytes:
+    """
+    Serialize content to JSON bytes
+
+    Uses orjson when installed, otherwise the stdlib encoder. Both handle
+    datetimes and enums so column values can be passed through unchanged.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content,
+        default=_json_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def render_msgpack(content: Any) -> bytes:
+    """Serialize content to MessagePack, encoding column types the same way as render_json"""
+    return msgpack.packb(content, default=_json_default, use_bin_type=True)
+
+
+def parse_json(body: bytes) -> Any:
+    return orjson.loads(body) if orjson is not None else json.loads(body)
+
+
+def _qualities(header: str) -> Dict[str, float]:
+    """Map each value of an Accept or Accept-Encoding header to its q weight"""
+    weights = {}
+    for item in header.split(","):
+        value, *params = [part.strip() for part in item.split(";")]
+        weight = 1.0
+        for param in params:
+            name, _, number = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    weight = float(number)
+                except ValueError:
+                    weight = 0.0
+        if value:
+            weights[value.lower()] = weight
+    return weights
+
+
+def wants_msgpack(accept: Optional[str]) -> bool:
+    """
+    True if the Accept header names MessagePack at least as strongly as JSON
+
+    Wildcards alone (*/*) keep JSON; MessagePack must be asked for by name.
+    """
+    if msgpack is None or not accept:
+        return False
+    weights = _qualities(accept)
+    msgpack_weight = max((weights.get(media_type, 0.0) for media_type in _MSGPACK_MEDIA_TYPES), default=0.0)
+    json_weight = max((weights.get(media_type, 0.0) for media_type in _JSON_MEDIA_TYPES), default=0.0)
+    return msgpack_weight > 0 and msgpack_weight >= json_weight
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Content-Encoding to use for a response: br if installed and accepted, else gzip, else none"""
+    if not accept_encoding:
+        return None
+    weights = _qualities(accept_encoding)
+    wildcard = weights.get("*", 0.0)
+    if brotli is not None and weights.get("br", wildcard) > 0:
+        return "br"
+    if weights.get("gzip", wildcard) > 0:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.RESPONSE_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.RESPONSE_GZIP_LEVEL, mtime=0)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson when available
+
+    When sent, the representation is negotiated with the request headers:
+    MessagePack if Accept asks for application/msgpack (and msgpack is
+    installed), and brotli or gzip compression if Accept-Encoding allows it
+    and the body is at least RESPONSE_COMPRESSION_MIN_BYTES. Transformed
+    responses get a weak ETag and every response carries Vary.
+    """
+
+    def __init__(self, content: Any, *args, **kwargs):
+        self.content = content
+        super().__init__(content, *args, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        return render_json(content)
+
+    def negotiable_content(self) -> Any:
+        """Content to re-encode as MessagePack"""
+        return self.content
+
+    async def __call__(self, scope, receive, send) -> None:
+        if self.body:
+            self.negotiate(scope)
+        await super().__call__(scope, receive, send)
+
+    def negotiate(self, scope) -> None:
+        request_headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in scope.get("headers", ())}
+        body = self.body
+        content_type = None
+        encoding = None
+
+        if wants_msgpack(request_headers.get("accept")):
+            body = render_msgpack(self.negotiable_content())
+            content_type = MSGPACK_MEDIA_TYPE
+
+        if len(body) >= settings.RESPONSE_COMPRESSION_MIN_BYTES:
+            encoding = choose_encoding(request_headers.get("accept-encoding"))
+            if encoding:
+                body = compress(body, encoding)
+
+        if content_type:
+            self.headers["content-type"] = content_type
+        if encoding:
+            self.headers["content-encoding"] = encoding
+        if content_type or encoding:
+            etag = self.headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                # Byte-for-byte different from the JSON representation
+                self.headers["etag"] = "W/" + etag
+            self.body = body
+            self.headers["content-length"] = str(len(body))
+        self.headers["vary"] = NEGOTIATED_VARY
+
+
+class EncodedJSONResponse(FastJSONResponse):
+    """FastJSONResponse for a body that is already JSON bytes (e.g. from a cache)"""
+
+    def render(self, content: Any) -> bytes:
+        return content
+
+    def negotiable_content(self) -> Any:
+        return parse_json(self.content)
+
+
+def schema_columns(model: Any, schema: Any) -> List[Any]:
+    """
+    Return the model columns backing each field of a response schema
+
+    Selecting these instead of the whole entity keeps large JSON/Text columns
+    out of list queries that never return them.
+    """
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def rows_as_dicts(rows: Sequence[Any]) -> List[Dict[str, Any]]:
+    """
+    Convert column-tuple query rows to plain dicts keyed by column name
+
+    Used by list endpoints that select only the response columns and skip
+    ORM hydration and Pydantic validation.
+    """
+    if not rows:
+        return []
+    keys = rows[0]._fields
+    return [dict(zip(keys, row)) for row in rows]
@@ -1,5 +1,9 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
@@ -8,6 +12,99 @@ from app.core.config import settings
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+class VerifiedTokenCache:
+    """
+    Bounded LRU cache of verified JWT claims, keyed by a SHA-256 of the token
+
+    A token's signature and claims never change, so once verified its claims
+    can be reused until the token's own exp; a repeat request then costs one
+    hash and a dictionary lookup instead of HMAC verification and JSON
+    parsing. Tokens are not kept in memory, only their digests.
+
+    Revoked tokens are remembered until they would have expired anyway.
+    Both the cache and the revocation list are per process.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self._revoked: Dict[bytes, float] = {}  # Token digest -> exp
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        """Claims of a verified, unexpired token, or None"""
+        with self._lock:
+            claims = self._entries.get(key)
+            if claims is None:
+                self.misses += 1
+                return None
+            if claims["exp"] <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return claims
+
+    def set(self, key: bytes, claims: Dict[str, Any]) -> None:
+        # Only tokens that expire are cached, so an entry never outlives its token
+        if self.max_entries <= 0 or not isinstance(claims.get("exp"), (int, float)):
+            return
+        with self._lock:
+            if key in self._revoked:
+                return
+            self._entries[key] = claims
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def peek(self, key: bytes) -> Optional[Dict[str, Any]]:
+        """Like get, but leaves hit counts and recency alone"""
+        with self._lock:
+            claims = self._entries.get(key)
+        if claims is None or claims["exp"] <= time.time():
+            return None
+        return claims
+
+    def is_revoked(self, key: bytes) -> bool:
+        return key in self._revoked
+
+    def revoke(self, key: bytes, expires_at: float) -> None:
+        """Drop a token and reject it until expires_at"""
+        now = time.time()
+        with self._lock:
+            self._entries.pop(key, None)
+            for revoked_key in [k for k, exp in self._revoked.items() if exp <= now]:
+                del self._revoked[revoked_key]
+            if expires_at > now:
+                self._revoked[key] = expires_at
+
+    def clear(self) -> None:
+        """Drop all cached claims (e.g. after rotating SECRET_KEY); revocations are kept"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "revoked": len(self._revoked),
+        }
+
+
+token_cache = VerifiedTokenCache(max_entries=settings.TOKEN_CACHE_MAX_ENTRIES)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
     return pwd_context.verify(plain_password, hashed_password)
@@ -54,9 +151,55 @@ def decode_access_token(token: str) -> Optional[dict]:
 
     Returns:
         Decoded token payload or None if invalid
+
+    Verified payloads are served from token_cache until the token expires.
     """
+    key = token_cache.key(token)
+    if token_cache.is_revoked(key):
+        return None
+
+    payload = token_cache.get(key)
+    if payload is not None:
+        return dict(payload)
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except JWTError:
         return None
+    token_cache.set(key, payload)
+    return dict(payload)
+
+
+def peek_token_role(token: str) -> Optional[str]:
+    """
+    Role claimed by a token, without verifying its signature
+
+    For request prioritization only, never for authorization. The claims of
+    a token this process has already verified come from token_cache.
+    Anything else is only parsed, not verified, so its role counts as
+    "unverified".
+    """
+    key = token_cache.key(token)
+    if token_cache.is_revoked(key):
+        return None
+    claims = token_cache.peek(key)
+    if claims is not None:
+        return claims.get("role")
+    try:
+        claims = jwt.get_unverified_claims(token)
+    except JWTError:
+        return None
+    return "unverified" if claims.get("role") else None
+
+
+def revoke_token(token: str) -> None:
+    """
+    Reject a token from now on (in this process), e.g. on logout
+
+    Returns without effect for tokens that are invalid or already expired.
+    """
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return
+    token_cache.revoke(token_cache.key(token), float(payload.get("exp", 0)))
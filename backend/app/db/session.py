@@ -1,34 +1,102 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
 
 # Create database engine
 # Use SQLite for development (easier setup, no PostgreSQL required)
 DATABASE_URL = getattr(settings, 'DATABASE_URL', 'sqlite:///./aom_screening.db')
 
-# SQLite specific configuration
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
-    pool_pre_ping=True,
-    echo=settings.ENVIRONMENT == "development"
-)
+
+def _create_engine(url: str):
+    # SQLite specific configuration
+    return create_engine(
+        url,
+        connect_args={"check_same_thread": False} if url.startswith("sqlite") else {},
+        pool_pre_ping=True,
+        echo=settings.ENVIRONMENT == "development"
+    )
+
+
+engine = _create_engine(DATABASE_URL)
+
+# Read replica engine (the primary itself when no replica is configured)
+read_engine = _create_engine(settings.DATABASE_REPLICA_URL) if settings.DATABASE_REPLICA_URL else engine
+has_read_replica = read_engine is not engine
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 # Create Base class for models
 Base = declarative_base()
 
 
-def get_db():
+class RecentWriters:
+    """
+    Remembers which clients wrote recently, for read-your-writes stickiness
+
+    Per process; the least recently used clients are evicted beyond max_clients.
+    """
+
+    def __init__(self, max_clients: int = 100_000):
+        self.max_clients = max_clients
+        self._writes: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, client: str) -> None:
+        with self._lock:
+            self._writes[client] = time.monotonic()
+            self._writes.move_to_end(client)
+            if len(self._writes) > self.max_clients:
+                self._writes.popitem(last=False)
+
+    def wrote_within(self, client: str, seconds: float) -> bool:
+        with self._lock:
+            written = self._writes.get(client)
+        return written is not None and time.monotonic() - written < seconds
+
+
+recent_writers = RecentWriters()
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _mark_written(session: Session, flush_context) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _record_writer(session: Session) -> None:
+    # Only sessions opened for a known client carry a stickiness key
+    client: Optional[str] = session.info.get("client")
+    if session.info.pop("wrote", False) and client is not None and has_read_replica:
+        recent_writers.record(client)
+
+
+def open_session(client: Optional[str] = None) -> Session:
     """
-    Dependency function to get database session.
-    Yields a database session and ensures it's closed after use.
+    Session on the primary
+
+    Args:
+        client: Stickiness key of the caller; a commit that writes makes the
+            caller's reads stay on the primary for READ_YOUR_WRITES_SECONDS
+    """
+    return SessionLocal(info={"client": client})
+
+
+def open_read_session(client: Optional[str] = None) -> Session:
+    """
+    Session for read-only work
+
+    Uses the read replica when configured, except for clients that wrote
+    within READ_YOUR_WRITES_SECONDS, who keep reading from the primary.
     """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+    if not has_read_replica or (
+        client is not None and recent_writers.wrote_within(client, settings.READ_YOUR_WRITES_SECONDS)
+    ):
+        return SessionLocal()
+    return ReadSessionLocal(info={"replica": True})
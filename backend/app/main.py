@@ -1,21 +1,64 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.responses import FastJSONResponse
+from app.core.admission import AdmissionControlMiddleware, admission_controller
+from app.core.security import token_cache
+from app.core.deps import get_current_active_admin
 from app.db.session import engine, Base
 
 # Import models to register them with SQLAlchemy
-from app.models import User, Questionnaire, ScreeningResult
+from app.models import (
+    User, Questionnaire, ScreeningResult, IdempotencyKey, ScreeningJob,
+    QuestionnaireArchive, ScreeningResultArchive, PatientTrendPoint, SyncChange,
+)
+from app.services.screening_jobs import ScreeningWorkerPool
+from app.services.provisioning import start_hashing_pool, stop_hashing_pool
+from app.services.aom_history import parser_stats as aom_history_stats
+from app.services.screening_service import allergy_normalizer
+from app.services.search import install_search_index
+from app.services.sync import install_change_tracking
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+# Full-text search index over remarks and doctor notes, and the delta-sync change log,
+# both kept current by database triggers
+with engine.begin() as connection:
+    install_search_index(connection)
+    install_change_tracking(connection)
+
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start in-process screening workers when background screening is enabled, and the password hashing pool"""
+    pool = None
+    if settings.SCREENING_JOBS_ENABLED and settings.SCREENING_WORKERS > 0:
+        pool = ScreeningWorkerPool(settings.SCREENING_WORKERS, settings.SCREENING_JOB_POLL_SECONDS)
+        pool.start()
+    start_hashing_pool(settings.PROVISION_WORKERS)
+    yield
+    stop_hashing_pool()
+    if pool is not None:
+        pool.stop()
+
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
-    description="Oral Anti-Obesity Medications Screening Application"
+    description="Oral Anti-Obesity Medications Screening Application",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
 )
 
+# Admission control: per-class concurrency limits with early load shedding.
+# Added before CORS so that shed (503) responses still carry CORS headers.
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(AdmissionControlMiddleware, controller=admission_controller)
+
 # Configure CORS
 # For production, allow Vercel domains
 allowed_origins = settings.allowed_origins_list
@@ -48,9 +91,23 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", dependencies=[Depends(get_current_active_admin)])
+async def metrics():
+    """Operational metrics: admission control per request class, screening caches and the token cache (administrators only)"""
+    return {
+        "admission": admission_controller.snapshot(),
+        "allergy_normalizer": allergy_normalizer.stats(),
+        "aom_history_parser": aom_history_stats(),
+        "token_cache": token_cache.stats(),
+    }
+
+
 # Include API routers
-from app.api import auth, questionnaires, screening
+from app.api import auth, questionnaires, screening, events, patients, sync
 
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(questionnaires.router, prefix="/api/questionnaires", tags=["Questionnaires"])
 app.include_router(screening.router, prefix="/api/screening", tags=["Screening"])
+app.include_router(events.router, prefix="/api/events", tags=["Events"])
+app.include_router(patients.router, prefix="/api/patients", tags=["Patients"])
+app.include_router(sync.router, prefix="/api/sync", tags=["Sync"])
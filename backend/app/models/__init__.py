@@ -1,6 +1,11 @@
 from app.models.user import User, UserRole
 from app.models.questionnaire import Questionnaire, QuestionnaireStatus
 from app.models.screening_result import ScreeningResult
+from app.models.idempotency_key import IdempotencyKey
+from app.models.screening_job import ScreeningJob, ScreeningJobStatus
+from app.models.archive import QuestionnaireArchive, ScreeningResultArchive
+from app.models.patient_trend import PatientTrendPoint
+from app.models.sync_change import SyncChange
 
 __all__ = [
     "User",
@@ -8,4 +13,11 @@ __all__ = [
     "Questionnaire",
     "QuestionnaireStatus",
     "ScreeningResult",
+    "IdempotencyKey",
+    "ScreeningJob",
+    "ScreeningJobStatus",
+    "QuestionnaireArchive",
+    "ScreeningResultArchive",
+    "PatientTrendPoint",
+    "SyncChange",
 ]
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, DateTime, String, Table
+from sqlalchemy.sql import func
+from app.db.session import Base
+from app.models.questionnaire import Questionnaire
+from app.models.screening_result import ScreeningResult
+
+
+def _archive_table(name: str, live_table: Table) -> Table:
+    """
+    Archive copy of a live table: same columns and indexes, no foreign keys or
+    defaults, plus the month the row was archived into
+    """
+    columns = [
+        Column(column.name, column.type, primary_key=column.primary_key,
+               nullable=column.nullable, index=column.index, unique=column.unique)
+        for column in live_table.columns
+    ]
+    return Table(
+        name, Base.metadata, *columns,
+        Column("archive_month", String(7), nullable=False, index=True),  # "YYYY-MM" of the archived row's review
+        Column("archived_at", DateTime(timezone=True), server_default=func.now()),
+    )
+
+
+class QuestionnaireArchive(Base):
+    """Reviewed questionnaires moved out of the live table by the retention job"""
+    __table__ = _archive_table("questionnaires_archive", Questionnaire.__table__)
+
+
+class ScreeningResultArchive(Base):
+    """Approved screening results moved out of the live table by the retention job"""
+    __table__ = _archive_table("screening_results_archive", ScreeningResult.__table__)
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+
+class IdempotencyKey(Base):
+    """Client-supplied Idempotency-Key recorded for retry-safe public endpoints"""
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint("key", "endpoint", name="uq_idempotency_key_endpoint"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    key = Column(String(255), nullable=False)
+    endpoint = Column(String, nullable=False)  # e.g. "questionnaires.create_anonymous"
+    request_fingerprint = Column(String(64), nullable=False)  # SHA-256 of the request payload
+    questionnaire_id = Column(Integer, ForeignKey("questionnaires.id", ondelete="CASCADE"), nullable=False)
+
+    # Metadata
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Index
+from app.db.session import Base
+
+
+class PatientTrendPoint(Base):
+    """One submitted questionnaire in a patient's BMI history (written on submit, edit and approval)"""
+    __tablename__ = "patient_trend_points"
+    __table_args__ = (
+        # Backs GET /api/patients/{id}/trend: one range scan, already in date order
+        Index("ix_patient_trend_points_patient_submitted", "patient_id", "submitted_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    patient_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    questionnaire_id = Column(Integer, unique=True, nullable=False)  # No foreign key: history outlives archived questionnaires
+    submitted_at = Column(DateTime(timezone=True), nullable=False)
+    weight_lb = Column(Float, nullable=False)
+    bmi = Column(Float, nullable=False)
+    is_eligible = Column(Boolean, nullable=False)
+    selected_medication = Column(String, nullable=True)  # Set when a doctor approves
@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, JSON, Enum as SQLEnum
+from sqlalchemy import Column, Integer, BigInteger, String, Float, Boolean, DateTime, ForeignKey, JSON, Enum as SQLEnum
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 import enum
 from app.db.session import Base
+from app.core.condition_codes import encode_eating_habits, encode_health_conditions
 
 
 class QuestionnaireStatus(str, enum.Enum):
@@ -15,6 +16,8 @@ class QuestionnaireStatus(str, enum.Enum):
 class Questionnaire(Base):
     """Patient questionnaire responses"""
     __tablename__ = "questionnaires"
+    # Never reissue ids of rows moved to questionnaires_archive (SQLite reuses the highest id otherwise)
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id = Column(Integer, primary_key=True, index=True)
     patient_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # Nullable for anonymous submissions
@@ -32,11 +35,14 @@ class Questionnaire(Base):
 
     # Section II: Eating Habits & Feelings
     eating_habits = Column(JSON, nullable=True)  # List of eating habits
+    eating_habits_mask = Column(BigInteger, nullable=True)  # Bitset of eating_habits (condition_codes)
 
     # Section III: Medical Conditions & Health Status
     health_conditions = Column(JSON, nullable=True)  # List of health conditions
+    health_conditions_mask = Column(BigInteger, nullable=True)  # Bitset of health_conditions (condition_codes)
     condition_control_status = Column(JSON, nullable=True)  # Dict mapping condition key to "controlled"/"uncontrolled"
     previous_aom_history = Column(String, nullable=True)  # Previously tried AOMs
+    previous_aom_entries = Column(JSON, nullable=True)  # previous_aom_history parsed into drug/outcome/side_effect entries (aom_history.stored_entries)
 
     # Section IV: Medication and Allergy History
     current_medications = Column(JSON, nullable=True)  # List of medications
@@ -53,6 +59,16 @@ class Questionnaire(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    @validates("health_conditions")
+    def _encode_health_conditions(self, key, value):
+        self.health_conditions_mask = encode_health_conditions(value)
+        return value
+
+    @validates("eating_habits")
+    def _encode_eating_habits(self, key, value):
+        self.eating_habits_mask = encode_eating_habits(value)
+        return value
+
     # Relationships commented out to avoid SQLAlchemy ambiguous foreign key errors
     # Access related data using foreign key columns directly (patient_id, reviewed_by_doctor_id)
     # patient = relationship("User", foreign_keys=[patient_id])
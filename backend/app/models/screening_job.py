@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy.sql import func
+import enum
+from app.db.session import Base
+
+
+class ScreeningJobStatus(str, enum.Enum):
+    """Background screening job status"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class ScreeningJob(Base):
+    """Queued screening run for a submitted questionnaire (background screening mode)"""
+    __tablename__ = "screening_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    questionnaire_id = Column(Integer, ForeignKey("questionnaires.id"), unique=True, nullable=False)
+    status = Column(SQLEnum(ScreeningJobStatus), default=ScreeningJobStatus.QUEUED, nullable=False, index=True)
+
+    # Retry / visibility timeout bookkeeping
+    attempts = Column(Integer, default=0, nullable=False)
+    available_at = Column(DateTime(timezone=True), nullable=False)  # Not picked up before this time (backoff)
+    locked_by = Column(String, nullable=True)  # Lease token of the worker currently running the job
+    locked_until = Column(DateTime(timezone=True), nullable=True)  # Lease expiry; job is re-queued after this
+    last_error = Column(Text, nullable=True)
+
+    # Metadata
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    completed_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Text, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Text, Boolean, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.session import Base
@@ -7,6 +7,16 @@ from app.db.session import Base
 class ScreeningResult(Base):
     """Screening results and medication recommendations"""
     __tablename__ = "screening_results"
+    __table_args__ = (
+        # Partial index backing the doctor queue (pending list and claims)
+        Index(
+            "ix_screening_results_pending", "created_at",
+            sqlite_where=text("doctor_selected_medication IS NULL"),
+            postgresql_where=text("doctor_selected_medication IS NULL"),
+        ),
+        # Never reissue ids of rows moved to screening_results_archive
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     questionnaire_id = Column(Integer, ForeignKey("questionnaires.id"), unique=True, nullable=False)
@@ -38,7 +48,12 @@ class ScreeningResult(Base):
     doctor_notes = Column(Text, nullable=True)
     doctor_approved_at = Column(DateTime(timezone=True), nullable=True)
 
+    # Doctor work queue claim (lease) - see POST /api/screening/claim
+    claimed_by_doctor_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    claim_expires_at = Column(DateTime(timezone=True), nullable=True)
+
     # Metadata
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # Bumped on every change, drives the ETag
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
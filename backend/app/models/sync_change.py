@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index, UniqueConstraint
+from app.db.session import Base
+
+
+class SyncChange(Base):
+    """
+    Latest change to a questionnaire or screening result, for GET /api/sync
+
+    Rows are written by database triggers (app/services/sync.py). Each write
+    replaces the entity's row with one at a new, higher seq, so the table holds
+    one row per entity and a client's cursor is the highest seq it has seen.
+    """
+    __tablename__ = "sync_changes"
+    __table_args__ = (
+        UniqueConstraint("entity", "entity_id", name="uq_sync_changes_entity"),
+        Index("ix_sync_changes_patient_seq", "patient_id", "seq"),
+        {"sqlite_autoincrement": True},  # Never reuse a seq, even after deleting the highest row
+    )
+
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    entity = Column(String, nullable=False)  # "questionnaire" or "screening_result"
+    entity_id = Column(Integer, nullable=False)
+    patient_id = Column(Integer, nullable=True)  # Owner, for per-patient feeds; null for anonymous
+    deleted = Column(Boolean, nullable=False, default=False)  # Tombstone
+    changed_at = Column(DateTime(timezone=True), nullable=False)
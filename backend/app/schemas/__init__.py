@@ -1,6 +1,9 @@
 from app.schemas.user import (
     UserBase,
     UserCreate,
+    UserProvisionRequest,
+    UserProvisionOutcome,
+    UserProvisionResponse,
     UserLogin,
     UserResponse,
     Token,
@@ -12,17 +15,39 @@ from app.schemas.questionnaire import (
     QuestionnaireUpdate,
     QuestionnaireResponse,
     QuestionnaireListResponse,
+    BulkQuestionnaireOutcome,
+    BulkQuestionnaireResponse,
+    CaseSearchResult,
+    CaseSearchResponse,
+)
+from app.schemas.patient import (
+    PatientTrendPointResponse,
+    PatientTrendResponse,
 )
 from app.schemas.screening import (
     MedicationRecommendation,
     ScreeningResultResponse,
+    ScreeningResultSummary,
+    ScreeningPreviewResponse,
+    ScreeningJobResponse,
     DoctorApproval,
+    BulkApprovalItem,
+    BulkApprovalRequest,
+    BulkApprovalOutcome,
+    BulkApprovalResponse,
     ScreeningRequest,
 )
+from app.schemas.sync import (
+    SyncTombstones,
+    SyncResponse,
+)
 
 __all__ = [
     "UserBase",
     "UserCreate",
+    "UserProvisionRequest",
+    "UserProvisionOutcome",
+    "UserProvisionResponse",
     "UserLogin",
     "UserResponse",
     "Token",
@@ -32,8 +57,23 @@ __all__ = [
     "QuestionnaireUpdate",
     "QuestionnaireResponse",
     "QuestionnaireListResponse",
+    "BulkQuestionnaireOutcome",
+    "BulkQuestionnaireResponse",
+    "CaseSearchResult",
+    "CaseSearchResponse",
+    "PatientTrendPointResponse",
+    "PatientTrendResponse",
     "MedicationRecommendation",
     "ScreeningResultResponse",
+    "ScreeningResultSummary",
+    "ScreeningPreviewResponse",
+    "ScreeningJobResponse",
     "DoctorApproval",
+    "BulkApprovalItem",
+    "BulkApprovalRequest",
+    "BulkApprovalOutcome",
+    "BulkApprovalResponse",
     "ScreeningRequest",
+    "SyncTombstones",
+    "SyncResponse",
 ]
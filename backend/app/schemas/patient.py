@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+
+
+class PatientTrendPointResponse(BaseModel):
+    """One submission in a patient's BMI history"""
+    questionnaire_id: int
+    submitted_at: datetime
+    weight_lb: float
+    bmi: float
+    is_eligible: bool
+    selected_medication: Optional[str] = None  # Set once a doctor approves
+
+    class Config:
+        from_attributes = True
+
+
+class PatientTrendResponse(BaseModel):
+    """A patient's BMI history, oldest first"""
+    patient_id: int
+    total_points: int  # Submissions in the requested range
+    downsampled: bool  # True if points is a subset of them
+    points: List[PatientTrendPointResponse]
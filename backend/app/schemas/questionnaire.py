@@ -61,6 +61,7 @@ class QuestionnaireResponse(QuestionnaireBase):
     contact_number: Optional[str] = None
     is_childbearing_age_woman: Optional[bool] = None
     bmi: Optional[float] = None
+    previous_aom_entries: Optional[List[Dict[str, Optional[str]]]] = None  # Parsed previous_aom_history
     submitted_at: Optional[datetime] = None
     reviewed_at: Optional[datetime] = None
     created_at: datetime
@@ -72,7 +73,7 @@ class QuestionnaireResponse(QuestionnaireBase):
 class QuestionnaireListResponse(BaseModel):
     """Schema for listing questionnaires"""
     id: int
-    patient_id: int
+    patient_id: Optional[int] = None  # Nullable for anonymous submissions
     status: QuestionnaireStatus
     bmi: Optional[float] = None
     submitted_at: Optional[datetime] = None
@@ -80,3 +81,33 @@ class QuestionnaireListResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class BulkQuestionnaireOutcome(BaseModel):
+    """Per-record result of a bulk upload"""
+    index: int  # Position of the record in the upload
+    status: str  # "created", "invalid" or "failed"
+    id: Optional[int] = None
+    screening_id: Optional[int] = None  # With screen=true
+    errors: Optional[List[str]] = None
+
+
+class BulkQuestionnaireResponse(BaseModel):
+    """Bulk upload summary"""
+    created: int
+    rejected: int
+    results: List[BulkQuestionnaireOutcome]
+
+
+class CaseSearchResult(QuestionnaireListResponse):
+    """A case matching a full-text search"""
+    score: float  # Higher is a better match
+    snippet: str  # Matching text, with the matched terms in [brackets]
+
+
+class CaseSearchResponse(BaseModel):
+    """One page of full-text search results"""
+    results: List[CaseSearchResult]
+    limit: int
+    offset: int
+    has_more: bool
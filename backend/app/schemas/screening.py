@@ -1,6 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, computed_field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
+from app.models.screening_job import ScreeningJobStatus
 
 
 class MedicationRecommendation(BaseModel):
@@ -30,16 +31,99 @@ class ScreeningResultResponse(BaseModel):
     warnings: Optional[List[str]] = []
     doctor_selected_medication: Optional[str] = None
     doctor_notes: Optional[str] = None
+    version: int = 1  # Send back with an approval to detect concurrent changes
     created_at: datetime
 
     class Config:
         from_attributes = True
 
 
+class ScreeningPreviewResponse(BaseModel):
+    """Screening outcome computed from an unsaved questionnaire"""
+    fingerprint: str
+    is_eligible: bool
+    eligibility_message: Optional[str] = None
+    bmi: float
+    bmi_category: Optional[str] = None
+    initial_drug_pool: List[str] = []
+    absolute_exclusions: Dict[str, str] = {}
+    relative_warnings: Dict[str, str] = {}
+    recommended_drugs: List[Dict[str, Any]] = []
+    screening_logic: List[Dict[str, str]] = []
+    warnings: List[str] = []
+
+
+class ScreeningResultSummary(BaseModel):
+    """Screening result columns shown in the doctor's queue list"""
+    id: int
+    questionnaire_id: int
+    patient_id: Optional[int] = None
+    is_eligible: bool
+    age: Optional[int] = None
+    gender: Optional[str] = None
+    bmi_category: Optional[str] = None
+    doctor_selected_medication: Optional[str] = None
+    claimed_by_doctor_id: Optional[int] = None
+    claim_expires_at: Optional[datetime] = None
+    version: int = 1
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class ScreeningJobResponse(BaseModel):
+    """Background screening job status"""
+    id: int
+    questionnaire_id: int
+    status: ScreeningJobStatus
+    attempts: int
+    last_error: Optional[str] = None
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+
+    @computed_field
+    @property
+    def result_url(self) -> str:
+        return f"/api/screening/results/{self.questionnaire_id}"
+
+    class Config:
+        from_attributes = True
+
+
 class DoctorApproval(BaseModel):
     """Schema for doctor to approve medication"""
     selected_medication: str
     notes: Optional[str] = None
+    version: Optional[int] = None  # Version the doctor reviewed; rejected with 409 if the result changed since
+
+
+class BulkApprovalItem(BaseModel):
+    """One doctor decision within a batch approval"""
+    screening_id: int
+    selected_medication: str
+    notes: Optional[str] = None
+    version: Optional[int] = None
+
+
+class BulkApprovalRequest(BaseModel):
+    """Schema for approving several screening results at once"""
+    approvals: List[BulkApprovalItem] = Field(..., min_length=1, max_length=500)
+
+
+class BulkApprovalOutcome(BaseModel):
+    """Per-item result of a batch approval"""
+    screening_id: int
+    status: str  # "approved", "not_found", "invalid_medication", "conflict" or "duplicate"
+    selected_medication: Optional[str] = None
+    detail: Optional[str] = None
+
+
+class BulkApprovalResponse(BaseModel):
+    """Batch approval summary"""
+    approved: int
+    rejected: int
+    results: List[BulkApprovalOutcome]
 
 
 class ScreeningRequest(BaseModel):
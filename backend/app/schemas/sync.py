@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import List
+from app.schemas.questionnaire import QuestionnaireResponse
+from app.schemas.screening import ScreeningResultResponse
+
+
+class SyncTombstones(BaseModel):
+    """Ids deleted since the cursor; remove them from the local store"""
+    questionnaires: List[int] = []
+    screening_results: List[int] = []
+
+
+class SyncResponse(BaseModel):
+    """Questionnaires and screening results created, changed or deleted since a cursor"""
+    cursor: int  # Send back as ?since= on the next sync
+    has_more: bool  # Sync again right away with the new cursor to get the rest
+    questionnaires: List[QuestionnaireResponse] = []
+    screening_results: List[ScreeningResultResponse] = []
+    deleted: SyncTombstones
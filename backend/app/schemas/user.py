@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+from pydantic import BaseModel, EmailStr, Field
+from typing import List, Optional
 from datetime import datetime
 from app.models.user import UserRole
 
@@ -17,6 +17,26 @@ class UserCreate(UserBase):
     password: str
 
 
+class UserProvisionRequest(BaseModel):
+    """Schema for creating many accounts at once"""
+    users: List[UserCreate] = Field(..., min_length=1, max_length=1000)
+
+
+class UserProvisionOutcome(BaseModel):
+    """Per-user result of bulk provisioning"""
+    index: int
+    email: str
+    status: str  # "created", "exists" or "duplicate"
+    id: Optional[int] = None
+
+
+class UserProvisionResponse(BaseModel):
+    """Bulk provisioning summary"""
+    created: int
+    skipped: int
+    results: List[UserProvisionOutcome]
+
+
 class UserLogin(BaseModel):
     """Schema for user login"""
     email: EmailStr
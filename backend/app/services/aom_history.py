@@ -0,0 +1,240 @@
+"""
+AOM History Parser
+Turns the free-text previous_aom_history answer into structured entries.
+
+Each sentence is scanned for anti-obesity medications (brand, generic and
+combination names, via the medication_matcher automaton) and for outcome
+phrases. Phrases are attributed to the nearest medication named before them;
+a medication with no phrase of its own takes the outcome of the next one in
+the same sentence ("phentermine and topiramate didn't work"). Side effect and
+efficacy terms after a negation ("no nausea", "never had side effects") are
+ignored. The parser is deterministic, so results are memoized per distinct
+string.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.services.medication_matcher import (
+    MedicationMatcher,
+    MedicationMention,
+    load_synonyms,
+    normalize_medication_text,
+)
+
+# Outcomes, in order of precedence when a medication has several
+SIDE_EFFECTS = "side_effects"
+INEFFECTIVE = "ineffective"
+EFFECTIVE = "effective"
+DISCONTINUED = "discontinued"
+UNKNOWN = "unknown"
+
+# Outcomes that count as a failed trial for Second-Step ordering
+FAILED_OUTCOMES = frozenset({SIDE_EFFECTS, INEFFECTIVE})
+
+# Stored drug name -> names patients use for it (generic synonyms come from drug_synonyms.json)
+_PRODUCT_INGREDIENTS = {
+    "PHENTERMINE": "phentermine",
+    "TOPIRAMATE": "topiramate",
+    "NALTREXONE": "naltrexone",
+    "BUPROPION": "bupropion",
+    "VYVANSE": "lisdexamfetamine",
+    "WEGOVY": "semaglutide",
+    "ZEPBOUND": "tirzepatide",
+}
+_COMBINATION_PRODUCTS = {
+    "QSYMIA": ["qsymia", "phentermine topiramate"],
+    "CONTRAVE": ["contrave", "mysimba", "naltrexone bupropion"],
+}
+
+
+def _product_synonyms() -> Dict[str, List[str]]:
+    ingredient_synonyms = load_synonyms()
+    products = {
+        product: [ingredient, *ingredient_synonyms.get(ingredient, [])]
+        for product, ingredient in _PRODUCT_INGREDIENTS.items()
+    }
+    products.update(_COMBINATION_PRODUCTS)
+    return products
+
+
+product_matcher = MedicationMatcher(_product_synonyms())
+
+_SENTENCE_BREAK = re.compile(r"[.;!?\n]+")
+
+# Patterns run on normalize_medication_text output: lowercase words, apostrophes become spaces
+_SIDE_EFFECT_TERMS = (
+    "nausea", "nauseous", "vomiting", "threw up", "headache", "headaches", "insomnia", "couldn t sleep",
+    "could not sleep", "constipation", "diarrhea", "dizziness", "dizzy", "palpitations", "racing heart",
+    "heart racing", "anxiety", "anxious", "jittery", "jitters", "dry mouth", "tingling", "numbness",
+    "rash", "fatigue", "tired", "depression", "mood swings", "brain fog", "hair loss", "heartburn",
+    "reflux", "stomach pain", "pancreatitis", "gallbladder",
+)
+_SIDE_EFFECT = re.compile(
+    r" (" + "|".join(sorted(map(re.escape, _SIDE_EFFECT_TERMS), key=len, reverse=True)) + r") "
+)
+_GENERIC_SIDE_EFFECT = re.compile(r" (side effects?|adverse|reaction|couldn t tolerate|could not tolerate|intolerable) ")
+_INEFFECTIVE = re.compile(
+    r" ((didn t|did not|didnt|doesn t|does not|wasn t|was not|not|never) (work|worked|working|help|helped|helping|effective)"
+    r"|ineffective|(no|without)( any)? (weight loss|effect|results?|change|difference|improvement)"
+    r"|(didn t|did not|didnt|couldn t|could not|never) lose|failed|stopped working|plateau(ed)?|neither) "
+)
+_EFFECTIVE = re.compile(r" (worked|works|effective|helped|helps|lost|success(ful)?) ")
+_DISCONTINUED = re.compile(
+    r" (stopped|discontinued|quit|ran out|insurance|cost|expensive|couldn t afford|could not afford|shortage) "
+)
+# A negation ending right before a term, with only filler words in between ("didn't have any nausea")
+_NEGATION = re.compile(
+    r" (no|not|never|without|didn t|did not|didnt|don t|do not)"
+    r"( (any|much|real|major|serious|bad|other|noticeable|significant|have|had|get|got|experience|experienced"
+    r"|cause|caused|notice|noticed|feel|felt|the|a|an|of))* $"
+)
+# Words continuing a negated list ("no nausea or vomiting")
+_LIST_JOINS = frozenset({"", "or", "nor", "and"})
+
+
+class AomHistoryEntry(NamedTuple):
+    """One previously tried medication"""
+    drug: str  # Stored drug name, e.g. "PHENTERMINE"
+    outcome: str
+    side_effect: Optional[str] = None
+
+
+def _affirmed(pattern: re.Pattern, segment: str) -> Tuple[Optional[re.Match], bool]:
+    """First match of pattern in segment that is not negated, and whether a negated one was seen"""
+    negated = False
+    negated_end = None
+    position = 0
+    while True:
+        match = pattern.search(segment, position)
+        if match is None:
+            return None, negated
+        # Matches include the spaces around the term
+        start, end = match.start(), match.end() - 1
+        if _NEGATION.search(segment, 0, start + 1) or (
+            negated_end is not None and segment[negated_end:start + 1].strip() in _LIST_JOINS
+        ):
+            negated = True
+            negated_end = end
+        else:
+            return match, negated
+        position = end
+
+
+def _classify(segment: str) -> Tuple[Optional[str], Optional[str]]:
+    """Outcome and side effect named in a segment of normalized text, if any"""
+    side_effect, side_effect_negated = _affirmed(_SIDE_EFFECT, segment)
+    if side_effect:
+        return SIDE_EFFECTS, side_effect.group(1)
+    generic, generic_negated = _affirmed(_GENERIC_SIDE_EFFECT, segment)
+    if generic:
+        return SIDE_EFFECTS, None
+    if _INEFFECTIVE.search(segment):
+        return INEFFECTIVE, None
+    if _affirmed(_EFFECTIVE, segment)[0]:
+        return EFFECTIVE, None
+    if _DISCONTINUED.search(segment):
+        return DISCONTINUED, None
+    if side_effect_negated or generic_negated:
+        # "Contrave, no side effects": a statement of its own, not the next drug's outcome
+        return UNKNOWN, None
+    return None, None
+
+
+def _drop_contained(mentions: Sequence[MedicationMention]) -> List[MedicationMention]:
+    """Drop mentions inside a longer one ("phentermine" within "phentermine topiramate")"""
+    return [
+        mention for mention in mentions
+        if not any(
+            other is not mention and other.start <= mention.start and mention.end <= other.end
+            and (other.end - other.start) > (mention.end - mention.start)
+            for other in mentions
+        )
+    ]
+
+
+_PRECEDENCE = {outcome: rank for rank, outcome in enumerate((SIDE_EFFECTS, INEFFECTIVE, EFFECTIVE, DISCONTINUED, UNKNOWN))}
+
+
+def _parse_aom_history(text: str) -> Tuple[AomHistoryEntry, ...]:
+    entries: Dict[str, AomHistoryEntry] = {}
+    for sentence in _SENTENCE_BREAK.split(text or ""):
+        normalized = normalize_medication_text(sentence)
+        mentions = _drop_contained(product_matcher.scan(normalized))
+        if not mentions:
+            continue
+
+        # Each mention owns the text up to the next mention; leading text belongs to the first
+        bounds = [0] + [mention.start for mention in mentions[1:]] + [len(normalized)]
+        classified = [
+            _classify(" " + normalized[bounds[index]:bounds[index + 1]] + " ")
+            for index in range(len(mentions))
+        ]
+        # A mention with no phrase of its own takes the next classified outcome
+        following: Tuple[Optional[str], Optional[str]] = (None, None)
+        for index in reversed(range(len(mentions))):
+            if classified[index][0] is None:
+                classified[index] = following
+            else:
+                following = classified[index]
+
+        for mention, (outcome, side_effect) in zip(mentions, classified):
+            entry = AomHistoryEntry(mention.ingredient, outcome or UNKNOWN, side_effect)
+            current = entries.get(entry.drug)
+            if current is None or _PRECEDENCE[entry.outcome] < _PRECEDENCE[current.outcome]:
+                entries[entry.drug] = entry
+    return tuple(entries.values())
+
+
+# Memoized per distinct string; entries are immutable so cached results can be shared
+parse_aom_history = lru_cache(maxsize=settings.AOM_HISTORY_CACHE_SIZE)(_parse_aom_history)
+
+
+def parser_stats() -> Dict[str, Any]:
+    info = parse_aom_history.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "entries": info.currsize,
+        "max_entries": info.maxsize,
+        "hits": info.hits,
+        "misses": info.misses,
+        "hit_rate": round(info.hits / lookups, 4) if lookups else None,
+    }
+
+
+def entries_to_json(entries: Iterable[AomHistoryEntry]) -> List[Dict[str, Any]]:
+    """Entries in the form stored in Questionnaire.previous_aom_entries"""
+    return [entry._asdict() for entry in entries]
+
+
+def stored_entries(text: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+    """Questionnaire.previous_aom_entries for a previous_aom_history answer"""
+    return entries_to_json(parse_aom_history(text)) if text else None
+
+
+def failed_drug_names(entries: Iterable[Any]) -> List[str]:
+    """Stored names of drugs tried without success; accepts entries or their stored dicts"""
+    names = []
+    for entry in entries or ():
+        if isinstance(entry, dict):
+            entry = AomHistoryEntry(**entry)
+        if entry.outcome in FAILED_OUTCOMES and entry.drug not in names:
+            names.append(entry.drug)
+    return names
+
+
+def parse_chunk(rows: Sequence[Tuple[int, str]]) -> List[Dict[str, Any]]:
+    """
+    Parse a chunk of (questionnaire id, previous_aom_history) rows
+
+    Used by the backfill job (backfill_aom_history.py) in worker processes.
+
+    Returns:
+        Mappings for a bulk update of Questionnaire.previous_aom_entries
+    """
+    return [
+        {"id": row_id, "previous_aom_entries": entries_to_json(parse_aom_history(text))}
+        for row_id, text in rows
+    ]
@@ -0,0 +1,250 @@
+"""
+Bulk Questionnaire Ingestion
+Record stream behind POST /api/questionnaires/bulk (offline clinic kiosks).
+
+The request body is NDJSON (one questionnaire per line) or a JSON array of
+questionnaires. It is parsed incrementally as it arrives and each record is
+validated on its own, so one bad form is reported by index without failing
+the upload, and memory holds one chunk of records rather than the whole body.
+
+Rows are built column-wise for a Core executemany INSERT, which bypasses the
+ORM validators on Questionnaire; the condition/habit bitsets are therefore
+filled in here, alongside the parsed AOM history as in the single-form routes.
+"""
+
+import codecs
+import json
+import re
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional, Sequence
+
+from pydantic import ValidationError
+
+from app.core.condition_codes import encode_eating_habits, encode_health_conditions
+from app.core.responses import parse_json
+from app.models.questionnaire import QuestionnaireStatus
+from app.models.screening_result import ScreeningResult
+from app.schemas.questionnaire import QuestionnaireCreate
+from app.services.aom_history import stored_entries
+from app.services.screening_service import ScreeningService, build_screening_input, format_screening_output
+
+NDJSON_MEDIA_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+
+# A questionnaire is a few KB; anything far larger is malformed or hostile
+MAX_RECORD_BYTES = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class BulkRecord(NamedTuple):
+    """One record of an upload: the validated questionnaire, or why it was rejected"""
+    index: int
+    questionnaire: Optional[QuestionnaireCreate]
+    errors: List[str]
+
+
+class MalformedBody(ValueError):
+    """The body can no longer be parsed; records after this point cannot be recovered"""
+
+
+class JsonArrayReader:
+    """Incremental parser returning the elements of a top-level JSON array as text arrives"""
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._started = False
+        self._after_value = False
+        self.finished = False
+
+    def feed(self, text: str) -> List[Any]:
+        buffer = self._buffer + text
+        position = 0
+        values = []
+        while not self.finished:
+            position = _WHITESPACE.match(buffer, position).end()
+            if position == len(buffer):
+                break
+            char = buffer[position]
+            if not self._started:
+                if char != "[":
+                    raise MalformedBody("Expected a JSON array of questionnaires")
+                self._started = True
+                position += 1
+            elif char == "]":
+                self.finished = True
+                position += 1
+            elif self._after_value:
+                if char != ",":
+                    raise MalformedBody("Expected ',' or ']' between records")
+                self._after_value = False
+                position += 1
+            else:
+                try:
+                    value, end = self._decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError as exc:
+                    # Usually a record split across network chunks; wait for the rest of it
+                    if len(buffer) - position > MAX_RECORD_BYTES:
+                        raise MalformedBody(f"Invalid JSON: {exc.msg}")
+                    break
+                if end == len(buffer) and not isinstance(value, (dict, list)):
+                    break  # A scalar may continue in the next chunk
+                values.append(value)
+                self._after_value = True
+                position = end
+        self._buffer = buffer[position:]
+        return values
+
+    def close(self) -> None:
+        """Raise MalformedBody if the body ended before the array did"""
+        if self.finished:
+            if self._buffer.strip():
+                raise MalformedBody("Unexpected data after the JSON array")
+            return
+        if self._buffer.strip():
+            try:
+                self._decoder.raw_decode(self._buffer.strip())
+            except json.JSONDecodeError as exc:
+                raise MalformedBody(f"Invalid JSON: {exc.msg}")
+        raise MalformedBody("JSON array is not terminated")
+
+
+async def _ndjson_values(chunks: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+    """Decoded lines of an NDJSON body; undecodable lines are yielded as MalformedBody"""
+    pending = b""
+    skipping = False  # Discarding the rest of an oversized line
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        if skipping and lines:
+            lines = lines[1:]
+            skipping = False
+        for line in lines:
+            if line.strip():
+                yield _decode_line(line)
+        if len(pending) > MAX_RECORD_BYTES:
+            if not skipping:
+                yield MalformedBody("Line exceeds the maximum record size")
+            pending = b""
+            skipping = True
+    if pending.strip() and not skipping:
+        yield _decode_line(pending)
+
+
+def _decode_line(line: bytes) -> Any:
+    try:
+        return parse_json(line)
+    except ValueError as exc:
+        return MalformedBody(f"Invalid JSON: {exc}")
+
+
+async def _array_values(chunks: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+    """Elements of a JSON array body; a syntax error ends the stream with a MalformedBody"""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    reader = JsonArrayReader()
+    try:
+        async for chunk in chunks:
+            for value in reader.feed(decoder.decode(chunk)):
+                yield value
+        for value in reader.feed(decoder.decode(b"", final=True)):
+            yield value
+        reader.close()
+    except (MalformedBody, UnicodeDecodeError) as exc:
+        yield exc if isinstance(exc, MalformedBody) else MalformedBody("Body is not valid UTF-8")
+
+
+def _validation_messages(exc: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" if error["loc"] else error["msg"]
+        for error in exc.errors()
+    ]
+
+
+async def read_questionnaires(
+    chunks: AsyncIterator[bytes],
+    ndjson: bool,
+    max_records: int
+) -> AsyncIterator[BulkRecord]:
+    """
+    Validate the records of an upload as its body streams in
+
+    Args:
+        chunks: Request body chunks
+        ndjson: True for NDJSON, False for a JSON array
+        max_records: Records beyond this many are not read
+
+    Yields:
+        One BulkRecord per record, in order. A body that stops parsing, or
+        runs past max_records, ends with one final rejected record.
+    """
+    values = _ndjson_values(chunks) if ndjson else _array_values(chunks)
+    index = 0
+    async for value in values:
+        if index >= max_records:
+            yield BulkRecord(index, None, [f"Upload exceeds {max_records} records; the rest was not read"])
+            return
+        if isinstance(value, MalformedBody):
+            yield BulkRecord(index, None, [str(value)])
+            if not ndjson:
+                return
+        else:
+            try:
+                yield BulkRecord(index, QuestionnaireCreate.model_validate(value), [])
+            except ValidationError as exc:
+                yield BulkRecord(index, None, _validation_messages(exc))
+        index += 1
+
+
+def questionnaire_rows(
+    records: Sequence[QuestionnaireCreate],
+    status: QuestionnaireStatus,
+    submitted_at: Optional[datetime]
+) -> List[Dict[str, Any]]:
+    """
+    Column values for an executemany INSERT of anonymous questionnaires
+
+    BMI and the derived columns are computed column by column over the chunk.
+    """
+    bmis = list(map(
+        ScreeningService.calculate_bmi,
+        [record.height_ft for record in records],
+        [record.height_in for record in records],
+        [record.weight_lb for record in records],
+    ))
+    condition_masks = list(map(encode_health_conditions, [record.health_conditions for record in records]))
+    habit_masks = list(map(encode_eating_habits, [record.eating_habits for record in records]))
+    aom_entries = list(map(stored_entries, [record.previous_aom_history for record in records]))
+
+    return [
+        {
+            **record.model_dump(),
+            "patient_id": None,
+            "status": status,
+            "bmi": bmi,
+            "health_conditions_mask": condition_mask,
+            "eating_habits_mask": habit_mask,
+            "previous_aom_entries": entries,
+            "submitted_at": submitted_at,
+        }
+        for record, bmi, condition_mask, habit_mask, entries
+        in zip(records, bmis, condition_masks, habit_masks, aom_entries)
+    ]
+
+
+def screening_results(
+    screener: ScreeningService,
+    questionnaire_ids: Sequence[int],
+    records: Sequence[QuestionnaireCreate]
+) -> List[ScreeningResult]:
+    """Unsaved screening results for freshly inserted anonymous questionnaires"""
+    return [
+        ScreeningResult(
+            questionnaire_id=questionnaire_id,
+            patient_id=None,
+            age=record.age,
+            gender=record.gender,
+            is_childbearing_age_woman=record.is_childbearing_age_woman,
+            **format_screening_output(screener.run_screening(build_screening_input(record))),
+        )
+        for questionnaire_id, record in zip(questionnaire_ids, records)
+    ]
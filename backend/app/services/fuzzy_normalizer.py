@@ -0,0 +1,88 @@
+"""
+Fuzzy Normalizer
+Maps patient-typed terms onto a fixed vocabulary, tolerating typos.
+
+Each lookup tries an exact match first, then the closest vocabulary entry by
+edit distance within a length-dependent limit. Results are memoized in a
+bounded LRU cache whose hit rate is reported by stats().
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_term(text: str) -> str:
+    """Lowercase and reduce punctuation to single spaces"""
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance between a and b, or limit + 1 once it is known to exceed limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b),
+            ))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def typo_limit(term: str) -> int:
+    """Edits tolerated for a term: none for short words, more for longer ones"""
+    if len(term) <= 4:
+        return 0
+    if len(term) <= 8:
+        return 1
+    return 2
+
+
+class FuzzyNormalizer:
+    """Memoized closest-match lookup against a vocabulary"""
+
+    def __init__(self, vocabulary: Iterable[str], max_entries: int):
+        self.vocabulary = frozenset(normalize_term(term) for term in vocabulary)
+        self._by_length: Dict[int, list] = {}
+        for term in self.vocabulary:
+            self._by_length.setdefault(len(term), []).append(term)
+        self.normalize = lru_cache(maxsize=max_entries)(self._normalize)
+
+    def _normalize(self, text: str) -> Optional[str]:
+        """
+        Vocabulary term closest to text, or None if nothing is close enough
+
+        Ties are broken alphabetically so results are deterministic.
+        """
+        term = normalize_term(text)
+        if not term or term in self.vocabulary:
+            return term or None
+
+        limit = typo_limit(term)
+        best, best_distance = None, limit + 1
+        for length in range(len(term) - limit, len(term) + limit + 1):
+            for candidate in self._by_length.get(length, ()):
+                distance = edit_distance(term, candidate, min(limit, best_distance))
+                if distance < best_distance or (distance == best_distance and best is not None and candidate < best):
+                    best, best_distance = candidate, distance
+        return best if best_distance <= limit else None
+
+    def stats(self) -> Dict[str, Any]:
+        info = self.normalize.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            "entries": info.currsize,
+            "max_entries": info.maxsize,
+            "hits": info.hits,
+            "misses": info.misses,
+            "hit_rate": round(info.hits / lookups, 4) if lookups else None,
+        }
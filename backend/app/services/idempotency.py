@@ -0,0 +1,58 @@
+"""
+Idempotency Service
+Stores client-supplied Idempotency-Key headers so retried anonymous
+create/submit requests are answered from the original outcome.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.idempotency_key import IdempotencyKey
+
+
+def request_fingerprint(payload: Any) -> str:
+    """SHA-256 of a JSON-serializable request payload"""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def lookup_idempotency_key(db: Session, key: str, endpoint: str) -> Optional[IdempotencyKey]:
+    """
+    Find a live idempotency record for a key on an endpoint
+
+    Expired records are deleted so the key can be reused.
+    """
+    record = db.query(IdempotencyKey).filter(
+        IdempotencyKey.key == key,
+        IdempotencyKey.endpoint == endpoint
+    ).first()
+
+    if record is None:
+        return None
+
+    created_at = record.created_at
+    if created_at is not None:
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        expires_at = created_at + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+        if expires_at <= datetime.now(timezone.utc):
+            db.delete(record)
+            db.flush()
+            return None
+
+    return record
+
+
+def record_idempotency_key(db: Session, key: str, endpoint: str, fingerprint: str, questionnaire_id: int) -> None:
+    """Add an idempotency record to the current transaction"""
+    db.add(IdempotencyKey(
+        key=key,
+        endpoint=endpoint,
+        request_fingerprint=fingerprint,
+        questionnaire_id=questionnaire_id,
+    ))
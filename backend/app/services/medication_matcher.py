@@ -0,0 +1,152 @@
+"""
+Medication Matcher
+Recognizes medications in the free-text current_medications answers.
+
+Names are normalized and matched on whole words against a bundled synonym
+dictionary (app/data/drug_synonyms.json) with an Aho-Corasick automaton built
+once at import. Matching a string is a single pass over its characters, so
+the cost does not grow with the size of the dictionary.
+"""
+
+import json
+import re
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Set, Tuple
+
+SYNONYMS_PATH = Path(__file__).resolve().parent.parent / "data" / "drug_synonyms.json"
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_LETTER_DIGIT = re.compile(r"(?<=[a-z])(?=[0-9])|(?<=[0-9])(?=[a-z])")
+
+
+def normalize_medication_text(text: str) -> str:
+    """
+    Lowercase, split letters from digits and reduce punctuation to single spaces,
+    padded with a space on both sides so whole-word patterns also match at the ends
+
+    "Nolvadex-20mg" -> " nolvadex 20 mg "
+    """
+    text = _LETTER_DIGIT.sub(" ", text.lower())
+    return " " + _NON_ALNUM.sub(" ", text).strip() + " "
+
+
+class MedicationMention(NamedTuple):
+    """A synonym found in normalized text, with its start and end offsets"""
+    ingredient: str
+    start: int
+    end: int
+
+
+class MedicationMatcher:
+    """Aho-Corasick automaton mapping synonyms to their canonical ingredient"""
+
+    def __init__(self, synonyms: Dict[str, Iterable[str]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[Tuple[str, int], ...]] = [()]  # (ingredient, pattern length)
+
+        for ingredient, names in synonyms.items():
+            for name in (ingredient, *names):
+                self._add(normalize_medication_text(name), ingredient)
+        self._link()
+
+    @property
+    def states(self) -> int:
+        return len(self._goto)
+
+    def _add(self, pattern: str, ingredient: str) -> None:
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        if all(existing != ingredient for existing, _ in self._output[state]):
+            self._output[state] += ((ingredient, len(pattern)),)
+
+    def _link(self) -> None:
+        """Breadth-first construction of failure links, merging outputs along them"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] += tuple(
+                    match for match in self._output[self._fail[next_state]]
+                    if match not in self._output[next_state]
+                )
+
+    def find(self, text: str) -> Set[str]:
+        """Canonical ingredients named anywhere in text"""
+        goto, fail, output = self._goto, self._fail, self._output
+        found: Set[str] = set()
+        state = 0
+        for char in normalize_medication_text(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for ingredient, _ in output[state]:
+                found.add(ingredient)
+        return found
+
+    def scan(self, normalized: str) -> List[MedicationMention]:
+        """
+        Mentions in text already passed through normalize_medication_text, in order
+
+        Overlapping mentions of the same ingredient ("adipex", "adipex p") are merged.
+        """
+        goto, fail, output = self._goto, self._fail, self._output
+        mentions: List[MedicationMention] = []
+        state = 0
+        for index, char in enumerate(normalized):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for ingredient, length in output[state]:
+                # Patterns carry a space on both sides; report the word span only
+                mentions.append(MedicationMention(ingredient, index - length + 2, index))
+
+        mentions.sort(key=lambda mention: (mention.start, -mention.end))
+        merged: List[MedicationMention] = []
+        for mention in mentions:
+            previous = merged[-1] if merged else None
+            if previous and previous.ingredient == mention.ingredient and mention.start < previous.end:
+                merged[-1] = previous._replace(end=max(previous.end, mention.end))
+            else:
+                merged.append(mention)
+        return merged
+
+    def find_all(self, medications: Iterable[str]) -> Dict[str, List[str]]:
+        """
+        Recognize the medications in a list of free-text entries
+
+        Returns:
+            Canonical ingredient -> entries it was found in, in input order
+        """
+        matches: Dict[str, List[str]] = {}
+        for entry in medications or ():
+            if not isinstance(entry, str):
+                continue
+            for ingredient in sorted(self.find(entry)):
+                matches.setdefault(ingredient, []).append(entry)
+        return matches
+
+
+def load_synonyms(path: Path = SYNONYMS_PATH) -> Dict[str, List[str]]:
+    """Read the synonym dictionary, skipping "_"-prefixed metadata keys"""
+    with open(path, encoding="utf-8") as handle:
+        data = json.load(handle)
+    return {ingredient: names for ingredient, names in data.items() if not ingredient.startswith("_")}
+
+
+# Built once at startup
+medication_matcher = MedicationMatcher(load_synonyms())
@@ -0,0 +1,170 @@
+"""
+Notification Service
+In-process publish/subscribe used to push screening events to connected clients.
+
+Routes publish from worker threads; subscribers are Server-Sent Events streams
+running on the event loop. The backend is pluggable so a multi-process
+deployment can swap in a shared broker without touching the routes.
+"""
+
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Set
+
+from app.core.config import settings
+
+# Channel names
+DOCTORS_CHANNEL = "doctors"
+
+
+def questionnaire_channel(questionnaire_id: int) -> str:
+    """Channel carrying updates for a single questionnaire's screening result"""
+    return f"questionnaire:{questionnaire_id}"
+
+
+class Subscription:
+    """
+    A single subscriber's event queue
+
+    Events may be delivered from any thread; they are handed to the
+    subscriber's event loop. Slow consumers drop events rather than block
+    publishers.
+    """
+
+    def __init__(self, backend: "PubSubBackend", channel: str, max_queue: int):
+        self.backend = backend
+        self.channel = channel
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+
+    def deliver(self, event: Dict[str, Any]) -> None:
+        """Thread-safe hand-off of an event to this subscriber"""
+        self._loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event: Dict[str, Any]) -> None:
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            pass
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Wait for the next event, returning None on timeout"""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.backend.unsubscribe(self)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class PubSubBackend(ABC):
+    """Interface for publish/subscribe backends"""
+
+    @abstractmethod
+    def publish(self, channel: str, event: Dict[str, Any]) -> None:
+        """Publish an event to every subscriber of a channel"""
+
+    @abstractmethod
+    def subscribe(self, channel: str) -> Subscription:
+        """Register a subscriber; must be called from the event loop"""
+
+    @abstractmethod
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscriber"""
+
+
+class InMemoryPubSub(PubSubBackend):
+    """Single-process backend; events only reach clients of the same worker"""
+
+    def __init__(self, max_queue: int = 100):
+        self.max_queue = max_queue
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, channel: str, event: Dict[str, Any]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            try:
+                subscription.deliver(event)
+            except RuntimeError:
+                # Subscriber's event loop already closed
+                self.unsubscribe(subscription)
+
+    def subscribe(self, channel: str) -> Subscription:
+        subscription = Subscription(self, channel, self.max_queue)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.channel]
+
+
+_BACKENDS = {
+    "memory": InMemoryPubSub,
+}
+
+pubsub: PubSubBackend = _BACKENDS[settings.PUBSUB_BACKEND](max_queue=settings.EVENTS_QUEUE_SIZE)
+
+
+def set_backend(backend: PubSubBackend) -> None:
+    """Replace the active backend (e.g. with a shared broker in multi-worker deployments)"""
+    global pubsub
+    pubsub = backend
+
+
+def get_pubsub() -> PubSubBackend:
+    """Return the active backend"""
+    return pubsub
+
+
+def publish_screening_created(result) -> None:
+    """Notify doctors that a new screening result is awaiting review"""
+    get_pubsub().publish(DOCTORS_CHANNEL, {
+        "type": "screening_created",
+        "screening_id": result.id,
+        "questionnaire_id": result.questionnaire_id,
+        "is_eligible": result.is_eligible,
+    })
+
+
+def publish_screening_updated(result) -> None:
+    """Notify doctors and the questionnaire's watchers that a pending result was re-screened"""
+    event = {
+        "type": "screening_updated",
+        "screening_id": result.id,
+        "questionnaire_id": result.questionnaire_id,
+        "is_eligible": result.is_eligible,
+        "version": result.version,
+    }
+    backend = get_pubsub()
+    backend.publish(questionnaire_channel(result.questionnaire_id), event)
+    backend.publish(DOCTORS_CHANNEL, event)
+
+
+def publish_screening_approved(screening_id: int, questionnaire_id: int, medication: str, version: int) -> None:
+    """Notify doctors and the questionnaire's watchers that a result was approved"""
+    event = {
+        "type": "screening_approved",
+        "screening_id": screening_id,
+        "questionnaire_id": questionnaire_id,
+        "doctor_selected_medication": medication,
+        "version": version,
+    }
+    backend = get_pubsub()
+    backend.publish(questionnaire_channel(questionnaire_id), event)
+    backend.publish(DOCTORS_CHANNEL, event)
@@ -0,0 +1,103 @@
+"""
+Patient Trend
+Per-patient BMI time series, one point per submitted questionnaire.
+
+Points are written when a questionnaire is submitted (and refreshed if it is
+edited before review), then given the doctor's selected medication on
+approval. Reading a patient's history is one range scan of the
+(patient_id, submitted_at) index with no BMI recomputation. Long histories are
+downsampled with largest-triangle-three-buckets, which keeps the peaks and
+dips of the BMI curve and returns real submissions rather than averages.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session
+
+from app.core.condition_codes import encode_health_conditions
+from app.models.patient_trend import PatientTrendPoint
+from app.models.questionnaire import Questionnaire
+from app.services.screening_service import ScreeningService
+
+
+def record_submission(db: Session, questionnaire: Questionnaire) -> Optional[PatientTrendPoint]:
+    """
+    Add or refresh the trend point of a submitted questionnaire in the current transaction
+
+    Anonymous questionnaires have no patient history and are skipped.
+    """
+    if questionnaire.patient_id is None or questionnaire.submitted_at is None:
+        return None
+
+    bmi = questionnaire.bmi
+    if bmi is None:
+        bmi = ScreeningService.calculate_bmi(questionnaire.height_ft, questionnaire.height_in, questionnaire.weight_lb)
+    conditions_mask = questionnaire.health_conditions_mask
+    if conditions_mask is None:
+        conditions_mask = encode_health_conditions(questionnaire.health_conditions)
+    gate = ScreeningService.apply_eligibility_gate(bmi, conditions_mask)
+
+    point = db.query(PatientTrendPoint).filter(PatientTrendPoint.questionnaire_id == questionnaire.id).first()
+    if point is None:
+        point = PatientTrendPoint(patient_id=questionnaire.patient_id, questionnaire_id=questionnaire.id)
+        db.add(point)
+    point.submitted_at = questionnaire.submitted_at
+    point.weight_lb = questionnaire.weight_lb
+    point.bmi = bmi
+    point.is_eligible = gate["is_eligible"]
+    return point
+
+
+def record_selections(db: Session, selections: Dict[int, str]) -> None:
+    """Store approved medications (questionnaire id -> drug) on their trend points in one executemany"""
+    if not selections:
+        return
+    table = PatientTrendPoint.__table__
+    db.execute(
+        update(table)
+        .where(table.c.questionnaire_id == bindparam("trend_questionnaire_id"))
+        .values(selected_medication=bindparam("trend_medication")),
+        [
+            {"trend_questionnaire_id": questionnaire_id, "trend_medication": medication}
+            for questionnaire_id, medication in selections.items()
+        ],
+    )
+
+
+def downsample(points: List[Dict[str, Any]], max_points: int) -> List[Dict[str, Any]]:
+    """
+    Reduce a date-ordered series to at most max_points with largest-triangle-three-buckets
+
+    The first and last points are always kept. Between them, each bucket
+    contributes the point forming the largest triangle with the point kept
+    from the previous bucket and the average of the next bucket.
+    """
+    if max_points < 3 or len(points) <= max_points:
+        return points
+
+    xs = [point["submitted_at"].timestamp() for point in points]
+    ys = [point["bmi"] for point in points]
+    every = (len(points) - 2) / (max_points - 2)
+
+    sampled = [points[0]]
+    previous = 0
+    for bucket in range(max_points - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, len(points))
+        avg_x = sum(xs[end:next_end]) / (next_end - end)
+        avg_y = sum(ys[end:next_end]) / (next_end - end)
+
+        chosen = max(
+            range(start, end),
+            key=lambda index: abs(
+                (xs[previous] - avg_x) * (ys[index] - ys[previous])
+                - (xs[previous] - xs[index]) * (avg_y - ys[previous])
+            ),
+        )
+        sampled.append(points[chosen])
+        previous = chosen
+
+    sampled.append(points[-1])
+    return sampled
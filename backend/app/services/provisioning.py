@@ -0,0 +1,172 @@
+"""
+User Provisioning
+Bulk account creation behind POST /api/auth/provision and provision_users.py.
+
+Registering accounts one by one costs an email lookup, a bcrypt hash and a
+commit each. Here the whole batch is checked against existing accounts with
+one IN query, passwords are hashed by a process pool (bcrypt is deliberately
+CPU-bound, so this is where the time goes), and users are inserted with one
+executemany INSERT per chunk while the pool keeps hashing the next one. The
+API shares one long-lived pool; the command-line script starts its own.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Generator, List, Optional, Sequence
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.models.user import User
+from app.schemas.user import UserCreate
+
+# Below this many passwords a pool costs more to start than it saves
+MIN_PARALLEL_PASSWORDS = 8
+
+# Pool shared by API requests, started and shut down by the app lifespan
+_shared_pool: Optional[ProcessPoolExecutor] = None
+_shared_workers = 0
+
+
+def _new_pool(workers: int) -> ProcessPoolExecutor:
+    # Requests run in threads, and forking a threaded process can deadlock the child
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def start_hashing_pool(workers: int) -> None:
+    """Create the pool API requests hash passwords in (worker processes start on first use)"""
+    global _shared_pool, _shared_workers
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and _shared_pool is None:
+        _shared_pool, _shared_workers = _new_pool(workers), workers
+
+
+def stop_hashing_pool() -> None:
+    """Shut the shared pool down"""
+    global _shared_pool, _shared_workers
+    if _shared_pool is not None:
+        _shared_pool.shutdown(cancel_futures=True)
+        _shared_pool, _shared_workers = None, 0
+
+
+def hash_passwords(passwords: Sequence[str], workers: int) -> Generator[str, None, None]:
+    """
+    Hash passwords in order, across worker processes when it pays off
+
+    Uses the shared pool when the app has started one, otherwise a pool for
+    this call only (provision_users.py).
+
+    Args:
+        passwords: Plain-text passwords
+        workers: Worker processes (0 for one per CPU, 1 to hash in this process)
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(passwords) < MIN_PARALLEL_PASSWORDS:
+        yield from map(get_password_hash, passwords)
+        return
+
+    pool = _shared_pool
+    if pool is not None:
+        yield from pool.map(get_password_hash, passwords, chunksize=_chunksize(len(passwords), _shared_workers))
+        return
+
+    workers = min(workers, len(passwords))
+    with _new_pool(workers) as pool:
+        yield from pool.map(get_password_hash, passwords, chunksize=_chunksize(len(passwords), workers))
+
+
+def _chunksize(count: int, workers: int) -> int:
+    # Small batches per task keep all workers busy up to the end
+    return max(1, count // (workers * 8))
+
+
+def _insert_chunk(db: Session, rows: List[Dict[str, Any]]) -> List[int]:
+    ids = db.execute(insert(User).returning(User.id, sort_by_parameter_order=True), rows).scalars().all()
+    db.commit()
+    return ids
+
+
+def provision_users(
+    db: Session,
+    users: Sequence[UserCreate],
+    workers: int = 0,
+    chunk_size: int = 500
+) -> List[Dict[str, Any]]:
+    """
+    Create accounts for every user whose email is not registered yet
+
+    Each chunk of chunk_size users is committed on its own.
+
+    Returns:
+        One outcome per input user, in order: status "created" (with id),
+        "exists" (email already registered) or "duplicate" (email repeated
+        earlier in the batch)
+    """
+    emails = [user.email for user in users]
+    existing = {
+        email for (email,) in db.query(User.email).filter(User.email.in_(set(emails))).all()
+    } if emails else set()
+
+    outcomes: List[Dict[str, Any]] = []
+    new_indexes: List[int] = []
+    seen = set()
+    for index, email in enumerate(emails):
+        if email in existing:
+            outcomes.append({"index": index, "email": email, "status": "exists"})
+        elif email in seen:
+            outcomes.append({"index": index, "email": email, "status": "duplicate"})
+        else:
+            outcomes.append({"index": index, "email": email, "status": "created"})
+            new_indexes.append(index)
+        seen.add(email)
+
+    hashes = hash_passwords([users[index].password for index in new_indexes], workers)
+    try:
+        _insert_all(db, users, new_indexes, hashes, outcomes, chunk_size)
+    finally:
+        hashes.close()  # Shuts a per-call pool down
+    return outcomes
+
+
+def _insert_all(
+    db: Session,
+    users: Sequence[UserCreate],
+    new_indexes: List[int],
+    hashes: Generator[str, None, None],
+    outcomes: List[Dict[str, Any]],
+    chunk_size: int
+) -> None:
+    for start in range(0, len(new_indexes), chunk_size):
+        chunk = new_indexes[start:start + chunk_size]
+        rows = [
+            {
+                "email": users[index].email,
+                "hashed_password": hashed_password,
+                "full_name": users[index].full_name,
+                "role": users[index].role,
+                "phone_number": users[index].phone_number,
+                "is_active": 1,
+            }
+            for index, hashed_password in zip(chunk, islice(hashes, len(chunk)))
+        ]
+        try:
+            ids = _insert_chunk(db, rows)
+        except IntegrityError:
+            # Some of these emails were registered since the check above; skip them and retry once
+            db.rollback()
+            taken = {
+                email for (email,) in db.query(User.email).filter(User.email.in_([row["email"] for row in rows])).all()
+            }
+            for index in chunk:
+                if users[index].email in taken:
+                    outcomes[index]["status"] = "exists"
+            chunk = [index for index in chunk if users[index].email not in taken]
+            rows = [row for row in rows if row["email"] not in taken]
+            ids = _insert_chunk(db, rows) if rows else []
+
+        for index, user_id in zip(chunk, ids):
+            outcomes[index]["id"] = user_id
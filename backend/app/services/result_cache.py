@@ -0,0 +1,106 @@
+"""
+Screening Result Cache
+In-process read-through cache of serialized screening results.
+
+Clients poll GET /api/screening/results/{questionnaire_id} while waiting for a
+doctor. Entries hold the final JSON bytes plus an ETag so repeat polls are
+answered without a database query or Pydantic serialization. The same cache
+class memoizes POST /api/screening/preview by input fingerprint.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, NamedTuple, Optional
+
+from app.core.config import settings
+
+
+class CachedResult(NamedTuple):
+    """Serialized screening result ready to be sent to the client"""
+    etag: str
+    body: bytes
+    expires_at: float
+
+
+def make_etag(result) -> str:
+    """
+    Build an ETag for a screening result from its row version
+
+    Args:
+        result: ScreeningResult ORM object
+
+    Returns:
+        Quoted ETag string
+    """
+    return f'"{result.id}-{result.version or 1}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag (weak comparison)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+class ResultCache:
+    """
+    Bounded LRU cache of serialized screening results
+
+    Entries expire after a TTL so that workers which did not perform an update
+    themselves still converge on fresh data.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, CachedResult]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[CachedResult]:
+        """Return the cached entry, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: Hashable, etag: str, body: bytes) -> CachedResult:
+        """Store a serialized result and return the new entry"""
+        entry = CachedResult(etag, body, time.monotonic() + self.ttl_seconds)
+        if self.max_entries <= 0:
+            return entry
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a cached entry"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all cached entries"""
+        with self._lock:
+            self._entries.clear()
+
+
+result_cache = ResultCache(
+    max_entries=settings.RESULT_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.RESULT_CACHE_TTL_SECONDS,
+)
+
+preview_cache = ResultCache(
+    max_entries=settings.PREVIEW_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PREVIEW_CACHE_TTL_SECONDS,
+)
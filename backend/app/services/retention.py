@@ -0,0 +1,164 @@
+"""
+Retention Service
+Moves reviewed cases out of the live tables into the archive tables.
+
+Questionnaires reviewed longer ago than the retention age are copied, with
+their screening results, into questionnaires_archive and
+screening_results_archive (tagged with the review month) and deleted from the
+live tables. Work is done in bounded batches, one transaction each, so the job
+can run against a live database and be interrupted safely.
+"""
+
+import time
+from datetime import datetime, timedelta
+from typing import List, NamedTuple, Optional
+
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.models.archive import QuestionnaireArchive, ScreeningResultArchive
+from app.models.idempotency_key import IdempotencyKey
+from app.models.questionnaire import Questionnaire, QuestionnaireStatus
+from app.models.screening_job import ScreeningJob
+from app.models.screening_result import ScreeningResult
+
+# Live tables whose size is reported
+_LIVE_TABLES = ("questionnaires", "screening_results")
+
+
+class ArchiveReport(NamedTuple):
+    """Outcome of an archival run"""
+    questionnaires: int
+    screening_results: int
+    batches: int
+    bytes_before: Optional[int]
+    bytes_after: Optional[int]
+
+    @property
+    def reclaimed_bytes(self) -> Optional[int]:
+        if self.bytes_before is None or self.bytes_after is None:
+            return None
+        return self.bytes_before - self.bytes_after
+
+
+def database_usage(db: Session) -> Optional[int]:
+    """
+    Bytes used by the live tables and their indexes, or None if the database
+    cannot report it
+
+    SQLite needs the dbstat virtual table; freed pages are reused but the file
+    only shrinks after VACUUM. On PostgreSQL dead tuples count until VACUUM.
+    """
+    dialect = db.get_bind().dialect.name
+    tables = {f"table_{index}": table for index, table in enumerate(_LIVE_TABLES)}
+    placeholders = ", ".join(f":{name}" for name in tables)
+    if dialect == "sqlite":
+        try:
+            return db.execute(text(
+                "SELECT COALESCE(SUM(d.pgsize), 0) FROM dbstat d "
+                f"JOIN sqlite_master m ON d.name = m.name WHERE m.tbl_name IN ({placeholders})"
+            ), tables).scalar()
+        except OperationalError:
+            # SQLite built without SQLITE_ENABLE_DBSTAT_VTAB
+            db.rollback()
+            return None
+    if dialect == "postgresql":
+        return sum(
+            db.execute(text("SELECT pg_total_relation_size(:table)"), {"table": table}).scalar()
+            for table in _LIVE_TABLES
+        )
+    return None
+
+
+def _archive_batch(db: Session, questionnaire_ids: List[int]) -> int:
+    """Copy one batch to the archive tables and delete it from the live tables; returns results moved"""
+    questionnaires = db.execute(
+        select(Questionnaire.__table__).where(Questionnaire.id.in_(questionnaire_ids))
+    ).mappings().all()
+    months = {row["id"]: row["reviewed_at"].strftime("%Y-%m") for row in questionnaires}
+
+    results = db.execute(
+        select(ScreeningResult.__table__).where(ScreeningResult.questionnaire_id.in_(questionnaire_ids))
+    ).mappings().all()
+
+    db.execute(
+        insert(QuestionnaireArchive),
+        [{**row, "archive_month": months[row["id"]]} for row in questionnaires]
+    )
+    if results:
+        db.execute(
+            insert(ScreeningResultArchive),
+            [{**row, "archive_month": months[row["questionnaire_id"]]} for row in results]
+        )
+
+    # Children first, so foreign keys hold on databases that enforce them
+    for model in (ScreeningJob, IdempotencyKey, ScreeningResult):
+        db.execute(delete(model).where(model.questionnaire_id.in_(questionnaire_ids)))
+    db.execute(delete(Questionnaire).where(Questionnaire.id.in_(questionnaire_ids)))
+
+    db.commit()
+    return len(results)
+
+
+def archive_reviewed(
+    db: Session,
+    older_than_days: int,
+    batch_size: int,
+    max_batches: Optional[int] = None,
+    pause_seconds: float = 0.0,
+) -> ArchiveReport:
+    """
+    Archive questionnaires reviewed more than older_than_days ago
+
+    Args:
+        db: Database session
+        older_than_days: Retention age of reviewed cases in the live tables
+        batch_size: Questionnaires moved per transaction
+        max_batches: Stop after this many batches (None: until nothing is left)
+        pause_seconds: Sleep between batches to leave room for live traffic
+
+    Returns:
+        ArchiveReport with row counts and live data size before and after
+    """
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    bytes_before = database_usage(db)
+    moved_questionnaires = moved_results = batches = 0
+
+    while max_batches is None or batches < max_batches:
+        questionnaire_ids = [
+            row.id for row in db.query(Questionnaire.id)
+            .filter(
+                Questionnaire.status == QuestionnaireStatus.REVIEWED,
+                Questionnaire.reviewed_at < cutoff
+            )
+            .order_by(Questionnaire.reviewed_at)
+            .limit(batch_size)
+        ]
+        if not questionnaire_ids:
+            break
+
+        moved_results += _archive_batch(db, questionnaire_ids)
+        moved_questionnaires += len(questionnaire_ids)
+        batches += 1
+
+        if pause_seconds:
+            time.sleep(pause_seconds)
+
+    return ArchiveReport(
+        questionnaires=moved_questionnaires,
+        screening_results=moved_results,
+        batches=batches,
+        bytes_before=bytes_before,
+        bytes_after=database_usage(db),
+    )
+
+
+def vacuum(engine: Engine) -> None:
+    """Return freed space to the operating system (SQLite) or mark it reusable (PostgreSQL)"""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if engine.dialect.name == "postgresql":
+            conn.exec_driver_sql("VACUUM ANALYZE " + ", ".join(_LIVE_TABLES))
+        else:
+            conn.exec_driver_sql("VACUUM")
@@ -0,0 +1,240 @@
+"""
+Screening Job Queue
+Database-backed queue for running screenings outside the request (background screening mode).
+
+Jobs are claimed with a compare-and-set UPDATE and a lease (visibility timeout),
+so any number of worker threads or processes can share the queue. Failed jobs
+are retried with exponential backoff. The unique questionnaire_id on
+screening_results guarantees exactly one result per questionnaire even if a
+lease expires and two workers run the same job.
+"""
+
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.questionnaire import Questionnaire
+from app.models.screening_job import ScreeningJob, ScreeningJobStatus
+from app.models.screening_result import ScreeningResult
+from app.services.notifications import publish_screening_created
+from app.services.screening_service import ScreeningService, build_screening_input, format_screening_output
+
+logger = logging.getLogger(__name__)
+
+
+def build_screening_result(questionnaire: Questionnaire) -> ScreeningResult:
+    """Run the screening algorithm for a questionnaire and return an unsaved ScreeningResult"""
+    screener = ScreeningService()
+    screening_result = screener.run_screening(build_screening_input(questionnaire))
+
+    return ScreeningResult(
+        questionnaire_id=questionnaire.id,
+        patient_id=questionnaire.patient_id,
+        age=questionnaire.age,
+        gender=questionnaire.gender,
+        is_childbearing_age_woman=questionnaire.is_childbearing_age_woman,
+        **format_screening_output(screening_result),
+    )
+
+
+def enqueue_screening_job(db: Session, questionnaire_id: int) -> ScreeningJob:
+    """Add a queued job to the current transaction"""
+    job = ScreeningJob(
+        questionnaire_id=questionnaire_id,
+        status=ScreeningJobStatus.QUEUED,
+        attempts=0,
+        available_at=datetime.utcnow(),
+    )
+    db.add(job)
+    return job
+
+
+def _claimable(now: datetime):
+    """Jobs that are due, or whose lease expired while running"""
+    return or_(
+        and_(ScreeningJob.status == ScreeningJobStatus.QUEUED, ScreeningJob.available_at <= now),
+        and_(ScreeningJob.status == ScreeningJobStatus.RUNNING, ScreeningJob.locked_until < now),
+    )
+
+
+def claim_next_job(db: Session, lease: str) -> Optional[ScreeningJob]:
+    """
+    Atomically lease the next due job
+
+    Args:
+        db: Database session
+        lease: Unique token identifying this claim
+
+    Returns:
+        The claimed job, or None if nothing is due
+    """
+    now = datetime.utcnow()
+    candidate_ids: List[int] = [
+        row.id for row in db.query(ScreeningJob.id)
+        .filter(_claimable(now))
+        .order_by(ScreeningJob.available_at)
+        .limit(5)
+    ]
+
+    for job_id in candidate_ids:
+        # Compare-and-set: only one worker can move a claimable job to RUNNING
+        claimed = db.query(ScreeningJob).filter(
+            ScreeningJob.id == job_id,
+            _claimable(now)
+        ).update({
+            ScreeningJob.status: ScreeningJobStatus.RUNNING,
+            ScreeningJob.locked_by: lease,
+            ScreeningJob.locked_until: now + timedelta(seconds=settings.SCREENING_JOB_VISIBILITY_TIMEOUT_SECONDS),
+            ScreeningJob.attempts: ScreeningJob.attempts + 1,
+        }, synchronize_session=False)
+        db.commit()
+
+        if claimed:
+            return db.query(ScreeningJob).filter(ScreeningJob.id == job_id).first()
+
+    return None
+
+
+def _settle(db: Session, job: ScreeningJob, lease: str, **values) -> bool:
+    """Update a job only while this worker still holds its lease"""
+    updated = db.query(ScreeningJob).filter(
+        ScreeningJob.id == job.id,
+        ScreeningJob.locked_by == lease
+    ).update(values, synchronize_session=False)
+    return updated == 1
+
+
+def _succeed(db: Session, job: ScreeningJob, lease: str) -> None:
+    _settle(
+        db, job, lease,
+        status=ScreeningJobStatus.SUCCEEDED,
+        locked_by=None,
+        locked_until=None,
+        last_error=None,
+        completed_at=datetime.utcnow(),
+    )
+
+
+def _fail(db: Session, job: ScreeningJob, lease: str, error: str, retry: bool = True) -> None:
+    """Schedule a retry with exponential backoff, or give up after the last attempt"""
+    if not retry or job.attempts >= settings.SCREENING_JOB_MAX_ATTEMPTS:
+        _settle(
+            db, job, lease,
+            status=ScreeningJobStatus.FAILED,
+            locked_by=None,
+            locked_until=None,
+            last_error=error,
+            completed_at=datetime.utcnow(),
+        )
+        return
+
+    delay = settings.SCREENING_JOB_BACKOFF_SECONDS * (2 ** (job.attempts - 1))
+    _settle(
+        db, job, lease,
+        status=ScreeningJobStatus.QUEUED,
+        locked_by=None,
+        locked_until=None,
+        last_error=error,
+        available_at=datetime.utcnow() + timedelta(seconds=delay),
+    )
+
+
+def process_job(db: Session, job: ScreeningJob) -> None:
+    """Run a claimed job: create the screening result exactly once and settle the job"""
+    lease = job.locked_by
+
+    if job.attempts > settings.SCREENING_JOB_MAX_ATTEMPTS:
+        # Lease expired on the final attempt (worker crashed or hung)
+        _fail(db, job, lease, "Visibility timeout expired on the final attempt")
+        db.commit()
+        return
+
+    created = None
+    try:
+        questionnaire = db.query(Questionnaire).filter(Questionnaire.id == job.questionnaire_id).first()
+        if questionnaire is None:
+            _fail(db, job, lease, "Questionnaire not found", retry=False)
+            db.commit()
+            return
+
+        existing = db.query(ScreeningResult.id).filter(
+            ScreeningResult.questionnaire_id == questionnaire.id
+        ).first()
+
+        if existing is None:
+            created = build_screening_result(questionnaire)
+            db.add(created)
+
+        # Result and job status commit together
+        _succeed(db, job, lease)
+        db.commit()
+    except IntegrityError:
+        # Another worker (or POST /run) stored the result first - exactly one result exists
+        db.rollback()
+        created = None
+        _succeed(db, job, lease)
+        db.commit()
+    except Exception as exc:
+        db.rollback()
+        created = None
+        logger.exception("Screening job %s failed (attempt %s)", job.id, job.attempts)
+        _fail(db, job, lease, f"{type(exc).__name__}: {exc}")
+        db.commit()
+
+    if created is not None:
+        publish_screening_created(created)
+
+
+class ScreeningWorkerPool:
+    """Threads that poll the queue and process screening jobs"""
+
+    def __init__(self, workers: int, poll_seconds: float):
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._worker_prefix = f"{socket.gethostname()}:{os.getpid()}"
+
+    def start(self) -> None:
+        self._stop.clear()
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._run, args=(index,), name=f"screening-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def run_once(self, index: int = 0) -> bool:
+        """Claim and process one job; returns False if the queue had nothing due"""
+        db = SessionLocal()
+        try:
+            job = claim_next_job(db, lease=f"{self._worker_prefix}:{index}:{uuid.uuid4().hex}")
+            if job is None:
+                return False
+            process_job(db, job)
+            return True
+        finally:
+            db.close()
+
+    def _run(self, index: int) -> None:
+        while not self._stop.is_set():
+            try:
+                if self.run_once(index):
+                    continue
+            except Exception:
+                logger.exception("Screening worker %s crashed while polling", index)
+            self._stop.wait(self.poll_seconds)
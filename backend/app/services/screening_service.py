@@ -4,9 +4,22 @@ Implements the 2-step screening mechanism from the new questionnaire
 Updated to distinguish ABSOLUTE vs RELATIVE contraindications
 """
 
-from typing import Dict, List, Tuple, Any
+import hashlib
+import json
+from typing import Collection, Dict, List, Set, Tuple, Any
 from enum import Enum
 
+from app.core.config import settings
+from app.services.aom_history import failed_drug_names, parse_aom_history
+from app.services.fuzzy_normalizer import FuzzyNormalizer, normalize_term
+from app.services.medication_matcher import load_synonyms, medication_matcher
+from app.core.condition_codes import (
+    COMORBIDITY_MASK,
+    encode_eating_habits,
+    encode_health_conditions,
+    habit_mask,
+)
+
 
 class ContraindicationType(str, Enum):
     """Types of contraindications"""
@@ -40,9 +53,252 @@ INITIAL_DRUG_POOL = [
 ]
 
 
+# Medication interactions, checked against the ingredients recognized in current_medications
+# (ingredients, affected drugs, contraindication type, reason)
+_MAOIS = ("phenelzine", "tranylcypromine", "isocarboxazid", "selegiline", "rasagiline", "linezolid")
+_OPIOIDS = ("oxycodone", "hydrocodone", "morphine", "codeine", "tramadol", "tapentadol", "fentanyl",
+            "methadone", "buprenorphine", "hydromorphone", "oxymorphone")
+_STIMULANTS = ("amphetamine", "methylphenidate", "lisdexamfetamine", "phentermine")
+_GLP1_AGONISTS = ("semaglutide", "tirzepatide", "liraglutide", "dulaglutide", "exenatide")
+_INSULIN_SECRETAGOGUES = ("insulin", "glipizide", "glyburide", "glimepiride")
+_HORMONAL_CONTRACEPTIVES = ("hormonal contraceptive", "ethinyl estradiol", "levonorgestrel", "norethindrone")
+_SEIZURE_THRESHOLD = ("amitriptyline", "nortriptyline", "clozapine", "theophylline")
+_CYP2D6_ANTIDEPRESSANTS = ("fluoxetine", "paroxetine", "sertraline", "escitalopram", "citalopram", "venlafaxine", "duloxetine")
+
+MEDICATION_INTERACTIONS = (
+    (("tamoxifen",), [DrugName.CONTRAVE, DrugName.BUPROPION], ContraindicationType.ABSOLUTE,
+     "Tamoxifen - CYP2D6 inhibition reduces tamoxifen efficacy"),
+    (_MAOIS, [DrugName.PHENTERMINE, DrugName.VYVANSE, DrugName.QSYMIA, DrugName.CONTRAVE, DrugName.BUPROPION],
+     ContraindicationType.ABSOLUTE, "MAO inhibitor - Hypertensive crisis risk (allow 14 days after stopping)"),
+    (_OPIOIDS, [DrugName.CONTRAVE, DrugName.NALTREXONE], ContraindicationType.ABSOLUTE,
+     "Opioid therapy - Naltrexone blocks analgesia and can precipitate withdrawal"),
+    (_STIMULANTS, [DrugName.PHENTERMINE, DrugName.VYVANSE, DrugName.QSYMIA], ContraindicationType.RELATIVE,
+     "Already taking a stimulant - Avoid duplicate sympathomimetic therapy"),
+    (_GLP1_AGONISTS, [DrugName.WEGOVY, DrugName.ZEPBOUND], ContraindicationType.RELATIVE,
+     "Already taking a GLP-1/GIP agonist - Switch rather than combine"),
+    (_INSULIN_SECRETAGOGUES, [DrugName.WEGOVY, DrugName.ZEPBOUND], ContraindicationType.RELATIVE,
+     "Insulin or sulfonylurea - Hypoglycemia risk, reduce dose when starting"),
+    (_HORMONAL_CONTRACEPTIVES, [DrugName.QSYMIA, DrugName.TOPIRAMATE], ContraindicationType.RELATIVE,
+     "Hormonal contraceptive - Topiramate may reduce efficacy and cause irregular bleeding"),
+    (("bupropion",), [DrugName.CONTRAVE, DrugName.BUPROPION], ContraindicationType.RELATIVE,
+     "Already taking bupropion - Avoid duplicate therapy"),
+    (("naltrexone",), [DrugName.CONTRAVE, DrugName.NALTREXONE], ContraindicationType.RELATIVE,
+     "Already taking naltrexone - Avoid duplicate therapy"),
+    (("topiramate",), [DrugName.QSYMIA, DrugName.TOPIRAMATE], ContraindicationType.RELATIVE,
+     "Already taking topiramate - Avoid duplicate therapy"),
+    (_SEIZURE_THRESHOLD, [DrugName.CONTRAVE, DrugName.BUPROPION], ContraindicationType.RELATIVE,
+     "Lowers seizure threshold - Bupropion seizure risk, review dose"),
+    (_CYP2D6_ANTIDEPRESSANTS, [DrugName.CONTRAVE, DrugName.BUPROPION], ContraindicationType.RELATIVE,
+     "Antidepressant metabolized by CYP2D6 - Bupropion raises levels, review dose"),
+)
+
+# Ingredient -> interaction rules naming it
+_INTERACTIONS_BY_INGREDIENT: Dict[str, List[Tuple]] = {}
+for _rule in MEDICATION_INTERACTIONS:
+    for _ingredient in _rule[0]:
+        _INTERACTIONS_BY_INGREDIENT.setdefault(_ingredient, []).append(_rule)
+
+
+# Allergy check: active ingredients, drug classes and excipients of each product
+PRODUCT_COMPOSITION = {
+    DrugName.PHENTERMINE: ("phentermine", "sympathomimetic amine"),
+    DrugName.TOPIRAMATE: ("topiramate", "sulfonamide", "lactose"),
+    DrugName.QSYMIA: ("phentermine", "topiramate", "sympathomimetic amine", "sulfonamide", "gelatin"),
+    DrugName.CONTRAVE: ("naltrexone", "bupropion", "opioid antagonist", "aminoketone", "lactose"),
+    DrugName.NALTREXONE: ("naltrexone", "opioid antagonist", "lactose"),
+    DrugName.BUPROPION: ("bupropion", "aminoketone"),
+    DrugName.VYVANSE: ("lisdexamfetamine", "amphetamine", "sympathomimetic amine", "gelatin"),
+    DrugName.WEGOVY: ("semaglutide", "glp 1 receptor agonist"),
+    DrugName.ZEPBOUND: ("tirzepatide", "glp 1 receptor agonist", "gip receptor agonist"),
+}
+
+# Patient wording -> composition term (brand names come from the medication synonym dictionary)
+ALLERGEN_SYNONYMS = {
+    "sulfa": "sulfonamide",
+    "sulfa drugs": "sulfonamide",
+    "sulpha": "sulfonamide",
+    "sulphonamide": "sulfonamide",
+    "sulfonamides": "sulfonamide",
+    "gelatine": "gelatin",
+    "milk sugar": "lactose",
+    "amphetamines": "amphetamine",
+    "stimulants": "sympathomimetic amine",
+    "glp 1": "glp 1 receptor agonist",
+    "glp1": "glp 1 receptor agonist",
+    "glp 1 agonist": "glp 1 receptor agonist",
+}
+
+
+def _build_allergen_index() -> Tuple[Dict[str, List[DrugName]], Dict[str, str]]:
+    """Inverted index from composition term to products, plus aliases for each term"""
+    drugs_by_allergen: Dict[str, List[DrugName]] = {}
+    for drug in INITIAL_DRUG_POOL:
+        for term in (drug.value.lower(), *PRODUCT_COMPOSITION[drug]):
+            if drug not in drugs_by_allergen.setdefault(term, []):
+                drugs_by_allergen[term].append(drug)
+
+    aliases = dict(ALLERGEN_SYNONYMS)
+    for ingredient, names in load_synonyms().items():
+        if ingredient in drugs_by_allergen:
+            for name in names:
+                aliases.setdefault(normalize_term(name), ingredient)
+    return drugs_by_allergen, aliases
+
+
+DRUGS_BY_ALLERGEN, ALLERGEN_ALIASES = _build_allergen_index()
+allergy_normalizer = FuzzyNormalizer(
+    set(DRUGS_BY_ALLERGEN) | set(ALLERGEN_ALIASES),
+    settings.ALLERGY_NORMALIZER_CACHE_SIZE
+)
+
+
+def resolve_allergens(entry: str) -> Set[str]:
+    """
+    Composition terms named by a patient-entered allergy
+
+    The whole entry is tried first ("sulfa drugs"), then each word
+    ("allergic to sulfa and gelatine").
+    """
+    term = allergy_normalizer.normalize(entry)
+    terms = [term] if term else [allergy_normalizer.normalize(word) for word in normalize_term(entry).split()]
+    return {ALLERGEN_ALIASES.get(term, term) for term in terms if term}
+
+
+# Second-Step eating habit categories
+APPETITE_HABITS_MASK = habit_mask("excessive_appetite", "lack_of_satiety", "binge_eating")
+BEHAVIORAL_HABITS_MASK = habit_mask("emotional_eating", "night_eating", "frequent_snacking")
+
+
+# Questionnaire fields read by ScreeningService.run_screening
+SCREENING_INPUT_FIELDS = (
+    "height_ft",
+    "height_in",
+    "weight_lb",
+    "eating_habits",
+    "health_conditions",
+    "condition_control_status",
+    "current_medications",
+    "drug_allergies",
+    "previous_aom_history",
+)
+
+
+def build_screening_input(source: Any) -> Dict[str, Any]:
+    """
+    Collect the screening inputs from a questionnaire
+
+    Accepts either a Questionnaire ORM object or a questionnaire schema. The
+    condition and habit bitsets and the parsed AOM history are taken from the
+    ORM object when stored, otherwise derived from the raw answers.
+    """
+    health_conditions_mask = getattr(source, "health_conditions_mask", None)
+    eating_habits_mask = getattr(source, "eating_habits_mask", None)
+    return {
+        "height_ft": source.height_ft,
+        "height_in": source.height_in,
+        "weight_lb": source.weight_lb,
+        "eating_habits": source.eating_habits or [],
+        "health_conditions": source.health_conditions or [],
+        "condition_control_status": source.condition_control_status or {},
+        "current_medications": source.current_medications or [],
+        "drug_allergies": source.drug_allergies or [],
+        "previous_aom_history": source.previous_aom_history,
+        "previous_aom_entries": getattr(source, "previous_aom_entries", None),
+        "health_conditions_mask": (
+            encode_health_conditions(source.health_conditions) if health_conditions_mask is None else health_conditions_mask
+        ),
+        "eating_habits_mask": (
+            encode_eating_habits(source.eating_habits) if eating_habits_mask is None else eating_habits_mask
+        ),
+    }
+
+
+def screening_masks(questionnaire_data: Dict) -> Tuple[int, int]:
+    """Condition and eating habit bitsets of screening input, encoding the lists if absent"""
+    conditions_mask = questionnaire_data.get("health_conditions_mask")
+    if conditions_mask is None:
+        conditions_mask = encode_health_conditions(questionnaire_data.get("health_conditions", []))
+    habits_mask = questionnaire_data.get("eating_habits_mask")
+    if habits_mask is None:
+        habits_mask = encode_eating_habits(questionnaire_data.get("eating_habits", []))
+    return conditions_mask, habits_mask
+
+
+def previously_failed_drugs(questionnaire_data: Dict) -> List[DrugName]:
+    """Drugs the patient tried without success, from the stored entries or by parsing the history"""
+    entries = questionnaire_data.get("previous_aom_entries")
+    if entries is None:
+        entries = parse_aom_history(questionnaire_data.get("previous_aom_history") or "")
+    return [parse_drug_name(name) for name in failed_drug_names(entries)]
+
+
+def screening_fingerprint(screening_input: Dict[str, Any]) -> str:
+    """Stable hash of screening inputs; identical inputs always screen identically"""
+    canonical = json.dumps(
+        {field: screening_input.get(field) for field in SCREENING_INPUT_FIELDS},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def clean_drug_name(drug: Any) -> str:
+    """Convert a drug to its stored name (remove "DrugName." prefix)"""
+    return str(drug).replace("DrugName.", "")
+
+
+def parse_drug_name(name: str) -> DrugName:
+    """Convert a stored drug name (enum name or display value) back to a DrugName"""
+    if name in DrugName.__members__:
+        return DrugName[name]
+    return DrugName(name)
+
+
+# ScreeningResult fields produced by format_screening_output
+SCREENING_OUTPUT_FIELDS = (
+    "is_eligible",
+    "eligibility_message",
+    "bmi_category",
+    "initial_drug_pool",
+    "excluded_drugs",
+    "absolute_exclusions",
+    "relative_warnings",
+    "recommended_drugs",
+    "screening_logic",
+    "warnings",
+)
+
+
+def format_screening_output(screening_result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert run_screening output to the JSON-ready fields stored on ScreeningResult
+
+    Drug enum keys and values are replaced with their stored names.
+    """
+    absolute_exclusions = {clean_drug_name(k): v for k, v in screening_result.get("absolute_exclusions", {}).items()}
+    return {
+        "is_eligible": screening_result["is_eligible"],
+        "eligibility_message": screening_result["eligibility_message"],
+        "bmi_category": screening_result["bmi_category"],
+        "initial_drug_pool": [clean_drug_name(drug) for drug in screening_result["initial_drug_pool"]],
+        "excluded_drugs": dict(absolute_exclusions),  # Legacy field
+        "absolute_exclusions": absolute_exclusions,
+        "relative_warnings": {clean_drug_name(k): v for k, v in screening_result.get("relative_warnings", {}).items()},
+        "recommended_drugs": [{**drug, "medication": clean_drug_name(drug["medication"])} for drug in screening_result["recommended_drugs"]],
+        "screening_logic": screening_result["screening_steps"],
+        "warnings": screening_result["warnings"],
+    }
+
+
 class ScreeningService:
     """Service to handle medication screening logic"""
 
+    # Questionnaire fields read by each screening stage (used for incremental re-screening)
+    GATE_FIELDS = {"height_ft", "height_in", "weight_lb", "health_conditions"}
+    FIRST_STEP_FIELDS = {"health_conditions", "condition_control_status", "current_medications", "drug_allergies"}
+    SECOND_STEP_FIELDS = {"eating_habits", "previous_aom_history"}
+
     @staticmethod
     def calculate_bmi(height_ft: int, height_in: int, weight_lb: float) -> float:
         """Calculate BMI from imperial units"""
@@ -52,6 +308,52 @@ class ScreeningService:
         bmi = weight_kg / (height_m ** 2)
         return round(bmi, 2)
 
+    @staticmethod
+    def apply_eligibility_gate(bmi: float, health_conditions_mask: int) -> Dict[str, Any]:
+        """
+        Eligibility Gate: Only "no comorbidities + BMI <30" = ineligible
+        Returns: is_eligible, eligibility_message, warnings and the screening step entry
+
+        "Only people with 'no comorbidities + BMI <30' are not eligible for oral AOM"
+        "those with BMI ≥30 may can go to next step even with no comorbidities"
+        """
+        # Check if patient has any comorbidities (excluding "none")
+        has_comorbidities = bool(health_conditions_mask & COMORBIDITY_MASK)
+
+        # Only ineligible if BOTH conditions are true: no comorbidities AND BMI < 30
+        if not has_comorbidities and bmi < 30:
+            return {
+                "is_eligible": False,
+                "eligibility_message": "Not eligible for oral anti-obesity medications",
+                "warnings": [
+                    "⛔ BMI Requirement Not Met: Your BMI is below 30 with no comorbidities.",
+                    "Oral anti-obesity medications are indicated for individuals with:",
+                    "• BMI ≥ 30, OR",
+                    "• BMI ≥ 27 with weight-related comorbidities (e.g., hypertension, diabetes, sleep apnea)",
+                    "",
+                    "Your BMI: {:.2f}".format(bmi),
+                    "",
+                    "💡 Recommendation: Focus on lifestyle modifications including diet and exercise.",
+                    "Please consult with your healthcare provider for personalized weight management strategies."
+                ],
+                "step": {
+                    "step": "BMI Eligibility Gate",
+                    "result": f"BMI {bmi:.2f} < 30 with no comorbidities: Not eligible. No further screening performed."
+                },
+            }
+
+        # Eligible: Either BMI ≥30 OR BMI 27-29.9 with comorbidities
+        eligibility_reason = "BMI ≥ 30" if bmi >= 30 else f"BMI {bmi:.2f} ≥ 27 with comorbidities"
+        return {
+            "is_eligible": True,
+            "eligibility_message": "Screening completed",
+            "warnings": [],
+            "step": {
+                "step": "BMI Eligibility Gate",
+                "result": f"{eligibility_reason}: Passed eligibility gate. Proceeding to comorbidity assessment."
+            },
+        }
+
     @staticmethod
     def apply_first_step_exclusions(
         health_conditions: List[str],
@@ -195,24 +497,84 @@ class ScreeningService:
 
         return remaining_drugs, absolute_exclusions, relative_warnings
 
+    @staticmethod
+    def apply_medication_interactions(
+        remaining_drugs: List[str],
+        absolute_exclusions: Dict[str, str],
+        relative_warnings: Dict[str, str],
+        current_medications: List[str]
+    ) -> Dict[str, List[str]]:
+        """
+        Medication Interaction Check: current_medications against the drug pool
+        Updates remaining_drugs, absolute_exclusions and relative_warnings in place
+        Returns: recognized ingredient -> the entries it was found in
+
+        Drugs already removed by the First-Step keep their original reason.
+        """
+        recognized = medication_matcher.find_all(current_medications)
+
+        for ingredient, entries in recognized.items():
+            for _, drugs, contraindication, reason in _INTERACTIONS_BY_INGREDIENT.get(ingredient, ()):
+                source = f"{reason} (listed: {', '.join(entries)})"
+                for drug in drugs:
+                    if contraindication == ContraindicationType.ABSOLUTE:
+                        if drug in remaining_drugs:
+                            remaining_drugs.remove(drug)
+                            absolute_exclusions[drug] = f"⛔ ABSOLUTE: {source}. Hard eliminate."
+                    elif drug in remaining_drugs and drug not in relative_warnings:
+                        relative_warnings[drug] = f"⚠️ RELATIVE: {source}. Review before prescribing."
+
+        return recognized
+
+    @staticmethod
+    def apply_allergy_exclusions(
+        remaining_drugs: List[str],
+        absolute_exclusions: Dict[str, str],
+        drug_allergies: List[str]
+    ) -> Tuple[Dict[str, List[str]], List[str]]:
+        """
+        Allergy Check: reported allergies against each product's ingredients and excipients
+        Updates remaining_drugs and absolute_exclusions in place
+        Returns: (recognized allergen -> entries naming it, unrecognized entries)
+        """
+        recognized: Dict[str, List[str]] = {}
+        unrecognized: List[str] = []
+
+        for entry in drug_allergies:
+            if not isinstance(entry, str) or not entry.strip():
+                continue
+            allergens = resolve_allergens(entry)
+            if not allergens:
+                unrecognized.append(entry)
+            for allergen in sorted(allergens):
+                recognized.setdefault(allergen, []).append(entry)
+
+        for allergen, entries in recognized.items():
+            for drug in DRUGS_BY_ALLERGEN[allergen]:
+                if drug in remaining_drugs:
+                    remaining_drugs.remove(drug)
+                    absolute_exclusions[drug] = (
+                        f"⛔ ABSOLUTE: Reported allergy to {allergen} (listed: {', '.join(entries)}). Hard eliminate."
+                    )
+
+        return recognized, unrecognized
+
     @staticmethod
     def apply_second_step_ordering(
         drug_pool: List[str],
-        eating_habits: List[str]
+        eating_habits_mask: int,
+        previously_failed: Collection[DrugName] = ()
     ) -> List[Dict[str, Any]]:
         """
         Second-Step: Display Order Adjustment Based on Eating Habits & Feelings
         Returns prioritized list of medications
+
+        Drugs in previously_failed (tried before without success, per
+        previous_aom_history) are moved to the end, keeping their relative order.
         """
         # Categorize eating habits
-        appetite_issues = {"excessive_appetite", "lack_of_satiety", "binge_eating"}
-        behavioral_issues = {"emotional_eating", "night_eating", "frequent_snacking"}
-
-        checked_appetite = appetite_issues.intersection(set(eating_habits))
-        checked_behavioral = behavioral_issues.intersection(set(eating_habits))
-
-        has_appetite = len(checked_appetite) > 0
-        has_behavioral = len(checked_behavioral) > 0
+        has_appetite = bool(eating_habits_mask & APPETITE_HABITS_MASK)
+        has_behavioral = bool(eating_habits_mask & BEHAVIORAL_HABITS_MASK)
 
         # Determine priority order
         if has_appetite and has_behavioral:
@@ -228,28 +590,28 @@ class ScreeningService:
             # Scenario 4: None checked - maintain original order
             priority_order = []
 
-        # Build final recommendations list
-        recommendations = []
-
-        # Add prioritized drugs first
-        for drug in priority_order:
-            if drug in drug_pool:
-                recommendations.append({
-                    "medication": drug,
-                    "priority": len(recommendations) + 1,
-                    "reasoning": "Retained after screening"
-                })
-
-        # Add remaining drugs in original order
-        for drug in INITIAL_DRUG_POOL:
-            if drug in drug_pool and drug not in priority_order:
-                recommendations.append({
-                    "medication": drug,
-                    "priority": len(recommendations) + 1,
-                    "reasoning": "Retained after screening"
-                })
-
-        return recommendations
+        # Prioritized drugs first, then the remaining drugs in original order
+        ordered = [drug for drug in priority_order if drug in drug_pool]
+        ordered += [drug for drug in INITIAL_DRUG_POOL if drug in drug_pool and drug not in priority_order]
+
+        # Previously failed drugs last
+        if previously_failed:
+            ordered = (
+                [drug for drug in ordered if drug not in previously_failed]
+                + [drug for drug in ordered if drug in previously_failed]
+            )
+
+        return [
+            {
+                "medication": drug,
+                "priority": priority,
+                "reasoning": (
+                    "Retained after screening; previously tried without success - deprioritized"
+                    if drug in previously_failed else "Retained after screening"
+                )
+            }
+            for priority, drug in enumerate(ordered, 1)
+        ]
 
     def run_screening(self, questionnaire_data: Dict) -> Dict[str, Any]:
         """
@@ -259,6 +621,10 @@ class ScreeningService:
         - BMI ≥30: Eligible (even without comorbidities)
         - BMI 27-29.9 + comorbidities: Eligible
 
+        After the First-Step, listed current_medications are checked for
+        interactions with the remaining drugs, and products containing a
+        listed drug allergen are excluded.
+
         Returns complete screening results with ABSOLUTE and RELATIVE contraindications
         """
         result = {
@@ -284,42 +650,18 @@ class ScreeningService:
         result["bmi_category"] = str(bmi)
 
         # ⛔ ELIGIBILITY GATE: Per AMO Questionnaire Document
-        # "Only people with 'no comorbidities + BMI <30' are not eligible for oral AOM"
-        # "those with BMI ≥30 may can go to next step even with no comorbidities"
         health_conditions = questionnaire_data.get("health_conditions", [])
+        conditions_mask, habits_mask = screening_masks(questionnaire_data)
+        gate = self.apply_eligibility_gate(bmi, conditions_mask)
+        result["screening_steps"].append(gate["step"])
 
-        # Check if patient has any comorbidities (excluding "none")
-        has_comorbidities = len([c for c in health_conditions if c != "none"]) > 0
-
-        # Only ineligible if BOTH conditions are true: no comorbidities AND BMI < 30
-        if not has_comorbidities and bmi < 30:
+        if not gate["is_eligible"]:
             result["is_eligible"] = False
-            result["eligibility_message"] = "Not eligible for oral anti-obesity medications"
-            result["warnings"] = [
-                "⛔ BMI Requirement Not Met: Your BMI is below 30 with no comorbidities.",
-                "Oral anti-obesity medications are indicated for individuals with:",
-                "• BMI ≥ 30, OR",
-                "• BMI ≥ 27 with weight-related comorbidities (e.g., hypertension, diabetes, sleep apnea)",
-                "",
-                "Your BMI: {:.2f}".format(bmi),
-                "",
-                "💡 Recommendation: Focus on lifestyle modifications including diet and exercise.",
-                "Please consult with your healthcare provider for personalized weight management strategies."
-            ]
-            result["screening_steps"].append({
-                "step": "BMI Eligibility Gate",
-                "result": f"BMI {bmi:.2f} < 30 with no comorbidities: Not eligible. No further screening performed."
-            })
+            result["eligibility_message"] = gate["eligibility_message"]
+            result["warnings"] = gate["warnings"]
             # Return early - skip all comorbidity and drug screening
             return result
 
-        # Eligible: Either BMI ≥30 OR BMI 27-29.9 with comorbidities
-        eligibility_reason = "BMI ≥ 30" if bmi >= 30 else f"BMI {bmi:.2f} ≥ 27 with comorbidities"
-        result["screening_steps"].append({
-            "step": "BMI Eligibility Gate",
-            "result": f"{eligibility_reason}: Passed eligibility gate. Proceeding to comorbidity assessment."
-        })
-
         # FIRST-STEP: Apply health status exclusions (Table 1)
         condition_control_status = questionnaire_data.get("condition_control_status", {})
         remaining_drugs, absolute_exclusions, relative_warnings = self.apply_first_step_exclusions(
@@ -327,6 +669,46 @@ class ScreeningService:
             condition_control_status
         )
 
+        first_step_summary = (
+            f"ABSOLUTE exclusions: {len(absolute_exclusions)}. RELATIVE warnings: {len(relative_warnings)}. "
+            f"Remaining eligible: {len(remaining_drugs)}"
+        )
+
+        # MEDICATION INTERACTIONS: Check what the patient already takes (skipped if nothing listed)
+        current_medications = questionnaire_data.get("current_medications") or []
+        interaction_summary = None
+        if current_medications:
+            excluded_before = len(absolute_exclusions)
+            flagged_before = len(relative_warnings)
+            recognized = self.apply_medication_interactions(
+                remaining_drugs,
+                absolute_exclusions,
+                relative_warnings,
+                current_medications
+            )
+            interaction_summary = (
+                f"Recognized: {', '.join(sorted(recognized)) or 'none'}. "
+                f"ABSOLUTE exclusions: {len(absolute_exclusions) - excluded_before}. "
+                f"RELATIVE warnings: {len(relative_warnings) - flagged_before}. Remaining eligible: {len(remaining_drugs)}"
+            )
+
+        # ALLERGIES: Products containing a reported allergen (skipped if nothing listed)
+        drug_allergies = questionnaire_data.get("drug_allergies") or []
+        allergy_summary = None
+        if drug_allergies:
+            excluded_before = len(absolute_exclusions)
+            allergens, unrecognized = self.apply_allergy_exclusions(
+                remaining_drugs,
+                absolute_exclusions,
+                drug_allergies
+            )
+            allergy_summary = (
+                f"Recognized: {', '.join(sorted(allergens)) or 'none'}. "
+                f"ABSOLUTE exclusions: {len(absolute_exclusions) - excluded_before}. Remaining eligible: {len(remaining_drugs)}"
+            )
+            if unrecognized:
+                allergy_summary += f". Not recognized, review manually: {', '.join(unrecognized)}"
+
         result["absolute_exclusions"] = absolute_exclusions
         result["relative_warnings"] = relative_warnings
 
@@ -338,12 +720,25 @@ class ScreeningService:
 
         result["screening_steps"].append({
             "step": "First-Step - Health Status Exclusions (Table 1)",
-            "result": f"ABSOLUTE exclusions: {len(absolute_exclusions)}. RELATIVE warnings: {len(relative_warnings)}. Remaining eligible: {len(remaining_drugs)}"
+            "result": first_step_summary
         })
+        if interaction_summary is not None:
+            result["screening_steps"].append({
+                "step": "Medication Interaction Check",
+                "result": interaction_summary
+            })
+        if allergy_summary is not None:
+            result["screening_steps"].append({
+                "step": "Allergy Check",
+                "result": allergy_summary
+            })
 
         # SECOND-STEP: Apply eating habits-based ordering
-        eating_habits = questionnaire_data.get("eating_habits", [])
-        recommendations = self.apply_second_step_ordering(remaining_drugs, eating_habits)
+        recommendations = self.apply_second_step_ordering(
+            remaining_drugs,
+            habits_mask,
+            previously_failed_drugs(questionnaire_data)
+        )
 
         result["recommended_drugs"] = recommendations
         result["screening_steps"].append({
@@ -352,3 +747,74 @@ class ScreeningService:
         })
 
         return result
+
+    def rescreen(
+        self,
+        stored: Dict[str, Any],
+        questionnaire_data: Dict,
+        changed_fields: Set[str]
+    ) -> Dict[str, Any]:
+        """
+        Incremental re-screening after a questionnaire edit
+        Returns only the stored result fields whose values changed
+
+        - Height/weight changes re-run only the eligibility gate
+        - Eating habit or AOM history changes re-run only the Second-Step ordering
+        - Health condition changes, or an eligibility flip, re-run all stages
+
+        stored holds the current ScreeningResult fields as produced by
+        format_screening_output.
+        """
+        changed_fields = set(changed_fields) & set(SCREENING_INPUT_FIELDS)
+        if not changed_fields:
+            return {}
+
+        was_eligible = stored["is_eligible"]
+        screening_logic = [dict(step) for step in stored.get("screening_logic") or []]
+
+        gate = None
+        if changed_fields & self.GATE_FIELDS:
+            bmi = self.calculate_bmi(
+                questionnaire_data["height_ft"],
+                questionnaire_data["height_in"],
+                questionnaire_data["weight_lb"]
+            )
+            gate = self.apply_eligibility_gate(bmi, screening_masks(questionnaire_data)[0])
+
+        needs_full_run = (
+            not screening_logic
+            or (gate is not None and gate["is_eligible"] != was_eligible)
+            or (was_eligible and changed_fields & self.FIRST_STEP_FIELDS)
+        )
+
+        if needs_full_run:
+            updated = format_screening_output(self.run_screening(questionnaire_data))
+        elif not was_eligible:
+            # Still ineligible: only the gate output can change
+            updated = {}
+            if gate is not None:
+                updated = {
+                    "bmi_category": str(bmi),
+                    "warnings": gate["warnings"],
+                    "screening_logic": [gate["step"]],
+                }
+        else:
+            updated = {}
+            if gate is not None:
+                updated["bmi_category"] = str(bmi)
+                screening_logic[0] = gate["step"]
+                updated["screening_logic"] = screening_logic
+
+            if changed_fields & self.SECOND_STEP_FIELDS:
+                # Re-order the drugs that survived the First-Step
+                remaining_drugs = [parse_drug_name(drug["medication"]) for drug in stored.get("recommended_drugs") or []]
+                recommendations = self.apply_second_step_ordering(
+                    remaining_drugs,
+                    screening_masks(questionnaire_data)[1],
+                    previously_failed_drugs(questionnaire_data)
+                )
+                updated["recommended_drugs"] = [
+                    {**drug, "medication": clean_drug_name(drug["medication"])} for drug in recommendations
+                ]
+
+        return {field: value for field, value in updated.items() if stored.get(field) != value}
@@ -0,0 +1,231 @@
+"""
+Case Search
+Full-text search over Questionnaire.additional_remarks and ScreeningResult.doctor_notes.
+
+Each case (questionnaire plus its screening result) with any text has one row
+in the case_search index: an FTS5 table on SQLite, a tsvector column with a
+GIN index on Postgres. Database triggers refresh a case's row whenever either
+column changes or a row is inserted or deleted, so the index is maintained
+incrementally by every writer, including bulk SQL and the archive job.
+Archived cases leave the index with their live rows.
+
+Other databases, and SQLite builds without FTS5, fall back to a LIKE scan.
+"""
+
+import logging
+import re
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+MAX_QUERY_TERMS = 16
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+# Index row for one case; selects nothing when neither column has text (or the questionnaire is gone)
+_SQLITE_REFRESH = """
+    DELETE FROM case_search WHERE rowid = {case_id};
+    INSERT INTO case_search (rowid, additional_remarks, doctor_notes)
+    SELECT q.id, coalesce(q.additional_remarks, ''), coalesce(sr.doctor_notes, '')
+    FROM questionnaires q LEFT JOIN screening_results sr ON sr.questionnaire_id = q.id
+    WHERE q.id = {case_id} AND (coalesce(q.additional_remarks, '') <> '' OR coalesce(sr.doctor_notes, '') <> '');
+"""
+
+_SQLITE_TRIGGERS = {
+    "case_search_questionnaire_insert": ("AFTER INSERT ON questionnaires", "new.id"),
+    "case_search_questionnaire_update": ("AFTER UPDATE OF additional_remarks ON questionnaires", "new.id"),
+    "case_search_questionnaire_delete": ("AFTER DELETE ON questionnaires", "old.id"),
+    "case_search_result_insert": ("AFTER INSERT ON screening_results", "new.questionnaire_id"),
+    "case_search_result_update": ("AFTER UPDATE OF doctor_notes ON screening_results", "new.questionnaire_id"),
+    "case_search_result_delete": ("AFTER DELETE ON screening_results", "old.questionnaire_id"),
+}
+
+_SQLITE_BACKFILL = """
+    INSERT INTO case_search (rowid, additional_remarks, doctor_notes)
+    SELECT q.id, coalesce(q.additional_remarks, ''), coalesce(sr.doctor_notes, '')
+    FROM questionnaires q LEFT JOIN screening_results sr ON sr.questionnaire_id = q.id
+    WHERE coalesce(q.additional_remarks, '') <> '' OR coalesce(sr.doctor_notes, '') <> ''
+"""
+
+# Doctor notes are weighted above patient remarks when ranking
+_POSTGRES_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(sr.doctor_notes, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(q.additional_remarks, '')), 'B')"
+)
+_POSTGRES_HAS_TEXT = "(coalesce(q.additional_remarks, '') <> '' OR coalesce(sr.doctor_notes, '') <> '')"
+
+_POSTGRES_DDL = (
+    "CREATE TABLE IF NOT EXISTS case_search (questionnaire_id integer PRIMARY KEY, document tsvector NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS ix_case_search_document ON case_search USING gin (document)",
+    f"""
+    CREATE OR REPLACE FUNCTION case_search_refresh(case_id integer) RETURNS void LANGUAGE sql AS $$
+        DELETE FROM case_search WHERE questionnaire_id = case_id;
+        INSERT INTO case_search (questionnaire_id, document)
+        SELECT q.id, {_POSTGRES_DOCUMENT}
+        FROM questionnaires q LEFT JOIN screening_results sr ON sr.questionnaire_id = q.id
+        WHERE q.id = case_id AND {_POSTGRES_HAS_TEXT};
+    $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION case_search_questionnaire_changed() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        PERFORM case_search_refresh(CASE WHEN TG_OP = 'DELETE' THEN OLD.id ELSE NEW.id END);
+        RETURN NULL;
+    END $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION case_search_result_changed() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        PERFORM case_search_refresh(CASE WHEN TG_OP = 'DELETE' THEN OLD.questionnaire_id ELSE NEW.questionnaire_id END);
+        RETURN NULL;
+    END $$
+    """,
+    "DROP TRIGGER IF EXISTS case_search_questionnaire ON questionnaires",
+    """
+    CREATE TRIGGER case_search_questionnaire
+    AFTER INSERT OR DELETE OR UPDATE OF additional_remarks ON questionnaires
+    FOR EACH ROW EXECUTE FUNCTION case_search_questionnaire_changed()
+    """,
+    "DROP TRIGGER IF EXISTS case_search_result ON screening_results",
+    """
+    CREATE TRIGGER case_search_result
+    AFTER INSERT OR DELETE OR UPDATE OF doctor_notes ON screening_results
+    FOR EACH ROW EXECUTE FUNCTION case_search_result_changed()
+    """,
+)
+
+_POSTGRES_BACKFILL = f"""
+    INSERT INTO case_search (questionnaire_id, document)
+    SELECT q.id, {_POSTGRES_DOCUMENT}
+    FROM questionnaires q LEFT JOIN screening_results sr ON sr.questionnaire_id = q.id
+    WHERE {_POSTGRES_HAS_TEXT}
+"""
+
+
+def install_search_index(connection: Connection) -> bool:
+    """
+    Create the case_search index and its triggers if missing (idempotent)
+
+    The index is populated from existing rows only when it is first created.
+
+    Returns:
+        True if full-text search is available on this database
+    """
+    dialect = connection.dialect.name
+    existed = inspect(connection).has_table("case_search")
+
+    if dialect == "sqlite":
+        try:
+            connection.exec_driver_sql(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS case_search "
+                "USING fts5(additional_remarks, doctor_notes, tokenize = 'porter unicode61')"
+            )
+        except OperationalError:
+            logger.warning("SQLite was built without FTS5; case search falls back to LIKE scans")
+            return False
+        for name, (event, case_id) in _SQLITE_TRIGGERS.items():
+            connection.exec_driver_sql(
+                f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {_SQLITE_REFRESH.format(case_id=case_id)} END"
+            )
+        if not existed:
+            connection.exec_driver_sql(_SQLITE_BACKFILL)
+        return True
+
+    if dialect == "postgresql":
+        for statement in _POSTGRES_DDL:
+            connection.exec_driver_sql(statement)
+        if not existed:
+            connection.exec_driver_sql(_POSTGRES_BACKFILL)
+        return True
+
+    return False
+
+
+def search_terms(query: str) -> List[str]:
+    """Lowercased word terms of a search string, at most MAX_QUERY_TERMS"""
+    return _TERM.findall(query.lower())[:MAX_QUERY_TERMS]
+
+
+class SearchHit(NamedTuple):
+    questionnaire_id: int
+    score: float
+    snippet: str
+
+
+def _fts5_hits(db: Session, terms: List[str], limit: int, offset: int) -> List[SearchHit]:
+    # Every term must match; the last one as a prefix so partial words find results
+    match = " ".join(f'"{term}"' for term in terms) + "*"
+    rows = db.execute(
+        text(
+            "SELECT rowid, bm25(case_search, 1.0, 2.0) AS score, "
+            "snippet(case_search, -1, '[', ']', '…', 12) AS snippet "
+            "FROM case_search WHERE case_search MATCH :match "
+            "ORDER BY score LIMIT :limit OFFSET :offset"
+        ),
+        {"match": match, "limit": limit, "offset": offset},
+    ).all()
+    # bm25 is lower for better matches; report higher-is-better
+    return [SearchHit(row.rowid, round(-row.score, 4), row.snippet) for row in rows]
+
+
+def _tsvector_hits(db: Session, terms: List[str], limit: int, offset: int) -> List[SearchHit]:
+    tsquery = " & ".join(terms) + ":*"
+    rows = db.execute(
+        text(
+            "SELECT hits.questionnaire_id, hits.score, "
+            "ts_headline('english', concat_ws(' … ', sr.doctor_notes, q.additional_remarks), hits.query, "
+            "'StartSel=[, StopSel=], MaxFragments=2, MaxWords=12, MinWords=4') AS snippet "
+            "FROM ("
+            "  SELECT cs.questionnaire_id, ts_rank(cs.document, query) AS score, query "
+            "  FROM case_search cs, to_tsquery('english', :tsquery) query "
+            "  WHERE cs.document @@ query ORDER BY score DESC, cs.questionnaire_id LIMIT :limit OFFSET :offset"
+            ") hits "
+            "JOIN questionnaires q ON q.id = hits.questionnaire_id "
+            "LEFT JOIN screening_results sr ON sr.questionnaire_id = hits.questionnaire_id "
+            "ORDER BY hits.score DESC, hits.questionnaire_id"
+        ),
+        {"tsquery": tsquery, "limit": limit, "offset": offset},
+    ).all()
+    return [SearchHit(row.questionnaire_id, round(float(row.score), 4), row.snippet) for row in rows]
+
+
+def _like_hits(db: Session, terms: List[str], limit: int, offset: int) -> List[SearchHit]:
+    from_clause = "FROM questionnaires q LEFT JOIN screening_results sr ON sr.questionnaire_id = q.id"
+    conditions = " AND ".join(
+        f"(lower(coalesce(q.additional_remarks, '')) LIKE :term{index} "
+        f"OR lower(coalesce(sr.doctor_notes, '')) LIKE :term{index})"
+        for index in range(len(terms))
+    )
+    params: Dict[str, Any] = {f"term{index}": f"%{term}%" for index, term in enumerate(terms)}
+    rows = db.execute(
+        text(
+            f"SELECT q.id, coalesce(sr.doctor_notes, '') || ' ' || coalesce(q.additional_remarks, '') AS body "
+            f"{from_clause} WHERE {conditions} ORDER BY q.id DESC LIMIT :limit OFFSET :offset"
+        ),
+        {**params, "limit": limit, "offset": offset},
+    ).all()
+    return [SearchHit(row.id, 0.0, row.body.strip()[:160]) for row in rows]
+
+
+def search_cases(db: Session, query: str, limit: int, offset: int = 0) -> Optional[List[SearchHit]]:
+    """
+    Ranked page of cases matching every term of query
+
+    Returns:
+        Up to limit hits, best first, or None if query has no searchable terms
+    """
+    terms = search_terms(query)
+    if not terms:
+        return None
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return _tsvector_hits(db, terms, limit, offset)
+    if dialect == "sqlite" and inspect(db.connection()).has_table("case_search"):
+        return _fts5_hits(db, terms, limit, offset)
+    return _like_hits(db, terms, limit, offset)
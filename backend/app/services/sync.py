@@ -0,0 +1,136 @@
+"""
+Delta Sync
+Change feed behind GET /api/sync.
+
+Database triggers on questionnaires and screening_results record every
+insert, update and delete in sync_changes, replacing the entity's previous
+entry with one at a new, higher seq. A client sends the highest seq it has
+seen as its cursor and gets back only what changed since, so a refresh costs
+O(changes) whichever code path (ORM, bulk SQL, scripts) made them.
+
+Deleting a row (a patient deleting a draft) leaves a tombstone. Rows moved to
+the archive tables by the retention job are not deletions from a client's
+point of view: they keep their last entry and are served from the archive.
+
+On Postgres the trigger takes a transaction-level advisory lock before
+drawing a seq, so seqs become visible in commit order and a cursor can never
+skip a change committed late by a slower concurrent transaction.
+"""
+
+from typing import List, Optional
+
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.models.sync_change import SyncChange
+
+QUESTIONNAIRE = "questionnaire"
+SCREENING_RESULT = "screening_result"
+
+# Entity -> (live table, archive table)
+TRACKED_TABLES = {
+    QUESTIONNAIRE: ("questionnaires", "questionnaires_archive"),
+    SCREENING_RESULT: ("screening_results", "screening_results_archive"),
+}
+
+_SQLITE_RECORD = """
+    DELETE FROM sync_changes WHERE entity = '{entity}' AND entity_id = {row}.id;
+    INSERT INTO sync_changes (entity, entity_id, patient_id, deleted, changed_at)
+    VALUES ('{entity}', {row}.id, {row}.patient_id, {deleted}, CURRENT_TIMESTAMP);
+"""
+
+_POSTGRES_FUNCTION = """
+CREATE OR REPLACE FUNCTION sync_record_change() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    changed RECORD;
+    archived boolean := false;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        changed := OLD;
+        -- Rows moved to the archive by the retention job are not deletions
+        EXECUTE format('SELECT EXISTS (SELECT 1 FROM %I WHERE id = $1)', TG_ARGV[1]) INTO archived USING OLD.id;
+        IF archived THEN
+            RETURN NULL;
+        END IF;
+    ELSE
+        changed := NEW;
+    END IF;
+
+    -- Serialize change writers until commit so seqs become visible in order
+    PERFORM pg_advisory_xact_lock(hashtext('sync_changes'));
+    DELETE FROM sync_changes WHERE entity = TG_ARGV[0] AND entity_id = changed.id;
+    INSERT INTO sync_changes (entity, entity_id, patient_id, deleted, changed_at)
+    VALUES (TG_ARGV[0], changed.id, changed.patient_id, TG_OP = 'DELETE', now());
+    RETURN NULL;
+END $$
+"""
+
+_BACKFILL = """
+    INSERT INTO sync_changes (entity, entity_id, patient_id, deleted, changed_at)
+    SELECT '{entity}', id, patient_id, {false}, CURRENT_TIMESTAMP FROM {table} ORDER BY id
+"""
+
+
+def install_change_tracking(connection: Connection) -> bool:
+    """
+    Create the sync_changes triggers if missing (idempotent)
+
+    When sync_changes is empty, existing rows are entered once so that a
+    first sync (cursor 0) returns them.
+
+    Returns:
+        True if change tracking is available on this database
+    """
+    dialect = connection.dialect.name
+
+    if dialect == "sqlite":
+        for entity, (table, archive_table) in TRACKED_TABLES.items():
+            record_new = _SQLITE_RECORD.format(entity=entity, row="new", deleted=0)
+            record_old = _SQLITE_RECORD.format(entity=entity, row="old", deleted=1)
+            connection.exec_driver_sql(
+                f"CREATE TRIGGER IF NOT EXISTS sync_changes_{table}_insert AFTER INSERT ON {table} "
+                f"BEGIN {record_new} END"
+            )
+            connection.exec_driver_sql(
+                f"CREATE TRIGGER IF NOT EXISTS sync_changes_{table}_update AFTER UPDATE ON {table} "
+                f"BEGIN {record_new} END"
+            )
+            connection.exec_driver_sql(
+                f"CREATE TRIGGER IF NOT EXISTS sync_changes_{table}_delete AFTER DELETE ON {table} "
+                f"WHEN NOT EXISTS (SELECT 1 FROM {archive_table} WHERE id = old.id) "
+                f"BEGIN {record_old} END"
+            )
+        false = "0"
+    elif dialect == "postgresql":
+        connection.exec_driver_sql(_POSTGRES_FUNCTION)
+        for entity, (table, archive_table) in TRACKED_TABLES.items():
+            connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS sync_changes_{table} ON {table}")
+            connection.exec_driver_sql(
+                f"CREATE TRIGGER sync_changes_{table} AFTER INSERT OR UPDATE OR DELETE ON {table} "
+                f"FOR EACH ROW EXECUTE FUNCTION sync_record_change('{entity}', '{archive_table}')"
+            )
+        false = "false"
+    else:
+        return False
+
+    if connection.exec_driver_sql("SELECT 1 FROM sync_changes LIMIT 1").first() is None:
+        for entity, (table, _) in TRACKED_TABLES.items():
+            connection.exec_driver_sql(_BACKFILL.format(entity=entity, table=table, false=false))
+    return True
+
+
+def read_changes(db: Session, since: int, limit: int, patient_id: Optional[int] = None) -> List[SyncChange]:
+    """
+    Changes after cursor since, oldest first
+
+    Args:
+        db: Database session
+        since: Highest seq the client has already seen (0 for a first sync)
+        limit: Maximum number of changes
+        patient_id: Only this patient's changes (patients' own feeds)
+    """
+    query = db.query(SyncChange).filter(SyncChange.seq > since)
+    if patient_id is not None:
+        query = query.filter(SyncChange.patient_id == patient_id)
+    return query.order_by(SyncChange.seq).limit(limit).all()
+
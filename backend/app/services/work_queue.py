@@ -0,0 +1,111 @@
+"""
+Doctor Work Queue
+Hands pending screening results to doctors through short-lived claims (leases)
+so that several doctors on shift never review the same case at once.
+
+On PostgreSQL candidates are locked with SELECT ... FOR UPDATE SKIP LOCKED, so
+concurrent claimers skip each other's rows instead of blocking. SQLite has no
+row locks; there the claiming UPDATE re-checks the claimable predicate
+(compare-and-set) and rows taken by a concurrent claimer are simply skipped.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.screening_result import ScreeningResult
+
+# Rounds of candidate selection before returning fewer than requested
+_MAX_CLAIM_ROUNDS = 3
+
+
+def pending_and_unclaimed(now: datetime):
+    """Pending results with no live claim"""
+    return and_(
+        ScreeningResult.doctor_selected_medication.is_(None),
+        or_(
+            ScreeningResult.claimed_by_doctor_id.is_(None),
+            ScreeningResult.claim_expires_at < now,
+        ),
+    )
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Naive values are UTC (utcnow); PostgreSQL hands back aware ones"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def claim_is_held_by_other(result: ScreeningResult, doctor_id: int, now: datetime) -> bool:
+    """True if another doctor holds a live claim on the result"""
+    return (
+        result.claimed_by_doctor_id is not None
+        and result.claimed_by_doctor_id != doctor_id
+        and result.claim_expires_at is not None
+        and _as_utc(result.claim_expires_at) > _as_utc(now)
+    )
+
+
+def claim_pending_results(db: Session, doctor_id: int, limit: int) -> List[ScreeningResult]:
+    """
+    Claim up to limit of the oldest pending results for a doctor
+
+    Args:
+        db: Database session
+        doctor_id: Claiming doctor
+        limit: Maximum number of results to claim
+
+    Returns:
+        The newly claimed results, oldest first
+    """
+    now = datetime.utcnow()
+    # Unique per call, so the claimed rows can be read back precisely
+    expires_at = now + timedelta(seconds=settings.CLAIM_LEASE_SECONDS)
+    claimed = 0
+
+    for _ in range(_MAX_CLAIM_ROUNDS):
+        wanted = limit - claimed
+        if wanted <= 0:
+            break
+
+        candidate_ids = [
+            row.id for row in db.query(ScreeningResult.id)
+            .filter(pending_and_unclaimed(now))
+            .order_by(ScreeningResult.created_at, ScreeningResult.id)
+            .limit(wanted)
+            .with_for_update(skip_locked=True)
+        ]
+        if not candidate_ids:
+            break
+
+        claimed += db.query(ScreeningResult).filter(
+            ScreeningResult.id.in_(candidate_ids),
+            pending_and_unclaimed(now)
+        ).update({
+            ScreeningResult.claimed_by_doctor_id: doctor_id,
+            ScreeningResult.claim_expires_at: expires_at,
+        }, synchronize_session=False)
+
+    db.commit()
+
+    return db.query(ScreeningResult).filter(
+        ScreeningResult.claimed_by_doctor_id == doctor_id,
+        ScreeningResult.claim_expires_at == expires_at
+    ).order_by(ScreeningResult.created_at, ScreeningResult.id).all()
+
+
+def release_claim(db: Session, screening_id: int, doctor_id: int) -> bool:
+    """Give back a claim held by the doctor; returns False if they did not hold it"""
+    released = db.query(ScreeningResult).filter(
+        ScreeningResult.id == screening_id,
+        ScreeningResult.claimed_by_doctor_id == doctor_id
+    ).update({
+        ScreeningResult.claimed_by_doctor_id: None,
+        ScreeningResult.claim_expires_at: None,
+    }, synchronize_session=False)
+    db.commit()
+    return released == 1
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Archive Reviewed Cases
+Moves questionnaires reviewed more than ARCHIVE_REVIEWED_AFTER_DAYS ago, with
+their screening results, from the live tables into the archive tables.
+
+Archived results are still served by GET /api/screening/results/{id}.
+Schedule it (e.g. nightly cron); it is safe to interrupt and re-run.
+
+Run: python archive_reviewed.py [--days N] [--batch-size N] [--max-batches N] [--vacuum]
+"""
+import argparse
+
+from app.core.config import settings
+from app.db.session import SessionLocal, engine, Base
+import app.models  # noqa: F401 - register the tables
+from app.services.retention import archive_reviewed, database_usage, vacuum
+
+
+def _mb(value):
+    return "n/a" if value is None else f"{value / (1024 * 1024):.2f} MB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive reviewed questionnaires and screening results")
+    parser.add_argument("--days", type=int, default=settings.ARCHIVE_REVIEWED_AFTER_DAYS,
+                        help="Archive cases reviewed more than this many days ago")
+    parser.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE,
+                        help="Questionnaires moved per transaction")
+    parser.add_argument("--max-batches", type=int, default=None, help="Stop after this many batches")
+    parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches")
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM afterwards to release the freed space")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    try:
+        print(f"🗄️ Archiving cases reviewed more than {args.days} days ago...")
+        report = archive_reviewed(db, args.days, args.batch_size, args.max_batches, args.pause)
+        print(f"✅ Archived {report.questionnaires} questionnaires and "
+              f"{report.screening_results} screening results in {report.batches} batch(es)")
+        print(f"   Live data: {_mb(report.bytes_before)} → {_mb(report.bytes_after)} "
+              f"(reclaimed {_mb(report.reclaimed_bytes)})")
+
+        if args.vacuum:
+            db.close()
+            vacuum(engine)
+            db = SessionLocal()
+            print(f"✅ Vacuumed; live data now {_mb(database_usage(db))}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
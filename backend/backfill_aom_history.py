@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Backfill Parsed AOM History
+Parses previous_aom_history into previous_aom_entries for every questionnaire
+that has one, live or archived (new answers are parsed when they are saved).
+
+Rows are read in id order and parsed in parallel chunks by a process pool;
+at most two chunks per worker are in flight, and each parsed chunk is written
+back in its own transaction. Only rows whose parsed entries changed are
+written, so the sync triggers do not force clients into a full resync.
+Re-running it is safe, e.g. after the parser changes.
+
+Run: python backfill_aom_history.py [--chunk-size N] [--workers N]
+"""
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from app.db.session import SessionLocal
+from app.models.archive import QuestionnaireArchive
+from app.models.questionnaire import Questionnaire
+from app.services.aom_history import parse_chunk
+
+# Live rows first, then the reviewed cases moved out by the retention job
+TABLES = (Questionnaire, QuestionnaireArchive)
+
+
+def read_chunks(db, model, chunk_size):
+    """(id, previous_aom_history, previous_aom_entries) rows of model in id order, chunk_size at a time"""
+    last_id = 0
+    while True:
+        rows = (
+            db.query(model.id, model.previous_aom_history, model.previous_aom_entries)
+            .filter(model.id > last_id, model.previous_aom_history.isnot(None))
+            .order_by(model.id)
+            .limit(chunk_size)
+            .all()
+        )
+        if not rows:
+            return
+        last_id = rows[-1].id
+        yield rows
+
+
+def write_chunk(db, model, parsed, stored):
+    """Save the parsed entries that differ from the stored ones; returns rows written"""
+    changed = [mapping for mapping in parsed if mapping["previous_aom_entries"] != stored[mapping["id"]]]
+    if changed:
+        db.bulk_update_mappings(model, changed)
+        db.commit()
+    return len(changed)
+
+
+def backfill_table(db, model, pool: Executor, chunk_size, workers):
+    """Parse one table's answers in the pool; returns (rows read, rows written)"""
+    read = written = 0
+    in_flight = deque()
+    for rows in read_chunks(db, model, chunk_size):
+        read += len(rows)
+        stored = {row.id: row.previous_aom_entries for row in rows}
+        in_flight.append((pool.submit(parse_chunk, [(row.id, row.previous_aom_history) for row in rows]), stored))
+        if len(in_flight) < 2 * workers:
+            continue
+        future, chunk_entries = in_flight.popleft()
+        written += write_chunk(db, model, future.result(), chunk_entries)
+
+    while in_flight:
+        future, chunk_entries = in_flight.popleft()
+        written += write_chunk(db, model, future.result(), chunk_entries)
+    return read, written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse previous_aom_history for existing questionnaires")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Questionnaires per chunk")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Parser processes")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            for model in TABLES:
+                read, written = backfill_table(db, model, pool, args.chunk_size, args.workers)
+                print(f"✅ {model.__table__.name}: parsed {read} answers, {written} changed")
+    finally:
+        db.close()
+
+    print(f"✅ Parsed previous AOM history in {time.perf_counter() - started:.1f}s ({args.workers} workers)")
+
+if __name__ == "__main__":
+    main()
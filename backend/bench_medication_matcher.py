@@ -0,0 +1,66 @@
+"""
+Benchmark for the medication interaction stage
+Shows that matching current_medications costs the same whether the synonym
+dictionary holds the bundled entries or many thousands of them.
+
+Run: python bench_medication_matcher.py [repeats]
+"""
+
+import sys
+import time
+
+from app.services.medication_matcher import MedicationMatcher, load_synonyms
+from app.services.screening_service import ScreeningService
+
+ROUNDS = 5
+MEDICATIONS = ["Nolvadex 20mg daily", "Metformin 500mg twice daily", "Lisinopril 10mg", "Ozempic 1mg weekly"]
+
+
+def timed(fn, repeats):
+    """Best-of-ROUNDS microseconds per call"""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            fn()
+        best = min(best, (time.perf_counter() - start) / repeats)
+    return best * 1e6
+
+
+def padded_synonyms(extra):
+    """The bundled dictionary plus extra synthetic ingredients"""
+    synonyms = dict(load_synonyms())
+    for index in range(extra):
+        synonyms[f"ingredient{index}"] = [f"brand{index}", f"brand{index} xr"]
+    return synonyms
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    print("=" * 80)
+    print(f"MEDICATION MATCHER BENCHMARK ({len(MEDICATIONS)} entries per screening, best of {ROUNDS})")
+    print("=" * 80 + "\n")
+
+    for extra in (0, 1_000, 10_000, 50_000):
+        started = time.perf_counter()
+        matcher = MedicationMatcher(padded_synonyms(extra))
+        build_ms = (time.perf_counter() - started) * 1000
+        per_screening = timed(lambda: matcher.find_all(MEDICATIONS), repeats)
+        print(f"{len(padded_synonyms(extra)):>7} ingredients  {matcher.states:>8} states  "
+              f"build {build_ms:8.1f} ms  match {per_screening:6.1f} µs/screening")
+
+    screener = ScreeningService()
+    sample = {
+        "height_ft": 5, "height_in": 6, "weight_lb": 230,
+        "eating_habits": ["excessive_appetite"],
+        "health_conditions": ["hypertension"],
+        "condition_control_status": {"hypertension": "controlled"},
+    }
+    without = timed(lambda: screener.run_screening(sample), repeats)
+    with_meds = timed(lambda: screener.run_screening({**sample, "current_medications": MEDICATIONS}), repeats)
+    print(f"\nrun_screening: {without:.1f} µs without medications, {with_meds:.1f} µs with {len(MEDICATIONS)} listed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark for negotiated response formats
+Compares payload size and encode time of JSON and MessagePack, plain and
+compressed, for a single screening result (GET /api/screening/results/{id})
+and a page of pending results (GET /api/screening/pending).
+
+Run: python bench_response_formats.py [rows]
+"""
+
+import sys
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import Base
+from app.models import ScreeningResult
+from app.schemas.screening import ScreeningResultResponse
+from app.core.responses import brotli, compress, msgpack, orjson, render_json, render_msgpack, rows_as_dicts, schema_columns
+from bench_serialization import seed
+
+ROUNDS = 5
+
+
+def timed(fn):
+    """Best-of-N wall time in seconds"""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def formats():
+    """Format name -> encoder producing the bytes sent to the client"""
+    encoders = {
+        "JSON": render_json,
+        "JSON + gzip": lambda content: compress(render_json(content), "gzip"),
+    }
+    if brotli is not None:
+        encoders["JSON + br"] = lambda content: compress(render_json(content), "br")
+    if msgpack is not None:
+        encoders["MessagePack"] = render_msgpack
+        encoders["MessagePack + gzip"] = lambda content: compress(render_msgpack(content), "gzip")
+        if brotli is not None:
+            encoders["MessagePack + br"] = lambda content: compress(render_msgpack(content), "br")
+    return encoders
+
+
+def report(name, content):
+    print(f"{name}")
+    print(f"   {'format':<22}{'bytes':>10}{'vs JSON':>10}{'encode':>14}")
+    baseline = None
+    for label, encode in formats().items():
+        size = len(encode(content))
+        baseline = baseline or size
+        seconds = timed(lambda: encode(content))
+        print(f"   {label:<22}{size:>10}{size / baseline:>9.1%}{seconds * 1e6:>11.1f} µs")
+    print()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    seed(session, count)
+
+    columns = schema_columns(ScreeningResult, ScreeningResultResponse)
+    page = rows_as_dicts(session.query(*columns).limit(count).all())
+
+    print("=" * 80)
+    print(
+        f"RESPONSE FORMAT BENCHMARK (best of {ROUNDS}, encoder: {'orjson' if orjson else 'json'}, "
+        f"msgpack: {'yes' if msgpack else 'missing'}, brotli: {'yes' if brotli else 'missing'})"
+    )
+    print("=" * 80 + "\n")
+
+    report("GET /api/screening/results/{id} (1 result)", page[0])
+    report(f"GET /api/screening/pending ({count} results)", page)
+
+
+if __name__ == "__main__":
+    main()
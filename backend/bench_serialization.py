@@ -0,0 +1,126 @@
+"""
+Benchmark for list endpoint serialization
+Compares the ORM + Pydantic path with the column-tuple + FastJSONResponse path
+used by GET /api/questionnaires and GET /api/screening/pending.
+
+Run: python bench_serialization.py [rows]
+"""
+
+import sys
+import time
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import Base
+from app.models import Questionnaire, QuestionnaireStatus, ScreeningResult
+from app.schemas.questionnaire import QuestionnaireListResponse
+from app.schemas.screening import ScreeningResultResponse
+from app.core.responses import rows_as_dicts, render_json, schema_columns, orjson
+from app.services.screening_service import ScreeningService
+
+ROUNDS = 5
+
+
+def seed(session, count):
+    """Insert screened questionnaires into an in-memory database"""
+    screener = ScreeningService()
+    sample = {
+        "height_ft": 5, "height_in": 6, "weight_lb": 230,
+        "eating_habits": ["excessive_appetite", "emotional_eating"],
+        "health_conditions": ["hypertension", "glaucoma", "psychiatric_treatment"],
+        "condition_control_status": {"hypertension": "controlled"},
+    }
+    screening = screener.run_screening(sample)
+    for i in range(count):
+        questionnaire = Questionnaire(
+            patient_id=i, status=QuestionnaireStatus.SUBMITTED, age=40, gender="female",
+            height_ft=5, height_in=6, weight_lb=230, bmi=screening["bmi"],
+            eating_habits=sample["eating_habits"], health_conditions=sample["health_conditions"],
+            condition_control_status=sample["condition_control_status"],
+            current_medications=["Lisinopril 10mg", "Metformin 500mg"], has_drug_allergies=False,
+            additional_remarks="Knee pain limits exercise. " * 20, submitted_at=datetime.utcnow(),
+        )
+        session.add(questionnaire)
+        session.flush()
+        session.add(ScreeningResult(
+            questionnaire_id=questionnaire.id, patient_id=i, is_eligible=True,
+            eligibility_message=screening["eligibility_message"], age=40, gender="female",
+            bmi_category=screening["bmi_category"],
+            initial_drug_pool=[d.value for d in screening["initial_drug_pool"]],
+            excluded_drugs={k.value: v for k, v in screening["absolute_exclusions"].items()},
+            absolute_exclusions={k.value: v for k, v in screening["absolute_exclusions"].items()},
+            relative_warnings={k.value: v for k, v in screening["relative_warnings"].items()},
+            recommended_drugs=[{**d, "medication": d["medication"].value} for d in screening["recommended_drugs"]],
+            screening_logic=screening["screening_steps"], warnings=screening["warnings"],
+        ))
+    session.commit()
+
+
+def timed(fn):
+    """Best-of-N wall time in seconds"""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(name, count, before, after):
+    print(f"{name}")
+    print(f"   ORM + Pydantic + json:    {before / count * 1e6:8.2f} µs/item")
+    print(f"   Columns + FastJSON:       {after / count * 1e6:8.2f} µs/item")
+    print(f"   Speed-up:                 {before / after:8.2f}x\n")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    seed(session, count)
+
+    def legacy(model, schema, query_filter=None):
+        def run():
+            session.expunge_all()
+            query = session.query(model)
+            if query_filter is not None:
+                query = query.filter(query_filter)
+            items = [schema.model_validate(obj) for obj in query.limit(count).all()]
+            JSONResponse(jsonable_encoder(items))
+        return run
+
+    def fast(schema, model, query_filter=None):
+        columns = schema_columns(model, schema)
+        def run():
+            query = session.query(*columns)
+            if query_filter is not None:
+                query = query.filter(query_filter)
+            render_json(rows_as_dicts(query.limit(count).all()))
+        return run
+
+    print("=" * 80)
+    print(f"LIST SERIALIZATION BENCHMARK ({count} rows, best of {ROUNDS}, encoder: {'orjson' if orjson else 'json'})")
+    print("=" * 80 + "\n")
+
+    report(
+        "GET /api/questionnaires",
+        count,
+        timed(legacy(Questionnaire, QuestionnaireListResponse)),
+        timed(fast(QuestionnaireListResponse, Questionnaire)),
+    )
+    pending = ScreeningResult.doctor_selected_medication.is_(None)
+    report(
+        "GET /api/screening/pending",
+        count,
+        timed(legacy(ScreeningResult, ScreeningResultResponse, pending)),
+        timed(fast(ScreeningResultResponse, ScreeningResult, pending)),
+    )
+
+
+if __name__ == "__main__":
+    main()
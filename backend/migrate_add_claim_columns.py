@@ -0,0 +1,36 @@
+"""
+Migration script to add work queue claim columns to screening_results table
+"""
+
+import sqlite3
+from pathlib import Path
+
+# Database path
+DB_PATH = Path(__file__).parent / "aom_screening.db"
+
+def migrate():
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+
+    try:
+        # Add claim columns (used by POST /api/screening/claim)
+        for column, definition in (
+            ("claimed_by_doctor_id", "INTEGER REFERENCES users(id)"),
+            ("claim_expires_at", "DATETIME"),
+        ):
+            try:
+                cursor.execute(f"ALTER TABLE screening_results ADD COLUMN {column} {definition}")
+                print(f"✅ Added '{column}' column to screening_results table")
+            except sqlite3.OperationalError as e:
+                if "duplicate column name" in str(e).lower():
+                    print(f"ℹ️ Column '{column}' already exists, skipping")
+                else:
+                    raise e
+
+        conn.commit()
+        print("✅ Migration completed successfully!")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,61 @@
+"""
+Migration script to add health_conditions_mask and eating_habits_mask columns
+to the questionnaires and questionnaires_archive tables and backfill them from
+the JSON lists
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+
+from app.core.condition_codes import encode_eating_habits, encode_health_conditions
+
+# Database path
+DB_PATH = Path(__file__).parent / "aom_screening.db"
+
+def migrate():
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+
+    try:
+        tables = {row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        for table in ("questionnaires", "questionnaires_archive"):
+            if table not in tables:
+                print(f"ℹ️ Table '{table}' does not exist yet, skipping")
+                continue
+
+            # Bitset columns (bit positions defined in app/core/condition_codes.py)
+            for column in ("health_conditions_mask", "eating_habits_mask"):
+                try:
+                    cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} BIGINT")
+                    print(f"✅ Added '{column}' column to {table} table")
+                except sqlite3.OperationalError as e:
+                    if "duplicate column name" in str(e).lower():
+                        print(f"ℹ️ Column '{column}' already exists in {table}, skipping")
+                    else:
+                        raise e
+                # A B-tree index cannot serve "mask & bits" predicates; drop the ones earlier runs created
+                cursor.execute(f"DROP INDEX IF EXISTS ix_{table}_{column}")
+
+            # Backfill from the JSON lists
+            rows = cursor.execute(f"SELECT id, health_conditions, eating_habits FROM {table}").fetchall()
+            cursor.executemany(
+                f"UPDATE {table} SET health_conditions_mask = ?, eating_habits_mask = ? WHERE id = ?",
+                [
+                    (
+                        encode_health_conditions(json.loads(conditions) if conditions else []),
+                        encode_eating_habits(json.loads(habits) if habits else []),
+                        questionnaire_id,
+                    )
+                    for questionnaire_id, conditions, habits in rows
+                ]
+            )
+            print(f"✅ Backfilled bitsets for {len(rows)} rows in {table}")
+
+        conn.commit()
+        print("✅ Migration completed successfully!")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    migrate()
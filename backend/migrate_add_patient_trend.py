@@ -0,0 +1,64 @@
+"""
+Migration script to create the patient_trend_points table and backfill it
+from questionnaires already submitted by registered patients, including
+archived ones, with the medication their doctor selected
+"""
+
+from app.db.session import SessionLocal, engine
+import app.models  # noqa: F401 - register the tables
+from app.models.archive import QuestionnaireArchive, ScreeningResultArchive
+from app.models.patient_trend import PatientTrendPoint
+from app.models.questionnaire import Questionnaire
+from app.models.screening_result import ScreeningResult
+from app.services.patient_trend import record_selections, record_submission
+
+BATCH_SIZE = 1000
+
+def backfill(db, questionnaire_model, result_model):
+    """Add trend points for submitted questionnaires that have none yet"""
+    added = 0
+    last_id = 0
+    while True:
+        questionnaires = (
+            db.query(questionnaire_model)
+            .filter(
+                questionnaire_model.id > last_id,
+                questionnaire_model.patient_id.isnot(None),
+                questionnaire_model.submitted_at.isnot(None),
+                ~questionnaire_model.id.in_(db.query(PatientTrendPoint.questionnaire_id)),
+            )
+            .order_by(questionnaire_model.id)
+            .limit(BATCH_SIZE)
+            .all()
+        )
+        if not questionnaires:
+            return added
+        last_id = questionnaires[-1].id
+
+        for questionnaire in questionnaires:
+            record_submission(db, questionnaire)
+        db.flush()
+
+        selections = db.query(result_model.questionnaire_id, result_model.doctor_selected_medication).filter(
+            result_model.questionnaire_id.in_([questionnaire.id for questionnaire in questionnaires]),
+            result_model.doctor_selected_medication.isnot(None),
+        ).all()
+        record_selections(db, dict(selections))
+        db.commit()
+        added += len(questionnaires)
+
+def migrate():
+    PatientTrendPoint.__table__.create(bind=engine, checkfirst=True)
+    print("✅ patient_trend_points table ready")
+
+    db = SessionLocal()
+    try:
+        added = backfill(db, Questionnaire, ScreeningResult)
+        added += backfill(db, QuestionnaireArchive, ScreeningResultArchive)
+        print(f"✅ Backfilled {added} trend points")
+        print("✅ Migration completed successfully!")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    migrate()
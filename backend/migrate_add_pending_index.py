@@ -0,0 +1,31 @@
+"""
+Migration script to add the pending-queue partial index to screening_results table
+(the archive tables are created automatically on startup)
+"""
+
+import sqlite3
+from pathlib import Path
+
+# Database path
+DB_PATH = Path(__file__).parent / "aom_screening.db"
+
+def migrate():
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+
+    try:
+        # Partial index backing the doctor queue (WHERE doctor_selected_medication IS NULL)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS ix_screening_results_pending
+            ON screening_results (created_at)
+            WHERE doctor_selected_medication IS NULL
+        """)
+        print("✅ Added 'ix_screening_results_pending' index to screening_results table")
+
+        conn.commit()
+        print("✅ Migration completed successfully!")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,40 @@
+"""
+Migration script to add the previous_aom_entries column (parsed
+previous_aom_history) to the questionnaires and questionnaires_archive tables
+
+Existing rows are parsed afterwards by backfill_aom_history.py.
+"""
+
+import sqlite3
+from pathlib import Path
+
+# Database path
+DB_PATH = Path(__file__).parent / "aom_screening.db"
+
+def migrate():
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+
+    try:
+        tables = {row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        for table in ("questionnaires", "questionnaires_archive"):
+            if table not in tables:
+                print(f"ℹ️ Table '{table}' does not exist yet, skipping")
+                continue
+            try:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN previous_aom_entries JSON")
+                print(f"✅ Added 'previous_aom_entries' column to {table} table")
+            except sqlite3.OperationalError as e:
+                if "duplicate column name" in str(e).lower():
+                    print(f"ℹ️ Column 'previous_aom_entries' already exists in {table}, skipping")
+                else:
+                    raise e
+
+        conn.commit()
+        print("✅ Migration completed successfully!")
+        print("➡️ Run backfill_aom_history.py to parse existing answers")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    migrate()
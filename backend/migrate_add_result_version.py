@@ -0,0 +1,35 @@
+"""
+Migration script to add version column to screening_results table
+"""
+
+import sqlite3
+from pathlib import Path
+
+# Database path
+DB_PATH = Path(__file__).parent / "aom_screening.db"
+
+def migrate():
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+
+    try:
+        # Add version column (drives the ETag on GET /api/screening/results/{id})
+        cursor.execute("""
+            ALTER TABLE screening_results
+            ADD COLUMN version INTEGER NOT NULL DEFAULT 1
+        """)
+        print("✅ Added 'version' column to screening_results table")
+
+        conn.commit()
+        print("✅ Migration completed successfully!")
+
+    except sqlite3.OperationalError as e:
+        if "duplicate column name" in str(e).lower():
+            print("ℹ️ Column 'version' already exists, skipping")
+        else:
+            raise e
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    migrate()
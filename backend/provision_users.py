@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Provision Users
+Creates patient and doctor accounts in bulk, e.g. when onboarding a clinic.
+
+The input is a CSV file with a header row (email, password, full_name, role
+and optionally phone_number), a JSON array or NDJSON of the same fields.
+Invalid rows and already registered emails are reported and skipped, so
+re-running the same file is safe. Passwords are hashed by a process pool and
+accounts are committed in chunks.
+
+Run: python provision_users.py users.csv [--workers N] [--chunk-size N]
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+from pydantic import ValidationError
+
+from app.db.session import SessionLocal
+from app.schemas.user import UserCreate
+from app.services.provisioning import provision_users
+
+
+def read_records(path):
+    """Raw records from a CSV, JSON array or NDJSON file"""
+    with open(path, encoding="utf-8-sig", newline="") as handle:
+        if path.lower().endswith(".csv"):
+            return [
+                {field: value for field, value in row.items() if value not in (None, "")}
+                for row in csv.DictReader(handle)
+            ]
+        text = handle.read()
+    if text.lstrip().startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create user accounts in bulk")
+    parser.add_argument("path", help="CSV, JSON or NDJSON file of users")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Password hashing processes")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Users inserted per transaction")
+    args = parser.parse_args()
+
+    users = []
+    invalid = 0
+    for line, record in enumerate(read_records(args.path), start=1):
+        try:
+            users.append(UserCreate.model_validate(record))
+        except ValidationError as exc:
+            invalid += 1
+            errors = "; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in exc.errors())
+            print(f"⚠️  Record {line}: {errors}", file=sys.stderr)
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        outcomes = provision_users(db, users, args.workers, args.chunk_size)
+    finally:
+        db.close()
+
+    counts = {}
+    for outcome in outcomes:
+        counts[outcome["status"]] = counts.get(outcome["status"], 0) + 1
+
+    print(f"✅ Created {counts.get('created', 0)} users in {time.perf_counter() - started:.1f}s "
+          f"({args.workers} workers)")
+    print(f"   Already registered: {counts.get('exists', 0)}, "
+          f"repeated in file: {counts.get('duplicate', 0)}, invalid: {invalid}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Background Screening Worker
+Processes queued screening jobs in a separate process.
+
+Use with SCREENING_JOBS_ENABLED=true and SCREENING_WORKERS=0 on the API so
+screening runs only here. Several workers can share the same database queue.
+
+Run: python screening_worker.py [threads]
+"""
+import logging
+import signal
+import sys
+import threading
+
+from app.core.config import settings
+from app.db.session import engine, Base
+from app.models import ScreeningJob  # noqa: F401 - register the table
+from app.services.screening_jobs import ScreeningWorkerPool
+
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else max(settings.SCREENING_WORKERS, 1)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    Base.metadata.create_all(bind=engine)
+
+    pool = ScreeningWorkerPool(threads, settings.SCREENING_JOB_POLL_SECONDS)
+    stopped = threading.Event()
+
+    def shutdown(signum, frame):
+        print("🛑 Stopping screening workers...")
+        stopped.set()
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    print(f"🔄 Screening worker started with {threads} thread(s)")
+    pool.start()
+    stopped.wait()
+    pool.stop()
+    print("✅ Screening workers stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -53,9 +53,9 @@ def test_eligible_patient():
     for step in result['screening_steps']:
         print(f"   {step['step']}: {step['result']}")
 
-    if result['excluded_drugs']:
+    if result['absolute_exclusions']:
         print(f"\n❌ EXCLUDED MEDICATIONS:")
-        for drug, reason in result['excluded_drugs'].items():
+        for drug, reason in result['absolute_exclusions'].items():
             print(f"   - {drug}: {reason}")
 
     if result['recommended_drugs']:
@@ -146,9 +146,9 @@ def test_patient_with_contraindications():
     for step in result['screening_steps']:
         print(f"   {step['step']}: {step['result']}")
 
-    if result['excluded_drugs']:
-        print(f"\n❌ EXCLUDED MEDICATIONS ({len(result['excluded_drugs'])} total):")
-        for drug, reason in result['excluded_drugs'].items():
+    if result['absolute_exclusions']:
+        print(f"\n❌ EXCLUDED MEDICATIONS ({len(result['absolute_exclusions'])} total):")
+        for drug, reason in result['absolute_exclusions'].items():
             print(f"   - {drug}: {reason}")
 
     if result['recommended_drugs']:
@@ -0,0 +1,114 @@
+"""
+Shared fixtures: the app on a throwaway SQLite database, users and submitted questionnaires
+
+Settings are read when app.core.config is first imported, so the environment
+is prepared here before anything from app is imported.
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+import uuid
+
+import pytest
+
+_DB_DIR = tempfile.mkdtemp(prefix="aom-tests-")
+atexit.register(shutil.rmtree, _DB_DIR, ignore_errors=True)
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/test.db"
+os.environ["ENVIRONMENT"] = "test"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.security import create_access_token, get_password_hash  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.user import User, UserRole  # noqa: E402
+
+QUESTIONNAIRE = {
+    "age": 40,
+    "gender": "female",
+    "is_childbearing_age_woman": False,
+    "height_ft": 5,
+    "height_in": 4,
+    "weight_lb": 210,
+    "eating_habits": ["emotional_eating"],
+    "health_conditions": ["hypertension"],
+    "has_drug_allergies": False,
+}
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def create_user(role: UserRole) -> User:
+    """A fresh active user with the given role"""
+    session = SessionLocal()
+    try:
+        user = User(
+            email=f"{role.value}-{uuid.uuid4().hex[:12]}@example.com",
+            hashed_password=get_password_hash("secret-password"),
+            full_name=f"Test {role.value}",
+            role=role,
+            is_active=1,
+        )
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        session.expunge(user)
+        return user
+    finally:
+        session.close()
+
+
+def auth_headers(user: User) -> dict:
+    token = create_access_token(data={"sub": user.email, "user_id": user.id, "role": user.role.value})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def doctor_headers():
+    return auth_headers(create_user(UserRole.DOCTOR))
+
+
+@pytest.fixture
+def patient():
+    return create_user(UserRole.PATIENT)
+
+
+@pytest.fixture
+def admin_headers():
+    return auth_headers(create_user(UserRole.ADMIN))
+
+
+def submit_questionnaire(client: TestClient, **overrides) -> int:
+    """Create and submit an anonymous questionnaire; returns its id"""
+    response = client.post("/api/questionnaires/anonymous", json={**QUESTIONNAIRE, **overrides})
+    assert response.status_code == 201, response.text
+    questionnaire_id = response.json()["id"]
+    response = client.post(f"/api/questionnaires/{questionnaire_id}/submit")
+    assert response.status_code == 200, response.text
+    return questionnaire_id
+
+
+def screening_result(client: TestClient, **overrides) -> dict:
+    """The stored screening result of a freshly submitted questionnaire"""
+    questionnaire_id = submit_questionnaire(client, **overrides)
+    response = client.get(f"/api/screening/results/{questionnaire_id}")
+    if response.status_code == 404:
+        response = client.post(f"/api/screening/run/{questionnaire_id}")
+    assert response.status_code in (200, 201), response.text
+    return response.json()
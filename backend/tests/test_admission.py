@@ -0,0 +1,57 @@
+"""Admission control classification and the admin-only metrics endpoint"""
+
+from jose import jwt
+
+from app.core.admission import ANONYMOUS, BULK, CLINICIAN, PATIENT, admission_controller
+from app.core.security import decode_access_token, token_cache
+from app.models.user import UserRole
+from tests.conftest import auth_headers, create_user
+
+
+def _classify(path: str, headers: dict = None) -> str:
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "headers": [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()],
+    }
+    admission_class = admission_controller.classify(scope)
+    return admission_class.name if admission_class else None
+
+
+def test_verified_doctor_token_is_clinician():
+    headers = auth_headers(create_user(UserRole.DOCTOR))
+    decode_access_token(headers["Authorization"].split(" ", 1)[1])
+    assert _classify("/api/screening/pending", headers) == CLINICIAN
+
+
+def test_classification_does_not_verify_tokens(monkeypatch):
+    headers = auth_headers(create_user(UserRole.DOCTOR))
+    token_cache.clear()
+    calls = []
+    monkeypatch.setattr(jwt, "decode", lambda *args, **kwargs: calls.append(args))
+
+    # Not yet verified by this process: prioritized as a patient at most
+    assert _classify("/api/screening/pending", headers) == PATIENT
+    assert calls == []
+
+
+def test_forged_clinician_token_is_not_prioritized():
+    forged = jwt.encode({"sub": "x@example.com", "user_id": 1, "role": "doctor", "exp": 4102444800},
+                        "not-the-secret", algorithm="HS256")
+    assert _classify("/api/screening/pending", {"Authorization": f"Bearer {forged}"}) == PATIENT
+    assert _classify("/api/screening/pending", {"Authorization": "Bearer garbage"}) == ANONYMOUS
+    assert _classify("/api/screening/pending") == ANONYMOUS
+
+
+def test_bulk_and_exempt_paths():
+    assert _classify("/api/questionnaires/bulk") == BULK
+    assert _classify("/health") is None
+
+
+def test_metrics_requires_an_administrator(client, doctor_headers, admin_headers):
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers=doctor_headers).status_code == 403
+    response = client.get("/metrics", headers=admin_headers)
+    assert response.status_code == 200
+    assert "admission" in response.json()
@@ -0,0 +1,74 @@
+"""Allergy normalization and the product exclusions it drives"""
+
+from app.services.fuzzy_normalizer import FuzzyNormalizer, edit_distance
+from app.services.screening_service import DrugName, ScreeningService, resolve_allergens
+from tests.conftest import QUESTIONNAIRE, screening_result
+
+
+def _screen(drug_allergies) -> dict:
+    data = {**QUESTIONNAIRE, "health_conditions": [], "has_drug_allergies": True, "drug_allergies": drug_allergies}
+    return ScreeningService().run_screening(data)
+
+
+def _allergy_step(result: dict) -> str:
+    return next(step["result"] for step in result["screening_steps"] if step["step"] == "Allergy Check")
+
+
+def test_patient_wording_resolves_to_composition_terms():
+    assert resolve_allergens("sulfa drugs") == {"sulfonamide"}
+    assert resolve_allergens("Sulpha!") == {"sulfonamide"}
+    assert resolve_allergens("milk sugar") == {"lactose"}
+    # Brand names and misspellings come from the medication synonym dictionary
+    assert resolve_allergens("Wellbutrin") == {"bupropion"}
+    assert resolve_allergens("Topomax") == {"topiramate"}
+    # Whole entry first, then each word
+    assert resolve_allergens("allergic to sulfa and gelatine") == {"sulfonamide", "gelatin"}
+    assert resolve_allergens("penicillin") == set()
+
+
+def test_typos_are_tolerated_by_length():
+    normalizer = FuzzyNormalizer(["lactose", "gelatin", "sulfonamide", "naltrexone"], max_entries=16)
+    assert normalizer.normalize("lactos") == "lactose"
+    assert normalizer.normalize("sulfonamid") == "sulfonamide"
+    assert normalizer.normalize("naltrexon") == "naltrexone"
+    # Short words must match exactly
+    assert normalizer.normalize("lacto") is None
+    assert edit_distance("gelatin", "gelatine", limit=1) == 1
+    assert edit_distance("gelatin", "lactose", limit=1) == 2
+
+    normalizer.normalize("lactos")
+    assert normalizer.stats()["hits"] >= 1
+
+
+def test_sulfa_allergy_excludes_topiramate_products():
+    result = _screen(["sulfa drugs"])
+    assert set(result["absolute_exclusions"]) == {DrugName.TOPIRAMATE, DrugName.QSYMIA}
+    assert "sulfonamide (listed: sulfa drugs)" in result["absolute_exclusions"][DrugName.QSYMIA]
+    recommended = [drug["medication"] for drug in result["recommended_drugs"]]
+    assert DrugName.TOPIRAMATE not in recommended and DrugName.QSYMIA not in recommended
+
+
+def test_excipient_allergies_exclude_products_containing_them():
+    result = _screen(["lactose", "gelatine"])
+    assert set(result["absolute_exclusions"]) == {
+        DrugName.TOPIRAMATE, DrugName.CONTRAVE, DrugName.NALTREXONE,  # lactose
+        DrugName.QSYMIA, DrugName.VYVANSE,  # gelatin
+    }
+    assert _allergy_step(result).startswith("Recognized: gelatin, lactose. ABSOLUTE exclusions: 5.")
+
+
+def test_unrecognized_entries_are_listed_for_manual_review():
+    result = _screen(["penicillin", "Topomax", "  "])
+    assert set(result["absolute_exclusions"]) == {DrugName.TOPIRAMATE, DrugName.QSYMIA}
+    assert _allergy_step(result).endswith("Not recognized, review manually: penicillin")
+
+
+def test_no_listed_allergies_skips_the_check():
+    result = _screen([])
+    assert "Allergy Check" not in [step["step"] for step in result["screening_steps"]]
+    assert not result["absolute_exclusions"]
+
+
+def test_submitted_allergies_reach_the_stored_result(client):
+    result = screening_result(client, health_conditions=[], has_drug_allergies=True, drug_allergies=["sulfa"])
+    assert set(result["absolute_exclusions"]) == {DrugName.TOPIRAMATE.name, DrugName.QSYMIA.name}
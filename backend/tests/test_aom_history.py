@@ -0,0 +1,61 @@
+"""Previous AOM history parsing: medications, outcomes and negated phrases"""
+
+import pytest
+
+from app.services.aom_history import (
+    EFFECTIVE,
+    INEFFECTIVE,
+    SIDE_EFFECTS,
+    UNKNOWN,
+    AomHistoryEntry,
+    _parse_aom_history,
+    failed_drug_names,
+)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Phentermine worked great with no side effects", [AomHistoryEntry("PHENTERMINE", EFFECTIVE)]),
+    ("Took qsymia for 6 months, lost 20 lbs, no side effects", [AomHistoryEntry("QSYMIA", EFFECTIVE)]),
+    ("Wegovy - no nausea, lost 30 lbs", [AomHistoryEntry("WEGOVY", EFFECTIVE)]),
+    ("Wegovy: no nausea or vomiting but lost 15 lbs", [AomHistoryEntry("WEGOVY", EFFECTIVE)]),
+    ("Zepbound, didn't have any headaches, lost weight", [AomHistoryEntry("ZEPBOUND", EFFECTIVE)]),
+])
+def test_negated_side_effects_do_not_mark_a_failure(text, expected):
+    entries = list(_parse_aom_history(text))
+    assert entries == expected
+    assert failed_drug_names(entries) == []
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Phentermine made me jittery", AomHistoryEntry("PHENTERMINE", SIDE_EFFECTS, "jittery")),
+    ("Wegovy no nausea but constipation", AomHistoryEntry("WEGOVY", SIDE_EFFECTS, "constipation")),
+    ("Zepbound gave me nausea but I lost 25 lbs", AomHistoryEntry("ZEPBOUND", SIDE_EFFECTS, "nausea")),
+    ("Contrave didn't work", AomHistoryEntry("CONTRAVE", INEFFECTIVE)),
+    ("Topiramate never worked", AomHistoryEntry("TOPIRAMATE", INEFFECTIVE)),
+    ("Tried Wellbutrin without any weight loss", AomHistoryEntry("BUPROPION", INEFFECTIVE)),
+])
+def test_affirmed_side_effects_and_failures(text, expected):
+    assert list(_parse_aom_history(text)) == [expected]
+
+
+def test_negated_side_effect_is_not_taken_from_the_next_drug():
+    entries = list(_parse_aom_history("Contrave no side effects, phentermine made me dizzy"))
+    assert entries == [
+        AomHistoryEntry("CONTRAVE", UNKNOWN),
+        AomHistoryEntry("PHENTERMINE", SIDE_EFFECTS, "dizzy"),
+    ]
+    assert failed_drug_names(entries) == ["PHENTERMINE"]
+
+
+def test_outcome_is_shared_with_drugs_named_before_it():
+    entries = list(_parse_aom_history("Phentermine and topiramate didn't work. Wegovy worked"))
+    assert entries == [
+        AomHistoryEntry("PHENTERMINE", INEFFECTIVE),
+        AomHistoryEntry("TOPIRAMATE", INEFFECTIVE),
+        AomHistoryEntry("WEGOVY", EFFECTIVE),
+    ]
+
+
+def test_failure_in_any_sentence_wins_over_success():
+    entries = list(_parse_aom_history("Phentermine worked at first. Later phentermine gave me headaches"))
+    assert entries == [AomHistoryEntry("PHENTERMINE", SIDE_EFFECTS, "headaches")]
@@ -0,0 +1,87 @@
+"""Doctor approvals: optimistic concurrency on single and batch approval"""
+
+from sqlalchemy import update
+
+from app.api import screening as screening_api
+from app.db.session import SessionLocal
+from app.models.screening_result import ScreeningResult
+from tests.conftest import screening_result
+
+
+def _medication(result: dict) -> str:
+    return result["recommended_drugs"][0]["medication"]
+
+
+def test_batch_approval_approves_and_bumps_version(client, doctor_headers):
+    result = screening_result(client)
+    response = client.post("/api/screening/approve/batch", headers=doctor_headers, json={
+        "approvals": [{"screening_id": result["id"], "selected_medication": _medication(result)}],
+    })
+    assert response.status_code == 200, response.text
+    assert response.json()["approved"] == 1
+
+    stored = client.get(f"/api/screening/results/{result['questionnaire_id']}").json()
+    assert stored["doctor_selected_medication"] == _medication(result)
+    assert stored["version"] == result["version"] + 1
+
+
+def test_batch_approval_reports_concurrent_change_as_conflict(client, doctor_headers, monkeypatch):
+    raced = screening_result(client)
+    untouched = screening_result(client)
+
+    # Another request re-screens the first result after the batch has read it
+    original_check = screening_api._approval_conflict
+
+    def check_then_race(row, doctor_id, expected_version, now):
+        if row.id == raced["id"]:
+            session = SessionLocal()
+            session.execute(
+                update(ScreeningResult)
+                .where(ScreeningResult.id == row.id)
+                .values(version=ScreeningResult.version + 1, doctor_notes="changed concurrently")
+            )
+            session.commit()
+            session.close()
+        return original_check(row, doctor_id, expected_version, now)
+
+    monkeypatch.setattr(screening_api, "_approval_conflict", check_then_race)
+    response = client.post("/api/screening/approve/batch", headers=doctor_headers, json={
+        "approvals": [
+            {"screening_id": raced["id"], "selected_medication": _medication(raced)},
+            {"screening_id": untouched["id"], "selected_medication": _medication(untouched)},
+        ],
+    })
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert [item["status"] for item in body["results"]] == ["conflict", "approved"]
+    assert body["approved"] == 1
+
+    session = SessionLocal()
+    try:
+        stored = session.get(ScreeningResult, raced["id"])
+        assert stored.doctor_selected_medication is None
+        assert stored.doctor_notes == "changed concurrently"
+        assert stored.version == raced["version"] + 1
+    finally:
+        session.close()
+
+    # Only the approved questionnaire was marked reviewed
+    assert client.get(f"/api/screening/results/{raced['questionnaire_id']}").json()["doctor_selected_medication"] is None
+
+
+def test_batch_approval_rejects_stale_version(client, doctor_headers):
+    result = screening_result(client)
+    response = client.post("/api/screening/approve/batch", headers=doctor_headers, json={
+        "approvals": [{"screening_id": result["id"], "selected_medication": _medication(result),
+                       "version": result["version"] + 5}],
+    })
+    assert response.json()["results"][0]["status"] == "conflict"
+
+
+def test_single_approval_without_version_refuses_to_overwrite(client, doctor_headers):
+    result = screening_result(client)
+    url = f"/api/screening/approve/{result['id']}"
+    first = client.post(url, headers=doctor_headers, json={"selected_medication": _medication(result)})
+    assert first.status_code == 200, first.text
+    second = client.post(url, headers=doctor_headers, json={"selected_medication": _medication(result)})
+    assert second.status_code == 409
@@ -0,0 +1,81 @@
+"""AOM history backfill: live and archived rows, writing only changed entries"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+import backfill_aom_history
+from app.db.session import SessionLocal
+from app.models.archive import QuestionnaireArchive
+from app.models.questionnaire import Questionnaire, QuestionnaireStatus
+from app.models.sync_change import SyncChange
+from app.services.retention import archive_reviewed
+from tests.conftest import screening_result, submit_questionnaire
+
+HISTORY = "Phentermine worked great with no side effects"
+STALE_ENTRIES = [{"drug": "PHENTERMINE", "outcome": "side_effects", "side_effect": None}]
+PARSED_ENTRIES = [{"drug": "PHENTERMINE", "outcome": "effective", "side_effect": None}]
+
+
+def _backfill(session, model) -> tuple:
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return backfill_aom_history.backfill_table(session, model, pool, chunk_size=2, workers=1)
+
+
+def _sync_seq(session, questionnaire_id: int) -> int:
+    return session.query(SyncChange.seq).filter(
+        SyncChange.entity == "questionnaire", SyncChange.entity_id == questionnaire_id
+    ).scalar()
+
+
+def _set_entries(session, model, questionnaire_id: int, entries) -> None:
+    session.execute(update(model).where(model.id == questionnaire_id).values(previous_aom_entries=entries))
+    session.commit()
+
+
+def test_only_rows_with_changed_entries_are_written(client):
+    stale = submit_questionnaire(client, previous_aom_history=HISTORY)
+    current = submit_questionnaire(client, previous_aom_history=HISTORY)
+
+    session = SessionLocal()
+    try:
+        # As parsed by an older parser version
+        _set_entries(session, Questionnaire, stale, STALE_ENTRIES)
+        stale_seq, current_seq = _sync_seq(session, stale), _sync_seq(session, current)
+
+        read, written = _backfill(session, Questionnaire)
+        assert read >= 2
+        assert written == 1
+
+        session.expire_all()
+        assert session.get(Questionnaire, stale).previous_aom_entries == PARSED_ENTRIES
+        assert session.get(Questionnaire, current).previous_aom_entries == PARSED_ENTRIES
+        assert _sync_seq(session, stale) > stale_seq
+        assert _sync_seq(session, current) == current_seq
+
+        # Nothing left to change on a re-run
+        assert _backfill(session, Questionnaire)[1] == 0
+    finally:
+        session.close()
+
+
+def test_archived_questionnaires_are_backfilled(client):
+    questionnaire_id = screening_result(client, previous_aom_history=HISTORY)["questionnaire_id"]
+    session = SessionLocal()
+    try:
+        session.execute(
+            update(Questionnaire)
+            .where(Questionnaire.id == questionnaire_id)
+            .values(status=QuestionnaireStatus.REVIEWED, reviewed_at=datetime.utcnow() - timedelta(days=4000))
+        )
+        session.commit()
+        assert archive_reviewed(session, older_than_days=3650, batch_size=10).questionnaires == 1
+        _set_entries(session, QuestionnaireArchive, questionnaire_id, STALE_ENTRIES)
+
+        assert _backfill(session, QuestionnaireArchive)[1] == 1
+        session.expire_all()
+        assert session.get(QuestionnaireArchive, questionnaire_id).previous_aom_entries == PARSED_ENTRIES
+    finally:
+        session.close()
+
@@ -0,0 +1,54 @@
+"""Bulk questionnaire upload from clinic kiosks: authentication and per-record outcomes"""
+
+import json
+
+from app.models.user import UserRole
+from tests.conftest import QUESTIONNAIRE, auth_headers, create_user
+
+BULK_URL = "/api/questionnaires/bulk"
+
+
+def _ndjson(*records) -> bytes:
+    return "\n".join(json.dumps(record) for record in records).encode()
+
+
+def _upload(client, headers, body: bytes, **params):
+    return client.post(
+        BULK_URL,
+        params=params,
+        headers={**headers, "Content-Type": "application/x-ndjson"},
+        content=body,
+    )
+
+
+def test_upload_requires_clinic_staff(client):
+    body = _ndjson(QUESTIONNAIRE)
+    assert _upload(client, {}, body).status_code == 401
+    assert _upload(client, auth_headers(create_user(UserRole.PATIENT)), body).status_code == 403
+
+
+def test_staff_upload_reports_each_record(client, doctor_headers):
+    invalid = {key: value for key, value in QUESTIONNAIRE.items() if key != "age"}
+    response = _upload(client, doctor_headers, _ndjson(QUESTIONNAIRE, invalid, QUESTIONNAIRE))
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["created"], body["rejected"]) == (2, 1)
+    assert [outcome["status"] for outcome in body["results"]] == ["created", "invalid", "created"]
+    assert any("age" in error for error in body["results"][1]["errors"])
+
+
+def test_admin_upload_can_screen_records(client, admin_headers):
+    response = client.post(
+        BULK_URL,
+        params={"screen": "true"},
+        headers=admin_headers,
+        json=[QUESTIONNAIRE],
+    )
+    assert response.status_code == 200, response.text
+    outcome = response.json()["results"][0]
+    assert outcome["status"] == "created"
+    assert outcome["screening_id"] is not None
+
+    result = client.get(f"/api/screening/results/{outcome['id']}")
+    assert result.status_code == 200
+    assert result.json()["id"] == outcome["screening_id"]
@@ -0,0 +1,36 @@
+"""Authentication of the doctor event stream"""
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.deps import get_current_stream_doctor, get_stream_token
+from app.models.user import UserRole
+from tests.conftest import auth_headers, create_user
+
+
+def _token(headers: dict) -> str:
+    return headers["Authorization"].split(" ", 1)[1]
+
+
+def test_pending_stream_requires_a_token(client):
+    assert client.get("/api/events/pending").status_code == 401
+
+
+def test_pending_stream_rejects_patients_by_query_token(client, patient):
+    token = _token(auth_headers(patient))
+    assert client.get(f"/api/events/pending?access_token={token}").status_code == 403
+
+
+def test_pending_stream_rejects_invalid_query_token(client):
+    assert client.get("/api/events/pending?access_token=not-a-jwt").status_code == 401
+
+
+def test_stream_token_from_header_or_query(db):
+    doctor = create_user(UserRole.DOCTOR)
+    token = _token(auth_headers(doctor))
+
+    assert get_current_stream_doctor(get_stream_token(None, token), db).id == doctor.id
+    assert get_current_stream_doctor(get_stream_token(token, None), db).id == doctor.id
+    with pytest.raises(HTTPException) as error:
+        get_stream_token(None, None)
+    assert error.value.status_code == 401
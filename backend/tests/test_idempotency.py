@@ -0,0 +1,80 @@
+"""Idempotency-Key replay for anonymous questionnaire creation"""
+
+import uuid
+
+from app.api import questionnaires as questionnaires_api
+from app.db.session import SessionLocal
+from app.models.idempotency_key import IdempotencyKey
+from app.models.questionnaire import Questionnaire
+from tests.conftest import QUESTIONNAIRE
+
+
+def _create(client, key: str, **overrides):
+    return client.post("/api/questionnaires/anonymous", json={**QUESTIONNAIRE, **overrides},
+                       headers={"Idempotency-Key": key})
+
+
+def _remove_questionnaire(questionnaire_id: int) -> None:
+    """Delete a questionnaire behind the API's back, as archiving does (SQLite does not cascade)"""
+    session = SessionLocal()
+    try:
+        session.query(Questionnaire).filter(Questionnaire.id == questionnaire_id).delete()
+        session.commit()
+    finally:
+        session.close()
+
+
+def test_retry_returns_the_original_questionnaire(client):
+    key = uuid.uuid4().hex
+    first = _create(client, key)
+    second = _create(client, key)
+    assert first.status_code == second.status_code == 201
+    assert first.json()["id"] == second.json()["id"]
+
+
+def test_key_reused_with_different_body_is_rejected(client):
+    key = uuid.uuid4().hex
+    assert _create(client, key).status_code == 201
+    assert _create(client, key, age=55).status_code == 422
+
+
+def test_key_of_removed_questionnaire_is_dropped(client):
+    key = uuid.uuid4().hex
+    first = _create(client, key)
+    _remove_questionnaire(first.json()["id"])
+
+    retry = _create(client, key)
+    assert retry.status_code == 201, retry.text
+    session = SessionLocal()
+    try:
+        assert session.get(Questionnaire, retry.json()["id"]) is not None
+    finally:
+        session.close()
+    assert _create(client, key).json()["id"] == retry.json()["id"]
+
+
+def test_lost_race_to_removed_questionnaire_is_a_conflict(client, monkeypatch):
+    key = uuid.uuid4().hex
+    first = _create(client, key)
+    _remove_questionnaire(first.json()["id"])
+
+    # The first lookup misses the key, as it would for a request racing the original
+    lookups = []
+    original_lookup = questionnaires_api.lookup_idempotency_key
+
+    def racing_lookup(db, key, endpoint):
+        lookups.append(key)
+        return None if len(lookups) == 1 else original_lookup(db, key, endpoint)
+
+    monkeypatch.setattr(questionnaires_api, "lookup_idempotency_key", racing_lookup)
+    response = _create(client, key)
+    assert response.status_code == 409, response.text
+
+    session = SessionLocal()
+    try:
+        assert session.query(IdempotencyKey).filter(IdempotencyKey.key == key).count() == 0
+    finally:
+        session.close()
+
+    monkeypatch.undo()
+    assert _create(client, key).status_code == 201
@@ -0,0 +1,79 @@
+"""Medication interaction check: current_medications against the drug pool"""
+
+from app.services.medication_matcher import medication_matcher
+from app.services.screening_service import DrugName, ScreeningService
+from tests.conftest import QUESTIONNAIRE, screening_result
+
+
+def _screen(current_medications, **overrides) -> dict:
+    data = {**QUESTIONNAIRE, "health_conditions": [], **overrides, "current_medications": current_medications}
+    return ScreeningService().run_screening(data)
+
+
+def _step(result: dict, name: str) -> str:
+    return next(step["result"] for step in result["screening_steps"] if step["step"] == name)
+
+
+def test_brand_names_and_misspellings_resolve_to_ingredients():
+    found = medication_matcher.find_all(["Nolvadex 20mg daily", "oxycodone prn", "Adderall XR", "vitamin D"])
+    assert found == {
+        "tamoxifen": ["Nolvadex 20mg daily"],
+        "oxycodone": ["oxycodone prn"],
+        "amphetamine": ["Adderall XR"],
+    }
+    # Whole words only
+    assert medication_matcher.find_all(["nardilx"]) == {}
+
+
+def test_absolute_interactions_remove_drugs():
+    result = _screen(["Nolvadex", "Nardil"])
+    excluded = result["absolute_exclusions"]
+    for drug in (DrugName.CONTRAVE, DrugName.BUPROPION, DrugName.PHENTERMINE, DrugName.VYVANSE, DrugName.QSYMIA):
+        assert drug in excluded
+    recommended = [drug["medication"] for drug in result["recommended_drugs"]]
+    assert DrugName.CONTRAVE not in recommended
+    assert DrugName.PHENTERMINE not in recommended
+    assert "Tamoxifen" in excluded[DrugName.BUPROPION]
+    assert "MAO inhibitor" in excluded[DrugName.PHENTERMINE]
+    assert _step(result, "Medication Interaction Check").startswith("Recognized: phenelzine, tamoxifen.")
+
+
+def test_opioids_exclude_naltrexone_products():
+    result = _screen(["tramadol 50mg"])
+    assert set(result["absolute_exclusions"]) == {DrugName.CONTRAVE, DrugName.NALTREXONE}
+    assert "(listed: tramadol 50mg)" in result["absolute_exclusions"][DrugName.NALTREXONE]
+
+
+def test_relative_interactions_flag_but_keep_drugs():
+    result = _screen(["Ozempic"])
+    assert set(result["relative_warnings"]) == {DrugName.WEGOVY, DrugName.ZEPBOUND}
+    assert not result["absolute_exclusions"]
+    recommended = [drug["medication"] for drug in result["recommended_drugs"]]
+    assert DrugName.WEGOVY in recommended and DrugName.ZEPBOUND in recommended
+
+
+def test_first_rule_to_exclude_a_drug_keeps_its_reason():
+    # Contrave is excluded by tamoxifen first; the opioid rule does not overwrite it
+    result = _screen(["tamoxifen", "oxycodone"])
+    assert "Tamoxifen" in result["absolute_exclusions"][DrugName.CONTRAVE]
+    assert "Opioid" in result["absolute_exclusions"][DrugName.NALTREXONE]
+
+    # First-Step exclusions are not overwritten either
+    result = _screen(["phenelzine"], health_conditions=["hypertension"])
+    assert "Hypertension" in result["absolute_exclusions"][DrugName.PHENTERMINE]
+
+
+def test_no_listed_medications_skips_the_check():
+    result = _screen([])
+    assert "Medication Interaction Check" not in [step["step"] for step in result["screening_steps"]]
+    assert not result["absolute_exclusions"] and not result["relative_warnings"]
+    assert len(result["recommended_drugs"]) == len(result["initial_drug_pool"])
+
+    unknown = _screen(["vitamin D", "fish oil"])
+    assert _step(unknown, "Medication Interaction Check").startswith("Recognized: none.")
+
+
+def test_submitted_medications_reach_the_stored_result(client):
+    result = screening_result(client, health_conditions=[], current_medications=["Nolvadex"])
+    assert DrugName.CONTRAVE.name in result["absolute_exclusions"]
+    assert "Medication Interaction Check" in [step["step"] for step in result["screening_logic"]]
@@ -0,0 +1,120 @@
+"""Bitset migration against databases created before the mask columns existed"""
+
+import json
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import migrate_add_condition_bitsets
+from app.core.condition_codes import encode_eating_habits, encode_health_conditions
+from app.db.session import Base
+from app.models.archive import QuestionnaireArchive
+from app.services.retention import archive_reviewed
+
+MASK_COLUMNS = ("health_conditions_mask", "eating_habits_mask")
+CONDITIONS = ["hypertension", "diabetes"]
+HABITS = ["emotional_eating"]
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """A current schema on disk, pointed to by the migration script"""
+    path = tmp_path / "aom_screening.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(migrate_add_condition_bitsets, "DB_PATH", path)
+    yield path, engine
+    engine.dispose()
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> set:
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _insert_reviewed_case(conn: sqlite3.Connection, days_ago: int = 200) -> int:
+    reviewed_at = (datetime.utcnow() - timedelta(days=days_ago)).isoformat(sep=" ")
+    cursor = conn.execute(
+        "INSERT INTO questionnaires (status, age, gender, height_ft, height_in, weight_lb, eating_habits, "
+        "health_conditions, has_drug_allergies, submitted_at, reviewed_at) "
+        "VALUES ('REVIEWED', 40, 'female', 5, 4, 210, ?, ?, 0, ?, ?)",
+        (json.dumps(HABITS), json.dumps(CONDITIONS), reviewed_at, reviewed_at),
+    )
+    conn.execute(
+        "INSERT INTO screening_results (questionnaire_id, is_eligible, version, doctor_selected_medication) "
+        "VALUES (?, 1, 2, 'WEGOVY')",
+        (cursor.lastrowid,),
+    )
+    conn.commit()
+    return cursor.lastrowid
+
+
+def test_adds_and_backfills_masks_on_live_and_archive_tables(database):
+    path, engine = database
+    conn = sqlite3.connect(path)
+    for table in ("questionnaires", "questionnaires_archive"):
+        for column in MASK_COLUMNS:
+            conn.execute(f"ALTER TABLE {table} DROP COLUMN {column}")
+    questionnaire_id = _insert_reviewed_case(conn)
+    conn.close()
+
+    migrate_add_condition_bitsets.migrate()
+    migrate_add_condition_bitsets.migrate()  # Re-running is harmless
+
+    conn = sqlite3.connect(path)
+    try:
+        for table in ("questionnaires", "questionnaires_archive"):
+            assert set(MASK_COLUMNS) <= _columns(conn, table)
+        masks = conn.execute(
+            "SELECT health_conditions_mask, eating_habits_mask FROM questionnaires WHERE id = ?",
+            (questionnaire_id,),
+        ).fetchone()
+    finally:
+        conn.close()
+    assert masks == (encode_health_conditions(CONDITIONS), encode_eating_habits(HABITS))
+
+    # Archiving copies every mapped column, masks included
+    session = sessionmaker(bind=engine)()
+    try:
+        report = archive_reviewed(session, older_than_days=30, batch_size=100)
+        archived = session.query(QuestionnaireArchive).filter(QuestionnaireArchive.id == questionnaire_id).one()
+    finally:
+        session.close()
+    assert report.questionnaires == 1
+    assert archived.health_conditions_mask == encode_health_conditions(CONDITIONS)
+
+
+def test_drops_mask_indexes_left_by_earlier_runs(database):
+    path, _ = database
+    conn = sqlite3.connect(path)
+    for table in ("questionnaires", "questionnaires_archive"):
+        for column in MASK_COLUMNS:
+            conn.execute(f"CREATE INDEX ix_{table}_{column} ON {table} ({column})")
+    conn.commit()
+    conn.close()
+
+    migrate_add_condition_bitsets.migrate()
+
+    conn = sqlite3.connect(path)
+    try:
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    finally:
+        conn.close()
+    assert not {name for name in indexes if name.endswith("_mask")}
+
+
+def test_skips_missing_archive_table(database):
+    path, _ = database
+    conn = sqlite3.connect(path)
+    conn.execute("DROP TABLE questionnaires_archive")
+    conn.close()
+
+    migrate_add_condition_bitsets.migrate()
+
+    conn = sqlite3.connect(path)
+    try:
+        assert set(MASK_COLUMNS) <= _columns(conn, "questionnaires")
+    finally:
+        conn.close()
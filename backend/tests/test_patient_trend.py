@@ -0,0 +1,105 @@
+"""Patient BMI trend: recording on submit and downsampling long histories"""
+
+import itertools
+from datetime import datetime, timedelta
+
+from app.db.session import SessionLocal
+from app.models.patient_trend import PatientTrendPoint
+from app.models.user import UserRole
+from app.services.patient_trend import downsample
+from tests.conftest import QUESTIONNAIRE, auth_headers, create_user
+
+START = datetime(2025, 1, 1)
+# questionnaire_id has no foreign key; keep synthetic ids clear of real ones
+_synthetic_ids = itertools.count(10_000_000)
+
+
+def _series(bmis) -> list:
+    return [{"submitted_at": START + timedelta(days=7 * index), "bmi": bmi} for index, bmi in enumerate(bmis)]
+
+
+def _add_points(patient_id: int, bmis) -> None:
+    session = SessionLocal()
+    try:
+        for point in _series(bmis):
+            session.add(PatientTrendPoint(
+                patient_id=patient_id,
+                questionnaire_id=next(_synthetic_ids),
+                submitted_at=point["submitted_at"],
+                weight_lb=point["bmi"] * 6,
+                bmi=point["bmi"],
+                is_eligible=True,
+            ))
+        session.commit()
+    finally:
+        session.close()
+
+
+def test_downsample_keeps_ends_and_peaks():
+    bmis = [32.0] * 40
+    bmis[13] = 38.5  # A spike
+    bmis[27] = 27.0  # A dip
+    points = _series(bmis)
+
+    sampled = downsample(points, 6)
+    assert len(sampled) == 6
+    assert sampled[0] is points[0] and sampled[-1] is points[-1]
+    assert points[13] in sampled and points[27] in sampled
+    # Real submissions, still in date order
+    assert [points.index(point) for point in sampled] == sorted(points.index(point) for point in sampled)
+
+
+def test_short_series_is_returned_unchanged():
+    points = _series([30.0, 31.0, 32.0])
+    assert downsample(points, 5) is points
+    assert downsample(points, 3) is points
+
+
+def _trend(client, user, patient_id: int, **params) -> dict:
+    response = client.get(f"/api/patients/{patient_id}/trend", headers=auth_headers(user), params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_trend_endpoint_downsamples_long_histories(client):
+    patient = create_user(UserRole.PATIENT)
+    _add_points(patient.id, [31.0 + (index % 5) * 0.1 for index in range(50)])
+
+    trend = _trend(client, patient, patient.id, max_points=10)
+    assert trend["total_points"] == 50
+    assert trend["downsampled"] is True
+    assert len(trend["points"]) == 10
+
+    full = _trend(client, patient, patient.id, max_points=100)
+    assert full["downsampled"] is False
+    assert len(full["points"]) == 50
+
+    # The time range is applied before downsampling
+    ranged = _trend(client, patient, patient.id, max_points=10, until=(START + timedelta(days=28)).isoformat())
+    assert ranged["total_points"] == 5
+    assert ranged["downsampled"] is False
+
+
+def test_submission_adds_a_trend_point(client):
+    patient = create_user(UserRole.PATIENT)
+    headers = auth_headers(patient)
+    created = client.post("/api/questionnaires", headers=headers, json=QUESTIONNAIRE)
+    assert created.status_code == 201, created.text
+    questionnaire_id = created.json()["id"]
+    assert _trend(client, patient, patient.id)["points"] == []
+
+    submitted = client.post(f"/api/questionnaires/{questionnaire_id}/submit", headers=headers)
+    assert submitted.status_code == 200, submitted.text
+
+    points = _trend(client, patient, patient.id)["points"]
+    assert [point["questionnaire_id"] for point in points] == [questionnaire_id]
+    assert points[0]["weight_lb"] == QUESTIONNAIRE["weight_lb"]
+    assert points[0]["is_eligible"] is True
+
+
+def test_patients_see_only_their_own_trend(client, doctor_headers):
+    patient = create_user(UserRole.PATIENT)
+    other = create_user(UserRole.PATIENT)
+
+    assert client.get(f"/api/patients/{patient.id}/trend", headers=auth_headers(other)).status_code == 403
+    assert client.get(f"/api/patients/{patient.id}/trend", headers=doctor_headers).status_code == 200
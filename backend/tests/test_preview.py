@@ -0,0 +1,48 @@
+"""Stateless screening preview: fingerprint, ETag and no database writes"""
+
+from app.db.session import SessionLocal
+from app.models.questionnaire import Questionnaire
+from app.models.screening_result import ScreeningResult
+from tests.conftest import QUESTIONNAIRE
+
+PREVIEW = {key: value for key, value in QUESTIONNAIRE.items() if key not in ("age", "gender", "is_childbearing_age_woman")}
+
+
+def _row_counts():
+    session = SessionLocal()
+    try:
+        return session.query(Questionnaire).count(), session.query(ScreeningResult).count()
+    finally:
+        session.close()
+
+
+def test_identical_inputs_share_a_fingerprint(client):
+    first = client.post("/api/screening/preview", json=PREVIEW)
+    assert first.status_code == 200, first.text
+    body = first.json()
+    assert len(body["fingerprint"]) == 64
+    assert first.headers["etag"].removeprefix("W/") == f'"{body["fingerprint"]}"'
+
+    # Key order and fields that do not affect screening leave the fingerprint alone
+    reordered = dict(reversed(list(PREVIEW.items())), additional_remarks="call after 5pm")
+    assert client.post("/api/screening/preview", json=reordered).json()["fingerprint"] == body["fingerprint"]
+
+    changed = client.post("/api/screening/preview", json={**PREVIEW, "weight_lb": 150}).json()
+    assert changed["fingerprint"] != body["fingerprint"]
+    assert changed["bmi"] < body["bmi"]
+
+
+def test_matching_etag_gives_304(client):
+    etag = client.post("/api/screening/preview", json=PREVIEW).headers["etag"]
+    repeat = client.post("/api/screening/preview", json=PREVIEW, headers={"If-None-Match": etag})
+    assert repeat.status_code == 304
+    assert repeat.headers["etag"].removeprefix("W/") == etag.removeprefix("W/")
+
+    other = client.post("/api/screening/preview", json={**PREVIEW, "weight_lb": 150}, headers={"If-None-Match": etag})
+    assert other.status_code == 200
+
+
+def test_preview_never_touches_the_database(client):
+    before = _row_counts()
+    client.post("/api/screening/preview", json={**PREVIEW, "weight_lb": 260})
+    assert _row_counts() == before
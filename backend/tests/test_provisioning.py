@@ -0,0 +1,58 @@
+"""Bulk user provisioning and the password hashing pool"""
+
+import uuid
+
+import pytest
+
+from app.core.security import verify_password
+from app.services import provisioning
+
+
+def _users(count: int) -> list:
+    batch = uuid.uuid4().hex[:8]
+    return [
+        {"email": f"clinic-{batch}-{index}@example.com", "password": f"password-{index}",
+         "full_name": f"Patient {index}", "role": "patient"}
+        for index in range(count)
+    ]
+
+
+@pytest.fixture
+def shared_pool():
+    provisioning.start_hashing_pool(2)
+    yield provisioning._shared_pool
+    provisioning.stop_hashing_pool()
+
+
+def test_shared_pool_uses_spawn_and_is_reused(shared_pool):
+    assert shared_pool._mp_context.get_start_method() == "spawn"
+
+    passwords = [f"password-{index}" for index in range(provisioning.MIN_PARALLEL_PASSWORDS + 2)]
+    hashes = list(provisioning.hash_passwords(passwords, 2))
+    assert all(verify_password(password, hashed) for password, hashed in zip(passwords, hashes))
+    list(provisioning.hash_passwords(passwords, 2))
+    assert provisioning._shared_pool is shared_pool
+
+
+def test_stop_shuts_the_shared_pool_down():
+    provisioning.start_hashing_pool(2)
+    pool = provisioning._shared_pool
+    provisioning.stop_hashing_pool()
+    assert provisioning._shared_pool is None
+    with pytest.raises(RuntimeError):
+        pool.submit(len, "")
+
+
+def test_provision_endpoint_creates_and_skips(client, admin_headers, doctor_headers):
+    users = _users(provisioning.MIN_PARALLEL_PASSWORDS + 1)
+    assert client.post("/api/auth/provision", headers=doctor_headers, json={"users": users}).status_code == 403
+
+    response = client.post("/api/auth/provision", headers=admin_headers, json={"users": users + users[:1]})
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["created"] == len(users)
+    assert body["results"][-1]["status"] == "duplicate"
+
+    again = client.post("/api/auth/provision", headers=admin_headers, json={"users": users[:2]}).json()
+    assert again["created"] == 0
+    assert {outcome["status"] for outcome in again["results"]} == {"exists"}
@@ -0,0 +1,80 @@
+"""Rate limiting: quota parsing, token buckets and client addresses behind proxies"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.core import rate_limit
+from app.core.config import settings
+from app.core.rate_limit import InMemoryRateLimitBackend, RateLimitBackend, RateQuota, client_ip, parse_quota
+
+
+def _request(forwarded_for: str = None) -> Request:
+    headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for is not None else []
+    return Request({"type": "http", "headers": headers, "client": ("10.0.0.1", 1234)})
+
+
+def test_parse_quota():
+    assert parse_quota("20/minute") == RateQuota(20, 60.0)
+    assert parse_quota("5 / Second") == RateQuota(5, 1.0)
+
+
+@pytest.mark.parametrize("value", ["0/minute", "-1/hour", "ten/minute", "20/fortnight", "20"])
+def test_parse_quota_rejects_invalid_values(value):
+    with pytest.raises(ValueError):
+        parse_quota(value)
+
+
+def test_backend_interface_is_abstract():
+    with pytest.raises(TypeError):
+        RateLimitBackend()
+
+
+def test_bucket_allows_burst_then_waits():
+    backend = InMemoryRateLimitBackend()
+    quota = parse_quota("2/minute")
+    assert backend.acquire("client", quota) == 0
+    assert backend.acquire("client", quota) == 0
+    assert 0 < backend.acquire("client", quota) <= 30
+    assert backend.acquire("other", quota) == 0
+
+
+def test_forwarded_for_ignored_without_trusted_proxy(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUST_PROXY", False)
+    assert client_ip(_request("198.51.100.7")) == "10.0.0.1"
+
+
+def test_client_chosen_forwarded_entries_are_ignored(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUST_PROXY", True)
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUSTED_PROXY_HOPS", 1)
+    # The client sent "1.2.3.4"; our proxy appended the address it saw
+    assert client_ip(_request("1.2.3.4, 198.51.100.7")) == "198.51.100.7"
+    assert client_ip(_request("198.51.100.7")) == "198.51.100.7"
+    assert client_ip(_request()) == "10.0.0.1"
+
+
+def test_trusted_proxy_hops(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUST_PROXY", True)
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUSTED_PROXY_HOPS", 2)
+    assert client_ip(_request("1.2.3.4, 198.51.100.7, 10.1.1.1")) == "198.51.100.7"
+    assert client_ip(_request("198.51.100.7")) == "198.51.100.7"
+
+
+def test_spoofed_forwarded_for_cannot_escape_the_limit(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUST_PROXY", True)
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUSTED_PROXY_HOPS", 1)
+    monkeypatch.setattr(settings, "RATE_LIMIT_SCREENING_RUN", "2/minute")
+    monkeypatch.setattr(rate_limit, "backend", InMemoryRateLimitBackend())
+    dependency = rate_limit.rate_limit("test", "RATE_LIMIT_SCREENING_RUN")
+
+    async def hit(spoofed: str):
+        await dependency(_request(f"{spoofed}, 198.51.100.7"))
+
+    asyncio.run(hit("1.1.1.1"))
+    asyncio.run(hit("2.2.2.2"))
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(hit("3.3.3.3"))
+    assert error.value.status_code == 429
@@ -0,0 +1,69 @@
+"""Read-your-writes stickiness when a read replica is configured"""
+
+import uuid
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from app.core import deps
+from app.db import session as db_session
+from app.db.session import RecentWriters, open_read_session, open_session
+from app.models.user import User, UserRole
+from tests.conftest import auth_headers
+
+
+def _request(headers: dict) -> Request:
+    return Request({
+        "type": "http",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+        "client": ("203.0.113.9", 1234),
+    })
+
+
+def _with_replica(monkeypatch):
+    replica = sessionmaker(bind=create_engine("sqlite://"))
+    monkeypatch.setattr(db_session, "has_read_replica", True)
+    monkeypatch.setattr(db_session, "ReadSessionLocal", lambda **kwargs: replica(**kwargs))
+    monkeypatch.setattr(db_session, "recent_writers", RecentWriters())
+    monkeypatch.setattr(deps, "has_read_replica", True)
+
+
+def test_writer_reads_own_writes_from_primary(monkeypatch):
+    _with_replica(monkeypatch)
+
+    reader = open_read_session("user:1")
+    assert reader.info.get("replica") is True
+    reader.close()
+
+    writer = open_session("user:1")
+    writer.add(User(email=f"writer-{uuid.uuid4().hex[:12]}@example.com", hashed_password="x",
+                    full_name="Writer", role=UserRole.PATIENT, is_active=1))
+    writer.commit()
+    writer.close()
+
+    own = open_read_session("user:1")
+    other = open_read_session("user:2")
+    try:
+        assert not own.info.get("replica")
+        assert other.info.get("replica") is True
+    finally:
+        own.close()
+        other.close()
+
+
+def test_session_without_client_does_not_mark_anyone(monkeypatch):
+    _with_replica(monkeypatch)
+    session = open_session()
+    session.info["wrote"] = True
+    session.commit()
+    session.close()
+    assert db_session.recent_writers._writes == {}
+
+
+def test_stickiness_key_prefers_token_user(monkeypatch, patient):
+    assert deps.get_stickiness_key(_request({})) is None
+
+    monkeypatch.setattr(deps, "has_read_replica", True)
+    assert deps.get_stickiness_key(_request(auth_headers(patient))) == f"user:{patient.id}"
+    assert deps.get_stickiness_key(_request({})) == "ip:203.0.113.9"
@@ -0,0 +1,61 @@
+"""Editing a submitted questionnaire re-screens its pending result without losing concurrent approvals"""
+
+from sqlalchemy import update
+
+from app.db.session import SessionLocal
+from app.models.screening_result import ScreeningResult
+from app.services.screening_service import ScreeningService
+from tests.conftest import QUESTIONNAIRE, auth_headers
+
+
+def _submitted_with_result(client, patient) -> dict:
+    headers = auth_headers(patient)
+    response = client.post("/api/questionnaires", headers=headers, json=QUESTIONNAIRE)
+    assert response.status_code == 201, response.text
+    questionnaire_id = response.json()["id"]
+    assert client.post(f"/api/questionnaires/{questionnaire_id}/submit").status_code == 200
+    response = client.post(f"/api/screening/run/{questionnaire_id}")
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_edit_patches_pending_result(client, patient):
+    result = _submitted_with_result(client, patient)
+    response = client.put(f"/api/questionnaires/{result['questionnaire_id']}", headers=auth_headers(patient),
+                          json={"weight_lb": 150})
+    assert response.status_code == 200, response.text
+
+    stored = client.get(f"/api/screening/results/{result['questionnaire_id']}").json()
+    assert stored["version"] == result["version"] + 1
+    assert stored["bmi_category"] != result["bmi_category"]
+
+
+def test_edit_does_not_overwrite_concurrent_approval(client, patient, monkeypatch):
+    result = _submitted_with_result(client, patient)
+    original_rescreen = ScreeningService.rescreen
+
+    # A doctor approves the result while the edit is being re-screened
+    def approve_then_rescreen(self, stored, questionnaire_data, changed_fields):
+        session = SessionLocal()
+        session.execute(
+            update(ScreeningResult)
+            .where(ScreeningResult.id == result["id"])
+            .values(doctor_selected_medication="WEGOVY", version=ScreeningResult.version + 1)
+        )
+        session.commit()
+        session.close()
+        return original_rescreen(self, stored, questionnaire_data, changed_fields)
+
+    monkeypatch.setattr(ScreeningService, "rescreen", approve_then_rescreen)
+    response = client.put(f"/api/questionnaires/{result['questionnaire_id']}", headers=auth_headers(patient),
+                          json={"weight_lb": 150})
+    assert response.status_code == 409
+
+    session = SessionLocal()
+    try:
+        stored = session.get(ScreeningResult, result["id"])
+        assert stored.doctor_selected_medication == "WEGOVY"
+        assert stored.bmi_category == result["bmi_category"]
+        assert stored.version == result["version"] + 1
+    finally:
+        session.close()
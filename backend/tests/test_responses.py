@@ -0,0 +1,110 @@
+"""Response negotiation: MessagePack via Accept, brotli/gzip via Accept-Encoding"""
+
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import responses
+from app.core.config import settings
+from app.core.responses import FastJSONResponse, choose_encoding, wants_msgpack
+from tests.conftest import screening_result
+
+# Both are optional dependencies; without them responses are always plain or gzipped JSON
+msgpack = pytest.importorskip("msgpack")
+pytest.importorskip("brotli")
+
+LARGE = {"items": [{"id": index, "name": f"item {index}"} for index in range(200)]}
+SMALL = {"ok": True}
+
+negotiating_app = FastAPI()
+
+
+@negotiating_app.get("/large")
+def large():
+    return FastJSONResponse(LARGE, headers={"ETag": '"large-1"'})
+
+
+@negotiating_app.get("/small")
+def small():
+    return FastJSONResponse(SMALL)
+
+
+@pytest.fixture(scope="module")
+def negotiating_client():
+    return TestClient(negotiating_app)
+
+
+@pytest.mark.parametrize("accept, expected", [
+    ("application/msgpack", True),
+    ("application/x-msgpack", True),
+    ("application/json, application/vnd.msgpack", True),
+    ("application/json;q=1.0, application/msgpack;q=0.5", False),
+    ("application/msgpack;q=0", False),
+    ("*/*", False),
+    (None, False),
+])
+def test_msgpack_is_chosen_only_when_named(accept, expected):
+    assert wants_msgpack(accept) is expected
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("gzip, deflate, br", "br"),
+    ("gzip", "gzip"),
+    ("br;q=0, gzip", "gzip"),
+    ("*", "br"),
+    ("identity", None),
+    (None, None),
+])
+def test_encoding_prefers_brotli_then_gzip(accept_encoding, expected):
+    assert choose_encoding(accept_encoding) == expected
+
+
+def test_gzip_is_offered_without_brotli(monkeypatch):
+    monkeypatch.setattr(responses, "brotli", None)
+    assert choose_encoding("br, gzip") == "gzip"
+    assert choose_encoding("br") is None
+
+
+def test_msgpack_round_trips_the_json_content(negotiating_client):
+    response = negotiating_client.get("/large", headers={"Accept": "application/msgpack", "Accept-Encoding": "identity"})
+    assert response.headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(response.content) == LARGE
+    assert response.headers["etag"] == 'W/"large-1"'
+    assert response.headers["vary"] == "Accept, Accept-Encoding"
+
+
+@pytest.mark.parametrize("encoding", ["br", "gzip"])
+def test_large_bodies_are_compressed(negotiating_client, encoding):
+    response = negotiating_client.get("/large", headers={"Accept-Encoding": encoding})
+    assert response.headers["content-encoding"] == encoding
+    assert int(response.headers["content-length"]) < len(json.dumps(LARGE))
+    assert response.json() == LARGE
+    assert response.headers["etag"] == 'W/"large-1"'
+
+
+def test_plain_json_is_left_unchanged(negotiating_client):
+    response = negotiating_client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["etag"] == '"large-1"'
+    assert response.json() == LARGE
+
+
+def test_small_bodies_are_not_compressed(negotiating_client):
+    response = negotiating_client.get("/small", headers={"Accept-Encoding": "br, gzip"})
+    assert len(response.content) < settings.RESPONSE_COMPRESSION_MIN_BYTES
+    assert "content-encoding" not in response.headers
+    assert response.json() == SMALL
+
+
+def test_cached_results_are_negotiated(client):
+    result = screening_result(client)
+    response = client.get(
+        f"/api/screening/results/{result['questionnaire_id']}",
+        headers={"Accept": "application/msgpack", "Accept-Encoding": "identity"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(response.content) == result
@@ -0,0 +1,99 @@
+"""Read-through result cache, ETags and invalidation on approval and rescreening"""
+
+import time
+
+from sqlalchemy import update
+
+from app.db.session import SessionLocal
+from app.models.screening_result import ScreeningResult
+from app.services.result_cache import ResultCache, etag_matches, result_cache
+from tests.conftest import QUESTIONNAIRE, auth_headers, screening_result
+
+
+def _change_behind_the_cache(result_id: int, notes: str) -> None:
+    session = SessionLocal()
+    try:
+        session.execute(update(ScreeningResult).where(ScreeningResult.id == result_id).values(doctor_notes=notes))
+        session.commit()
+    finally:
+        session.close()
+
+
+def test_etag_round_trip_gives_304(client):
+    result = screening_result(client)
+    url = f"/api/screening/results/{result['questionnaire_id']}"
+    first = client.get(url)
+    etag = first.headers["etag"]
+    # Compressed responses carry the weak form of the ETag
+    assert etag.removeprefix("W/") == f'"{result["id"]}-{result["version"]}"'
+
+    repeat = client.get(url, headers={"If-None-Match": etag})
+    assert repeat.status_code == 304
+    assert repeat.content == b""
+    assert client.get(url, headers={"If-None-Match": f'"other", {etag}'}).status_code == 304
+    assert client.get(url, headers={"If-None-Match": '"stale"'}).status_code == 200
+
+
+def test_repeat_reads_are_served_from_the_cache(client):
+    result = screening_result(client)
+    url = f"/api/screening/results/{result['questionnaire_id']}"
+    client.get(url)
+    assert result_cache.get(result["questionnaire_id"]) is not None
+
+    _change_behind_the_cache(result["id"], "written without invalidating")
+    assert client.get(url).json()["doctor_notes"] is None
+
+    result_cache.invalidate(result["questionnaire_id"])
+    assert client.get(url).json()["doctor_notes"] == "written without invalidating"
+
+
+def test_approval_invalidates_the_cached_result(client, doctor_headers):
+    result = screening_result(client)
+    url = f"/api/screening/results/{result['questionnaire_id']}"
+    etag = client.get(url).headers["etag"]
+
+    medication = result["recommended_drugs"][0]["medication"]
+    response = client.post(f"/api/screening/approve/{result['id']}", headers=doctor_headers,
+                           json={"selected_medication": medication})
+    assert response.status_code == 200, response.text
+
+    refreshed = client.get(url, headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != etag
+    assert refreshed.json()["doctor_selected_medication"] == medication
+
+
+def test_rescreen_invalidates_the_cached_result(client, patient):
+    headers = auth_headers(patient)
+    questionnaire_id = client.post("/api/questionnaires", headers=headers, json=QUESTIONNAIRE).json()["id"]
+    client.post(f"/api/questionnaires/{questionnaire_id}/submit")
+    client.post(f"/api/screening/run/{questionnaire_id}")
+    url = f"/api/screening/results/{questionnaire_id}"
+    etag = client.get(url).headers["etag"]
+
+    client.put(f"/api/questionnaires/{questionnaire_id}", headers=headers, json={"weight_lb": 150})
+    refreshed = client.get(url, headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != etag
+
+
+def test_cache_expires_and_evicts_least_recently_used():
+    cache = ResultCache(max_entries=2, ttl_seconds=60)
+    cache.set(1, '"a"', b"1")
+    cache.set(2, '"b"', b"2")
+    cache.get(1)
+    cache.set(3, '"c"', b"3")
+    assert cache.get(2) is None
+    assert cache.get(1).body == b"1"
+
+    short = ResultCache(max_entries=2, ttl_seconds=0.01)
+    short.set(1, '"a"', b"1")
+    time.sleep(0.02)
+    assert short.get(1) is None
+
+
+def test_etag_matching():
+    assert etag_matches("*", '"1-1"')
+    assert etag_matches('"x", W/"1-1"', '"1-1"')
+    assert not etag_matches(None, '"1-1"')
+    assert not etag_matches('"1-2"', '"1-1"')
@@ -0,0 +1,100 @@
+"""Archiving reviewed cases and reading them back from the archive tables"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from app.db.session import SessionLocal
+from app.models.archive import QuestionnaireArchive, ScreeningResultArchive
+from app.models.questionnaire import Questionnaire, QuestionnaireStatus
+from app.models.screening_result import ScreeningResult
+from app.services.result_cache import result_cache
+from app.services.retention import archive_reviewed
+from tests.conftest import screening_result
+
+# Far enough back that only cases aged by these tests qualify
+_RETENTION_DAYS = 3650
+
+
+def _review_long_ago(questionnaire_id: int) -> None:
+    session = SessionLocal()
+    try:
+        session.execute(
+            update(Questionnaire)
+            .where(Questionnaire.id == questionnaire_id)
+            .values(status=QuestionnaireStatus.REVIEWED,
+                    reviewed_at=datetime.utcnow() - timedelta(days=_RETENTION_DAYS + 30))
+        )
+        session.commit()
+    finally:
+        session.close()
+
+
+def _archive() -> tuple:
+    session = SessionLocal()
+    try:
+        return archive_reviewed(session, older_than_days=_RETENTION_DAYS, batch_size=1)
+    finally:
+        session.close()
+
+
+def test_reviewed_cases_move_to_archive_in_batches(client):
+    results = [screening_result(client) for _ in range(2)]
+    pending = screening_result(client)
+    for result in results:
+        _review_long_ago(result["questionnaire_id"])
+
+    report = _archive()
+    assert report.questionnaires == 2
+    assert report.screening_results == 2
+    assert report.batches == 2
+
+    archived_ids = [result["questionnaire_id"] for result in results]
+    session = SessionLocal()
+    try:
+        assert session.query(Questionnaire).filter(Questionnaire.id.in_(archived_ids)).count() == 0
+        assert session.query(ScreeningResult).filter(ScreeningResult.questionnaire_id.in_(archived_ids)).count() == 0
+        archived = session.query(QuestionnaireArchive).filter(QuestionnaireArchive.id.in_(archived_ids)).all()
+        assert {row.archive_month for row in archived} == {
+            (datetime.utcnow() - timedelta(days=_RETENTION_DAYS + 30)).strftime("%Y-%m")
+        }
+        assert session.query(ScreeningResultArchive).filter(
+            ScreeningResultArchive.questionnaire_id.in_(archived_ids)
+        ).count() == 2
+        # Cases not yet reviewed stay live
+        assert session.get(Questionnaire, pending["questionnaire_id"]) is not None
+    finally:
+        session.close()
+
+
+def test_archive_stops_after_max_batches(client):
+    results = [screening_result(client) for _ in range(2)]
+    for result in results:
+        _review_long_ago(result["questionnaire_id"])
+
+    session = SessionLocal()
+    try:
+        report = archive_reviewed(session, older_than_days=_RETENTION_DAYS, batch_size=1, max_batches=1)
+        assert report.questionnaires == 1
+        assert archive_reviewed(session, older_than_days=_RETENTION_DAYS, batch_size=10).questionnaires == 1
+    finally:
+        session.close()
+
+
+def test_lookups_fall_back_to_archived_rows(client, doctor_headers):
+    result = screening_result(client)
+    questionnaire_id = result["questionnaire_id"]
+    _review_long_ago(questionnaire_id)
+    assert _archive().questionnaires == 1
+    result_cache.clear()
+
+    archived_result = client.get(f"/api/screening/results/{questionnaire_id}")
+    assert archived_result.status_code == 200, archived_result.text
+    assert archived_result.json()["id"] == result["id"]
+    assert archived_result.json()["recommended_drugs"] == result["recommended_drugs"]
+
+    archived_questionnaire = client.get(f"/api/questionnaires/{questionnaire_id}", headers=doctor_headers)
+    assert archived_questionnaire.status_code == 200, archived_questionnaire.text
+    assert archived_questionnaire.json()["id"] == questionnaire_id
+
+    assert client.get("/api/screening/results/999999999").status_code == 404
@@ -0,0 +1,201 @@
+"""Background screening queue: claiming, leases, retries with backoff and exactly-once results"""
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.screening_job import ScreeningJob, ScreeningJobStatus
+from app.models.screening_result import ScreeningResult
+from app.services import screening_jobs
+from app.services.screening_jobs import claim_next_job, enqueue_screening_job, process_job
+from tests.conftest import QUESTIONNAIRE, submit_questionnaire
+
+
+@pytest.fixture(autouse=True)
+def empty_queue():
+    def clear():
+        session = SessionLocal()
+        session.query(ScreeningJob).delete()
+        session.commit()
+        session.close()
+
+    clear()
+    yield
+    clear()
+
+
+@pytest.fixture
+def queued_job(client):
+    """Id of a due job for a freshly submitted questionnaire"""
+    questionnaire_id = submit_questionnaire(client)
+    session = SessionLocal()
+    try:
+        job = enqueue_screening_job(session, questionnaire_id)
+        session.commit()
+        return job.id
+    finally:
+        session.close()
+
+
+def _job(job_id: int) -> ScreeningJob:
+    session = SessionLocal()
+    try:
+        job = session.get(ScreeningJob, job_id)
+        session.expunge(job)
+        return job
+    finally:
+        session.close()
+
+
+def _make_due(job_id: int, **values) -> None:
+    session = SessionLocal()
+    try:
+        session.query(ScreeningJob).filter(ScreeningJob.id == job_id).update(
+            {"available_at": datetime.utcnow() - timedelta(seconds=1), **values}
+        )
+        session.commit()
+    finally:
+        session.close()
+
+
+def _results_for(questionnaire_id: int) -> int:
+    session = SessionLocal()
+    try:
+        return session.query(ScreeningResult).filter(ScreeningResult.questionnaire_id == questionnaire_id).count()
+    finally:
+        session.close()
+
+
+def test_concurrent_workers_claim_a_job_once(queued_job):
+    claims = []
+    barrier = threading.Barrier(4)
+
+    def worker(index):
+        session = SessionLocal()
+        try:
+            barrier.wait()
+            job = claim_next_job(session, lease=f"worker-{index}")
+            if job is not None:
+                claims.append((job.id, job.locked_by))
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert [job_id for job_id, _ in claims] == [queued_job]
+    job = _job(queued_job)
+    assert job.status == ScreeningJobStatus.RUNNING
+    assert job.attempts == 1
+    assert job.locked_by == claims[0][1]
+
+
+def test_success_creates_exactly_one_result(queued_job):
+    session = SessionLocal()
+    try:
+        job = claim_next_job(session, lease="worker")
+        process_job(session, job)
+    finally:
+        session.close()
+
+    job = _job(queued_job)
+    assert job.status == ScreeningJobStatus.SUCCEEDED
+    assert job.locked_by is None
+    assert _results_for(job.questionnaire_id) == 1
+
+
+def test_failures_retry_with_exponential_backoff(queued_job, monkeypatch):
+    monkeypatch.setattr(settings, "SCREENING_JOB_MAX_ATTEMPTS", 3)
+    monkeypatch.setattr(settings, "SCREENING_JOB_BACKOFF_SECONDS", 10.0)
+
+    def broken(questionnaire):
+        raise RuntimeError("screening engine unavailable")
+
+    monkeypatch.setattr(screening_jobs, "build_screening_result", broken)
+
+    delays = []
+    for attempt in range(1, 4):
+        session = SessionLocal()
+        try:
+            job = claim_next_job(session, lease=f"attempt-{attempt}")
+            assert job is not None and job.attempts == attempt
+            before = datetime.utcnow()
+            process_job(session, job)
+        finally:
+            session.close()
+
+        job = _job(queued_job)
+        if attempt < 3:
+            assert job.status == ScreeningJobStatus.QUEUED
+            assert "screening engine unavailable" in job.last_error
+            delays.append((job.available_at.replace(tzinfo=None) - before).total_seconds())
+
+            # Not claimable until the backoff has passed
+            session = SessionLocal()
+            assert claim_next_job(session, lease="early") is None
+            session.close()
+            _make_due(queued_job)
+
+    assert delays[0] == pytest.approx(10, abs=1)
+    assert delays[1] == pytest.approx(20, abs=1)
+    assert job.status == ScreeningJobStatus.FAILED
+    assert job.completed_at is not None
+
+
+def test_expired_lease_is_reclaimed_and_old_worker_cannot_settle(queued_job):
+    first = SessionLocal()
+    second = SessionLocal()
+    try:
+        stale = claim_next_job(first, lease="crashed-worker")
+        assert claim_next_job(second, lease="too-early") is None
+
+        # The first worker hangs past its visibility timeout
+        _make_due(queued_job, locked_until=datetime.utcnow() - timedelta(seconds=1))
+        fresh = claim_next_job(second, lease="second-worker")
+        assert fresh is not None and fresh.attempts == 2
+
+        # The first worker wakes up; its lease is gone, so it cannot mark the job done
+        assert not screening_jobs._settle(first, stale, "crashed-worker", status=ScreeningJobStatus.SUCCEEDED)
+        first.rollback()
+
+        process_job(second, fresh)
+    finally:
+        first.close()
+        second.close()
+
+    job = _job(queued_job)
+    assert job.status == ScreeningJobStatus.SUCCEEDED
+    assert _results_for(job.questionnaire_id) == 1
+
+
+def test_job_for_an_already_screened_questionnaire_adds_no_result(client, queued_job):
+    questionnaire_id = _job(queued_job).questionnaire_id
+    assert client.post(f"/api/screening/run/{questionnaire_id}").status_code == 201
+
+    session = SessionLocal()
+    try:
+        process_job(session, claim_next_job(session, lease="worker"))
+    finally:
+        session.close()
+
+    assert _job(queued_job).status == ScreeningJobStatus.SUCCEEDED
+    assert _results_for(questionnaire_id) == 1
+
+
+def test_submit_returns_202_with_the_job(client, monkeypatch):
+    monkeypatch.setattr(settings, "SCREENING_JOBS_ENABLED", True)
+    questionnaire_id = client.post("/api/questionnaires/anonymous", json=QUESTIONNAIRE).json()["id"]
+
+    response = client.post(f"/api/questionnaires/{questionnaire_id}/submit")
+    assert response.status_code == 202
+    location = response.headers["location"]
+    job = client.get(location).json()
+    assert job["questionnaire_id"] == questionnaire_id
+    assert job["status"] == "queued"
+    assert job["result_url"] == f"/api/screening/results/{questionnaire_id}"
@@ -0,0 +1,90 @@
+"""Full-text case search: ranking, prefix matching, pagination and index maintenance"""
+
+import uuid
+
+from sqlalchemy import update
+
+from app.db.session import SessionLocal
+from app.models.screening_result import ScreeningResult
+from tests.conftest import auth_headers, screening_result, submit_questionnaire
+
+SEARCH_URL = "/api/questionnaires/search"
+
+
+def _token() -> str:
+    """A word no other test writes, so each test sees only its own cases"""
+    return f"tok{uuid.uuid4().hex[:10]}"
+
+
+def _set_notes(questionnaire_id: int, notes: str) -> None:
+    session = SessionLocal()
+    try:
+        session.execute(
+            update(ScreeningResult).where(ScreeningResult.questionnaire_id == questionnaire_id).values(doctor_notes=notes)
+        )
+        session.commit()
+    finally:
+        session.close()
+
+
+def _search(client, headers, q: str, **params) -> dict:
+    response = client.get(SEARCH_URL, headers=headers, params={"q": q, **params})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_doctor_notes_rank_above_patient_remarks(client, doctor_headers):
+    token = _token()
+    in_remarks = submit_questionnaire(client, additional_remarks=f"worried about {token} cravings")
+    in_notes = screening_result(client)["questionnaire_id"]
+    _set_notes(in_notes, f"worried about {token} cravings")
+
+    body = _search(client, doctor_headers, token)
+    assert [row["id"] for row in body["results"]] == [in_notes, in_remarks]
+    assert body["results"][0]["score"] >= body["results"][1]["score"]
+    assert f"[{token}]" in body["results"][0]["snippet"]
+
+
+def test_every_term_must_match_and_the_last_is_a_prefix(client, doctor_headers):
+    token = _token()
+    both = submit_questionnaire(client, additional_remarks=f"{token} night snacking")
+    submit_questionnaire(client, additional_remarks=f"{token} emotional eating")
+
+    assert [row["id"] for row in _search(client, doctor_headers, f"{token} snack")["results"]] == [both]
+    assert len(_search(client, doctor_headers, token[:-3])["results"]) == 2
+
+
+def test_pages_do_not_overlap(client, doctor_headers):
+    token = _token()
+    ids = {submit_questionnaire(client, additional_remarks=f"{token} note {index}") for index in range(5)}
+
+    first = _search(client, doctor_headers, token, limit=2)
+    second = _search(client, doctor_headers, token, limit=2, offset=2)
+    last = _search(client, doctor_headers, token, limit=2, offset=4)
+    assert first["has_more"] and second["has_more"] and not last["has_more"]
+    assert (first["offset"], second["offset"], last["offset"]) == (0, 2, 4)
+
+    seen = [row["id"] for page in (first, second, last) for row in page["results"]]
+    assert len(seen) == len(set(seen)) == 5
+    assert set(seen) == ids
+
+
+def test_index_follows_note_changes(client, doctor_headers):
+    old, new = _token(), _token()
+    questionnaire_id = screening_result(client)["questionnaire_id"]
+    _set_notes(questionnaire_id, f"started on {old}")
+    assert [row["id"] for row in _search(client, doctor_headers, old)["results"]] == [questionnaire_id]
+
+    _set_notes(questionnaire_id, f"switched to {new}")
+    assert _search(client, doctor_headers, old)["results"] == []
+    assert [row["id"] for row in _search(client, doctor_headers, new)["results"]] == [questionnaire_id]
+
+
+def test_query_without_words_is_rejected(client, doctor_headers):
+    response = client.get(SEARCH_URL, headers=doctor_headers, params={"q": "?!"})
+    assert response.status_code == 400
+
+
+def test_search_is_for_doctors_only(client, patient):
+    response = client.get(SEARCH_URL, headers=auth_headers(patient), params={"q": "nausea"})
+    assert response.status_code == 403
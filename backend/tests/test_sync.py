@@ -0,0 +1,103 @@
+"""Delta sync: cursors, paging, tombstones and archived rows"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from app.db.session import SessionLocal
+from app.models.questionnaire import Questionnaire, QuestionnaireStatus
+from app.models.user import UserRole
+from app.services.retention import archive_reviewed
+from tests.conftest import QUESTIONNAIRE, auth_headers, create_user
+
+
+def _sync(client, headers, since: int = 0, **params) -> dict:
+    response = client.get("/api/sync", headers=headers, params={"since": since, **params})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _create(client, headers, **overrides) -> int:
+    response = client.post("/api/questionnaires", headers=headers, json={**QUESTIONNAIRE, **overrides})
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def test_cursor_returns_only_later_changes(client):
+    headers = auth_headers(create_user(UserRole.PATIENT))
+    first = _create(client, headers)
+    initial = _sync(client, headers)
+    assert [row["id"] for row in initial["questionnaires"]] == [first]
+    assert _sync(client, headers, initial["cursor"])["questionnaires"] == []
+
+    second = _create(client, headers)
+    response = client.put(f"/api/questionnaires/{first}", headers=headers, json={"weight_lb": 200})
+    assert response.status_code == 200, response.text
+
+    delta = _sync(client, headers, initial["cursor"])
+    # Each changed record once, in its current state
+    assert sorted(row["id"] for row in delta["questionnaires"]) == [first, second]
+    assert next(row for row in delta["questionnaires"] if row["id"] == first)["weight_lb"] == 200
+    assert delta["cursor"] > initial["cursor"]
+
+
+def test_pages_follow_has_more(client):
+    headers = auth_headers(create_user(UserRole.PATIENT))
+    ids = [_create(client, headers) for _ in range(3)]
+
+    seen, cursor, pages = [], 0, 0
+    while True:
+        page = _sync(client, headers, cursor, limit=2)
+        seen += [row["id"] for row in page["questionnaires"]]
+        cursor = page["cursor"]
+        pages += 1
+        if not page["has_more"]:
+            break
+    assert pages == 2
+    assert seen == ids
+
+
+def test_deleted_drafts_leave_tombstones(client):
+    headers = auth_headers(create_user(UserRole.PATIENT))
+    draft = _create(client, headers)
+    cursor = _sync(client, headers)["cursor"]
+
+    assert client.delete(f"/api/questionnaires/{draft}", headers=headers).status_code in (200, 204)
+    delta = _sync(client, headers, cursor)
+    assert delta["deleted"]["questionnaires"] == [draft]
+    assert delta["questionnaires"] == []
+
+
+def test_archived_rows_are_not_deletions(client):
+    patient = create_user(UserRole.PATIENT)
+    headers = auth_headers(patient)
+    questionnaire_id = _create(client, headers)
+
+    session = SessionLocal()
+    try:
+        session.execute(
+            update(Questionnaire)
+            .where(Questionnaire.id == questionnaire_id)
+            .values(status=QuestionnaireStatus.REVIEWED, reviewed_at=datetime.utcnow() - timedelta(days=4000))
+        )
+        session.commit()
+        cursor = _sync(client, headers)["cursor"]
+        assert archive_reviewed(session, older_than_days=3650, batch_size=10).questionnaires == 1
+    finally:
+        session.close()
+
+    delta = _sync(client, headers, cursor)
+    assert delta["deleted"]["questionnaires"] == []
+    assert delta["cursor"] == cursor
+
+    # A full sync still returns the case, served from the archive
+    full = _sync(client, headers)
+    assert [row["id"] for row in full["questionnaires"]] == [questionnaire_id]
+    assert full["questionnaires"][0]["status"] == "reviewed"
+
+
+def test_patients_only_see_their_own_changes(client):
+    mine = auth_headers(create_user(UserRole.PATIENT))
+    theirs = auth_headers(create_user(UserRole.PATIENT))
+    _create(client, theirs)
+    assert _sync(client, mine)["questionnaires"] == []
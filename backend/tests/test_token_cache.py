@@ -0,0 +1,128 @@
+"""Verified-token cache: hits, expiry, eviction and revocation"""
+
+from datetime import timedelta
+
+import pytest
+
+from app.core import security
+from app.core.security import (
+    VerifiedTokenCache,
+    create_access_token,
+    decode_access_token,
+    peek_token_role,
+    revoke_token,
+    token_cache,
+)
+from app.models.user import UserRole
+from tests.conftest import create_user
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(security.time, "time", fake)
+    return fake
+
+
+def _token(user_id: int = 1, role: str = "doctor", minutes: int = 30) -> str:
+    return create_access_token(
+        {"sub": f"user{user_id}@example.com", "user_id": user_id, "role": role},
+        expires_delta=timedelta(minutes=minutes),
+    )
+
+
+def test_entries_miss_once_their_token_expires(clock):
+    cache = VerifiedTokenCache(max_entries=4)
+    cache.set(b"key", {"exp": clock.now + 60})
+    assert cache.get(b"key") is not None
+
+    clock.now += 61
+    assert cache.get(b"key") is None
+    assert cache.peek(b"key") is None
+    assert cache.stats()["entries"] == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_tokens_without_exp_are_not_cached(clock):
+    cache = VerifiedTokenCache(max_entries=4)
+    cache.set(b"key", {"sub": "forever"})
+    assert cache.get(b"key") is None
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = VerifiedTokenCache(max_entries=2)
+    cache.set(b"a", {"exp": clock.now + 60})
+    cache.set(b"b", {"exp": clock.now + 60})
+    cache.get(b"a")
+    cache.set(b"c", {"exp": clock.now + 60})
+    assert cache.get(b"b") is None
+    assert cache.get(b"a") is not None and cache.get(b"c") is not None
+
+
+def test_revocation_outlives_clear_until_the_token_expires(clock):
+    cache = VerifiedTokenCache(max_entries=4)
+    cache.set(b"key", {"exp": clock.now + 60})
+    cache.revoke(b"key", clock.now + 60)
+    assert cache.get(b"key") is None
+    assert cache.is_revoked(b"key")
+
+    # A revoked token is not cached again, and clear keeps the revocation
+    cache.set(b"key", {"exp": clock.now + 60})
+    cache.clear()
+    assert cache.get(b"key") is None
+    assert cache.is_revoked(b"key")
+
+    # Revocations are pruned once they could no longer matter
+    clock.now += 61
+    cache.revoke(b"other", clock.now + 60)
+    assert not cache.is_revoked(b"key")
+    assert cache.stats()["revoked"] == 1
+
+
+def test_decoding_twice_hits_the_cache():
+    token = _token()
+    hits = token_cache.hits
+    first = decode_access_token(token)
+    second = decode_access_token(token)
+    assert first == second and first["user_id"] == 1
+    assert token_cache.hits == hits + 1
+    # Callers get a copy, not the cached claims
+    second["user_id"] = 99
+    assert decode_access_token(token)["user_id"] == 1
+
+
+def test_tampered_tokens_are_rejected():
+    token = _token()
+    assert decode_access_token(token[:-2] + ("AA" if token[-2:] != "AA" else "BB")) is None
+
+
+def test_revoked_token_is_rejected_by_the_api(client):
+    user = create_user(UserRole.DOCTOR)
+    token = create_access_token({"sub": user.email, "user_id": user.id, "role": user.role.value})
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/api/auth/me", headers=headers).status_code == 200
+    assert peek_token_role(token) == "doctor"
+
+    revoke_token(token)
+    assert decode_access_token(token) is None
+    assert peek_token_role(token) is None
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
+
+    token_cache.clear()
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
+
+
+def test_expired_tokens_cannot_be_revoked_or_decoded():
+    token = _token(minutes=-1)
+    assert decode_access_token(token) is None
+    revoked = token_cache.stats()["revoked"]
+    revoke_token(token)
+    assert token_cache.stats()["revoked"] == revoked
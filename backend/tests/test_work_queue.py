@@ -0,0 +1,72 @@
+"""Doctor work queue: claim leases and how they gate approvals"""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from sqlalchemy import update
+
+from app.api.screening import _approval_conflict
+from app.db.session import SessionLocal
+from app.models.screening_result import ScreeningResult
+from app.models.user import UserRole
+from app.services.work_queue import claim_is_held_by_other
+from tests.conftest import auth_headers, create_user, screening_result
+
+
+def _claimed(doctor_id: int, expires_at: datetime) -> SimpleNamespace:
+    return SimpleNamespace(
+        claimed_by_doctor_id=doctor_id,
+        claim_expires_at=expires_at,
+        doctor_selected_medication=None,
+        version=1,
+    )
+
+
+def test_aware_claim_expiry_compares_against_naive_now():
+    # PostgreSQL returns DateTime(timezone=True) columns as aware datetimes
+    live = _claimed(1, datetime.now(timezone.utc) + timedelta(minutes=5))
+    expired = _claimed(1, datetime.now(timezone.utc) - timedelta(minutes=5))
+    now = datetime.utcnow()
+
+    assert claim_is_held_by_other(live, doctor_id=2, now=now)
+    assert not claim_is_held_by_other(expired, doctor_id=2, now=now)
+    assert not claim_is_held_by_other(live, doctor_id=1, now=now)
+    assert _approval_conflict(live, 2, None, now) == "Screening result is claimed by another doctor"
+
+
+def test_naive_claim_expiry_compares_against_aware_now():
+    live = _claimed(1, datetime.utcnow() + timedelta(minutes=5))
+    assert claim_is_held_by_other(live, doctor_id=2, now=datetime.now(timezone.utc))
+
+
+def test_claimed_result_cannot_be_approved_by_another_doctor(client):
+    result = screening_result(client)
+    holder_user = create_user(UserRole.DOCTOR)
+    holder = auth_headers(holder_user)
+    other = auth_headers(create_user(UserRole.DOCTOR))
+
+    # Older results from other tests may be ahead in the queue, so hand this one over directly
+    session = SessionLocal()
+    try:
+        session.execute(
+            update(ScreeningResult)
+            .where(ScreeningResult.id == result["id"])
+            .values(claimed_by_doctor_id=holder_user.id,
+                    claim_expires_at=datetime.now(timezone.utc) + timedelta(minutes=5))
+        )
+        session.commit()
+    finally:
+        session.close()
+
+    medication = result["recommended_drugs"][0]["medication"]
+    refused = client.post(f"/api/screening/approve/{result['id']}", headers=other, json={
+        "selected_medication": medication,
+    })
+    assert refused.status_code == 409, refused.text
+
+    released = client.post(f"/api/screening/claim/{result['id']}/release", headers=holder)
+    assert released.status_code == 204
+    approved = client.post(f"/api/screening/approve/{result['id']}", headers=other, json={
+        "selected_medication": medication,
+    })
+    assert approved.status_code == 200, approved.text
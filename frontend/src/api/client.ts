@@ -22,6 +22,7 @@ export const api = {
   // Screening (anonymous access)
   runScreening: (questionnaireId: number) => apiClient.post(`/screening/run/${questionnaireId}`),
   getScreeningResults: (questionnaireId: number) => apiClient.get(`/screening/results/${questionnaireId}`),
+  previewScreening: (data: any) => apiClient.post('/screening/preview', data),
 };
 
 export default apiClient;